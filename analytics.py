@@ -0,0 +1,86 @@
+import threading
+
+
+PICKUP_ADDRESS = "STORE PICKUP"
+
+
+class SalesAnalytics:
+
+    def __init__(self):
+        self.total_sales = 0
+        self.total_revenue = 0
+        self.total_units = 0
+        self.revenue_by_day = {}
+        self.revenue_by_tier = {}
+        self.sales_by_category = {}
+        self.units_by_sku = {}
+        self.fulfillment = {"delivery": 0, "pickup": 0}
+        self.inventory_value = 0
+        self._lock = threading.Lock()
+
+    def record_sale(self, sale):
+        day = str(sale["date"])[:10]
+        tier = sale.get("membership") or "None"
+        method = "pickup" if sale["delivery_address"] == PICKUP_ADDRESS else "delivery"
+
+        with self._lock:
+            self.total_sales += 1
+            self.total_revenue += sale["total_amount"]
+            self.revenue_by_day[day] = self.revenue_by_day.get(day, 0) + sale["total_amount"]
+            self.revenue_by_tier[tier] = self.revenue_by_tier.get(tier, 0) + sale["total_amount"]
+            self.fulfillment[method] += 1
+
+            for item in sale["items"]:
+                category = item.get("category") or "Unknown"
+                sku = item.get("appliance_id") or item["name"]
+                self.total_units += item["quantity"]
+                self.sales_by_category[category] = (
+                    self.sales_by_category.get(category, 0) + item["total_price"])
+                self.units_by_sku[sku] = self.units_by_sku.get(sku, 0) + item["quantity"]
+
+    def adjust_inventory(self, delta):
+        if delta:
+            with self._lock:
+                self.inventory_value += delta
+
+    def average_basket_size(self):
+        return self.total_units / self.total_sales if self.total_sales else 0
+
+    def average_order_value(self):
+        return self.total_revenue / self.total_sales if self.total_sales else 0
+
+    def report(self):
+        with self._lock:
+            return {
+                "total_sales": self.total_sales,
+                "total_revenue": self.total_revenue,
+                "total_units": self.total_units,
+                "average_basket_size": self.average_basket_size(),
+                "average_order_value": self.average_order_value(),
+                "revenue_by_day": dict(self.revenue_by_day),
+                "revenue_by_tier": dict(self.revenue_by_tier),
+                "sales_by_category": dict(self.sales_by_category),
+                "units_by_sku": dict(self.units_by_sku),
+                "fulfillment": dict(self.fulfillment),
+                "inventory_value": self.inventory_value
+            }
+
+    @staticmethod
+    def inventory_value_of(appliance):
+        if appliance["status"] != "Available":
+            return 0
+        return appliance["price"] * appliance["stock"]
+
+    @classmethod
+    def recompute(cls, appliances, sales):
+        analytics = cls()
+        for sale in sales:
+            analytics.record_sale(sale)
+        analytics.inventory_value = sum(cls.inventory_value_of(appliance) for appliance in appliances)
+        return analytics
+
+    def verify(self, appliances, sales):
+        expected = self.recompute(appliances, sales).report()
+        actual = self.report()
+        return {key: (actual[key], expected[key]) for key in expected
+                if actual[key] != expected[key]}
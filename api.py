@@ -0,0 +1,375 @@
+import argparse
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import parse_qs, urlsplit
+
+from auth import AuthSystem
+from database import Database
+from membership import Membership
+from metrics import METRICS
+from models import OrderRequest, to_json
+from orders import OrderService
+from session import SessionManager
+from sales_log import SalesLog
+from storage import JournalStorage, SQLiteStorage
+
+
+class ApiError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+
+    def __init__(self, method, path, query, headers, body, params):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.params = params
+
+    def arg(self, name, default=None):
+        values = self.query.get(name)
+        return values[0] if values else default
+
+
+class StoreAPI:
+    PAGE_SIZE = 50
+    REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized",
+               403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict",
+               500: "Internal Server Error"}
+
+    def __init__(self, database=None, auth=None, executor=None):
+        self.database = database or Database()
+        self.auth = auth or AuthSystem()
+        self.sessions = SessionManager(self.auth)
+        self.orders = OrderService(self.database, self.auth)
+        self.executor = executor or ThreadPoolExecutor()
+        self.routes = [
+            ("GET", r"/categories", self.list_categories),
+            ("GET", r"/appliances", self.list_appliances),
+            ("GET", r"/appliances/(?P<appliance_id>\d+)", self.get_appliance),
+            ("GET", r"/search", self.search),
+            ("POST", r"/sessions", self.create_session),
+            ("DELETE", r"/sessions", self.close_session),
+            ("POST", r"/register", self.register),
+            ("POST", r"/login", self.login),
+            ("POST", r"/logout", self.logout),
+            ("GET", r"/cart", self.get_cart),
+            ("POST", r"/cart/items", self.add_cart_item),
+            ("PUT", r"/cart/items/(?P<appliance_id>\d+)", self.set_cart_item),
+            ("DELETE", r"/cart/items/(?P<appliance_id>\d+)", self.remove_cart_item),
+            ("GET", r"/membership", self.get_membership),
+            ("POST", r"/membership", self.set_membership),
+            ("POST", r"/checkout", self.checkout),
+            ("GET", r"/metrics", self.get_metrics),
+        ]
+        self.routes = [(method, re.compile(pattern + "$"), handler)
+                       for method, pattern, handler in self.routes]
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method, target, headers, body)
+                keep_alive = (version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close")
+
+                data = json.dumps(payload, default=to_json).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {self.REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode("latin-1") + data)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        allowed = False
+
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(url.path)
+            if not match:
+                continue
+            allowed = True
+            if route_method != method:
+                continue
+
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                return 400, {"error": "Invalid JSON body"}
+
+            request = Request(method, url.path, parse_qs(url.query), headers, payload,
+                              match.groupdict())
+            try:
+                return await handler(request)
+            except ApiError as e:
+                return e.status, {"error": e.message}
+            except Exception as e:
+                return 500, {"error": str(e)}
+
+        if allowed:
+            return 405, {"error": "Method not allowed"}
+        return 404, {"error": "Not found"}
+
+    async def run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _session(self, request):
+        session = self.sessions.get(request.headers.get("x-session-id", ""))
+        if not session:
+            raise ApiError(401, "Missing or unknown X-Session-Id")
+        return session
+
+    def _user(self, request):
+        session = self._session(request)
+        user = session.get_current_user()
+        if not user:
+            raise ApiError(401, "Login required")
+        return session, user
+
+    @contextmanager
+    def _cart(self, session):
+        if not session.lock.acquire(blocking=False):
+            raise ApiError(409, "Checkout in progress for this session")
+        try:
+            yield session.cart
+        finally:
+            session.lock.release()
+
+    def _check_stock(self, appliance_id, quantity):
+        appliance = self.database.get_appliance(appliance_id)
+        if not appliance or appliance["status"] != "Available":
+            raise ApiError(404, "Invalid product ID or product unavailable")
+        if quantity > appliance["stock"]:
+            raise ApiError(409, f"Only {appliance['stock']} in stock")
+        return appliance
+
+    def _membership(self, session):
+        user = session.get_current_user()
+        return user.get("membership") if user else None
+
+    def _int(self, value, name):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ApiError(400, f"Invalid {name}")
+
+    async def list_categories(self, request):
+        return 200, {"categories": self.database.get_all_categories()}
+
+    async def list_appliances(self, request):
+        category = request.arg("category")
+        after_id = request.arg("after_id")
+        after_id = self._int(after_id, "after_id") if after_id is not None else None
+        limit = max(1, min(self._int(request.arg("limit", self.PAGE_SIZE), "limit"), 500))
+
+        appliances = await self.run_blocking(self.database.get_available_page, limit, after_id, category)
+        total = self.database.get_available_count(category)
+        next_after_id = appliances[-1].id if len(appliances) == limit else None
+        return 200, {"total": total, "after_id": after_id, "next_after_id": next_after_id,
+                     "appliances": appliances}
+
+    async def get_appliance(self, request):
+        appliance = self.database.get_appliance(int(request.params["appliance_id"]))
+        if not appliance:
+            raise ApiError(404, "Appliance not found")
+        return 200, appliance
+
+    async def search(self, request):
+        keyword = (request.arg("q") or "").strip()
+        if not keyword:
+            raise ApiError(400, "Missing search term")
+        limit = max(1, min(self._int(request.arg("limit", self.PAGE_SIZE), "limit"), 500))
+        results = await self.run_blocking(self.database.search_appliances, keyword, limit)
+        return 200, {"query": keyword, "results": results}
+
+    async def create_session(self, request):
+        return 201, {"session_id": self.sessions.create().session_id}
+
+    async def close_session(self, request):
+        self.sessions.close(self._session(request).session_id)
+        return 200, {"closed": True}
+
+    async def register(self, request):
+        success, msg = await self.run_blocking(
+            self.auth.register, request.body.get("username"), request.body.get("password"))
+        if not success:
+            raise ApiError(409 if msg == "Username already exists" else 400, msg)
+        return 201, {"message": msg}
+
+    async def login(self, request):
+        session = self._session(request)
+        success, msg = await self.run_blocking(
+            session.login, request.body.get("username"), request.body.get("password"))
+        if not success:
+            raise ApiError(401, msg)
+        return 200, {"message": msg}
+
+    async def logout(self, request):
+        self._session(request).logout()
+        return 200, {"message": "Logged out"}
+
+    async def get_cart(self, request):
+        session = self._session(request)
+        membership = self._membership(session)
+        with self._cart(session) as cart:
+            pricing = cart.price(membership)
+            item_count = cart.get_item_count()
+        return 200, {
+            "items": [{"appliance": line["appliance"], "quantity": line["quantity"],
+                       "unit_price": line["final_price"], "subtotal": line["final_subtotal"]}
+                      for line in pricing["lines"]],
+            "item_count": item_count,
+            "subtotal": pricing["original_total"],
+            "total": pricing["discounted_total"],
+            "savings": pricing["savings"],
+            "membership": membership
+        }
+
+    async def add_cart_item(self, request):
+        session = self._session(request)
+        appliance_id = self._int(request.body.get("appliance_id"), "appliance_id")
+        quantity = self._int(request.body.get("quantity", 1), "quantity")
+
+        with self._cart(session) as cart:
+            appliance = self._check_stock(appliance_id, cart.get_quantity(appliance_id) + quantity)
+            if not cart.add_item(appliance, quantity):
+                raise ApiError(400, "Invalid quantity")
+            return 200, {"item_count": cart.get_item_count()}
+
+    async def set_cart_item(self, request):
+        session = self._session(request)
+        appliance_id = int(request.params["appliance_id"])
+        quantity = self._int(request.body.get("quantity"), "quantity")
+
+        with self._cart(session) as cart:
+            if appliance_id not in cart.items:
+                raise ApiError(404, "Item not in cart")
+            if quantity > 0:
+                self._check_stock(appliance_id, quantity)
+            cart.set_quantity(appliance_id, quantity)
+            return 200, {"item_count": cart.get_item_count()}
+
+    async def remove_cart_item(self, request):
+        session = self._session(request)
+        with self._cart(session) as cart:
+            if not cart.remove_item(int(request.params["appliance_id"])):
+                raise ApiError(404, "Item not in cart")
+            return 200, {"item_count": cart.get_item_count()}
+
+    async def get_membership(self, request):
+        packages = Membership.get_packages()
+        current = None
+        session_id = request.headers.get("x-session-id")
+        if session_id:
+            current = self._membership(self._session(request))
+        return 200, {"packages": packages, "current": current}
+
+    async def set_membership(self, request):
+        session, user = self._user(request)
+        package = request.body.get("package")
+        if not Membership.is_valid_package(package):
+            raise ApiError(400, "Unknown membership package")
+        await self.run_blocking(self.auth.set_membership, user["username"], package)
+        return 200, {"membership": package}
+
+    async def checkout(self, request):
+        session = self._session(request)
+        if session.cart.is_empty():
+            raise ApiError(400, "Your cart is empty")
+
+        is_delivery = bool(request.body.get("delivery"))
+        address = request.body.get("address")
+        district = request.body.get("district")
+        return await self.run_blocking(self._place_order, session, is_delivery, address, district)
+
+    def _place_order(self, session, is_delivery, address, district):
+        with session.lock:
+            result = self.orders.place(OrderRequest(session.get_current_user(), session.cart, is_delivery,
+                                                    address, district))
+        if not result.success:
+            raise ApiError(409 if result.message == OrderService.OUT_OF_STOCK else 400, result.message)
+        return 201, {"sale_id": result.sale_id, "total_amount": result.total_amount,
+                     "delivery_fee": result.delivery_fee, "delivery_slot": result.delivery_slot}
+
+    async def get_metrics(self, request):
+        session, user = self._user(request)
+        if not session.is_admin():
+            raise ApiError(403, "Admin access required")
+        return 200, {"enabled": METRICS.enabled, "timings": METRICS.snapshot()}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Tech House JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument("--db", help="SQLite database file for persistent storage")
+    backend.add_argument("--journal", help="directory for the journal and snapshots of in-memory state")
+    parser.add_argument("--sales-log", help="directory for the columnar sales history")
+    parser.add_argument("--kdf-workers", type=int, default=0,
+                        help="processes for password hashing (default: hash in the request thread)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="record call counts and latency histograms (GET /metrics)")
+    args = parser.parse_args()
+
+    if args.metrics:
+        METRICS.enable()
+
+    storage = None
+    if args.db:
+        storage = SQLiteStorage(args.db)
+    elif args.journal:
+        storage = JournalStorage(args.journal)
+    sales_log = SalesLog(args.sales_log) if args.sales_log else None
+    database = Database(storage, sales_log)
+    auth = AuthSystem(storage, args.kdf_workers)
+    api = StoreAPI(database, auth)
+    server = await api.serve(args.host, args.port)
+    print(f"Tech House API listening on http://{args.host}:{args.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        database.close()
+        auth.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
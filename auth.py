@@ -1,23 +1,224 @@
 import hashlib
+import heapq
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from metrics import timed
+from storage import MemoryStorage
+
+
+PBKDF2_ITERATIONS = 100000
+
+
+def hash_password(password, salt=None, iterations=PBKDF2_ITERATIONS):
+    salt = salt or os.urandom(16).hex()
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations)
+    return f"pbkdf2_sha256${iterations}${salt}${digest.hex()}"
+
+
+def verify_password(password, stored):
+    if "$" not in stored:
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, stored)
+    
+    try:
+        _, iterations, salt, _ = stored.split("$")
+        expected = hash_password(password, salt, int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(expected, stored)
+
+
+def needs_rehash(stored):
+    return not stored.startswith(f"pbkdf2_sha256${PBKDF2_ITERATIONS}$")
+
+
+class CredentialCache:
+    
+    def __init__(self, max_size=10000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self._key = os.urandom(32)
+        self._lock = threading.Lock()
+    
+    def _fingerprint(self, username, password):
+        return hmac.new(self._key, f"{username}\0{password}".encode(), hashlib.sha256).digest()
+    
+    def check(self, username, password, stored):
+        fingerprint = self._fingerprint(username, password)
+        with self._lock:
+            entry = self.entries.get(fingerprint)
+            if not entry:
+                return False
+            if entry[1] < time.monotonic() or entry[0] != stored:
+                del self.entries[fingerprint]
+                return False
+            self.entries.move_to_end(fingerprint)
+            return True
+    
+    def add(self, username, password, stored):
+        fingerprint = self._fingerprint(username, password)
+        with self._lock:
+            self.entries[fingerprint] = (stored, time.monotonic() + self.ttl)
+            self.entries.move_to_end(fingerprint)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+
+class TokenStore:
+    
+    def __init__(self, ttl=1800, max_sessions_per_user=5, sweep_interval=60):
+        self.ttl = ttl
+        self.max_sessions_per_user = max_sessions_per_user
+        self.sweep_interval = sweep_interval
+        self.tokens = {}
+        self.user_tokens = {}
+        self._expiry_heap = []
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._lock = threading.Lock()
+    
+    def create(self, username):
+        token = secrets.token_urlsafe(24)
+        now = time.monotonic()
+        
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            
+            self.tokens[token] = [username, now + self.ttl]
+            heapq.heappush(self._expiry_heap, (now + self.ttl, token))
+            
+            user_tokens = self.user_tokens.setdefault(username, {})
+            user_tokens[token] = None
+            while len(user_tokens) > self.max_sessions_per_user:
+                self._revoke(next(iter(user_tokens)))
+        return token
+    
+    def resolve(self, token):
+        now = time.monotonic()
+        with self._lock:
+            entry = self.tokens.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                self._revoke(token)
+                return None
+            entry[1] = now + self.ttl
+            return entry[0]
+    
+    def revoke(self, token):
+        with self._lock:
+            if token not in self.tokens:
+                return False
+            self._revoke(token)
+            return True
+    
+    def revoke_user(self, username):
+        with self._lock:
+            for token in list(self.user_tokens.get(username, ())):
+                self._revoke(token)
+    
+    def sweep(self):
+        with self._lock:
+            return self._sweep(time.monotonic())
+    
+    def count(self, username=None):
+        if username is None:
+            return len(self.tokens)
+        return len(self.user_tokens.get(username, ()))
+    
+    def _sweep(self, now):
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, token = heapq.heappop(heap)
+            entry = self.tokens.get(token)
+            if entry is None:
+                continue
+            if entry[1] <= now:
+                self._revoke(token)
+                removed += 1
+            else:
+                heapq.heappush(heap, (entry[1], token))
+        self._next_sweep = now + self.sweep_interval
+        return removed
+    
+    def _revoke(self, token):
+        username = self.tokens.pop(token)[0]
+        user_tokens = self.user_tokens[username]
+        del user_tokens[token]
+        if not user_tokens:
+            del self.user_tokens[username]
 
 
 class AuthSystem:
+    USER_LOCK_STRIPES = 64
     
-    def __init__(self):
-        self.users = {
-            "admin": {
+    def __init__(self, storage=None, kdf_workers=0):
+        self._lock = threading.Lock()
+        self._user_locks = [threading.Lock() for _ in range(self.USER_LOCK_STRIPES)]
+        self._kdf_pool = ProcessPoolExecutor(kdf_workers) if kdf_workers else None
+        self.credential_cache = CredentialCache()
+        self.tokens = TokenStore()
+        self.storage = storage or MemoryStorage()
+        self.users = {user["username"]: user for user in self.storage.load_users()}
+        
+        if "admin" not in self.users:
+            self.users["admin"] = {
                 "username": "admin",
                 "password": self._hash_password("admin123"),
                 "role": "admin",
                 "membership": None,
                 "total_purchases": 0,
-                "delivery_address": None
+                "delivery_address": None,
+                "delivery_district": None
             }
-        }
-        self.current_user = None
+            self.storage.save_user(self.users["admin"])
     
     def _hash_password(self, password):
-        return hashlib.sha256(password.encode()).hexdigest()
+        return self._run_kdf(hash_password, password)
+    
+    def _run_kdf(self, func, *args):
+        if self._kdf_pool:
+            return self._kdf_pool.submit(func, *args).result()
+        return func(*args)
+    
+    def _check_password(self, username, password):
+        user = self.users.get(username)
+        if not user:
+            return False
+        
+        stored = user["password"]
+        if self.credential_cache.check(username, password, stored):
+            return True
+        if not self._run_kdf(verify_password, password, stored):
+            return False
+        
+        if needs_rehash(stored):
+            rehashed = self._hash_password(password)
+            with self._user_lock(username):
+                if user["password"] == stored:
+                    user["password"] = rehashed
+            self.storage.save_user(user)
+        
+        self.credential_cache.add(username, password, user["password"])
+        return True
+    
+    def close(self):
+        if self._kdf_pool:
+            self._kdf_pool.shutdown()
+    
+    def _user_lock(self, username):
+        return self._user_locks[hash(username) % self.USER_LOCK_STRIPES]
     
     def register(self, username, password):
         if not username or not password:
@@ -27,41 +228,69 @@ class AuthSystem:
         if len(password) < 3:
             return False, "Password must be at least 3 characters"
         
-        self.users[username] = {
+        user = {
             "username": username,
             "password": self._hash_password(password),
             "role": "customer",
             "membership": None,
             "total_purchases": 0,
-            "delivery_address": None
+            "delivery_address": None,
+            "delivery_district": None
         }
+        with self._lock:
+            if username in self.users:
+                return False, "Username already exists"
+            self.users[username] = user
+        
+        self.storage.save_user(user)
         return True, "Registration successful"
     
-    def login(self, username, password):
+    def authenticate(self, username, password):
         if not username or not password:
             return False, "Username and password cannot be empty"
         
-        user = self.users.get(username)
-        if not user or user["password"] != self._hash_password(password):
+        if not self._check_password(username, password):
             return False, "Invalid username or password"
         
-        self.current_user = user
         return True, f"Welcome back, {username}!"
     
-    def logout(self):
-        self.current_user = None
+    @timed("auth.login")
+    def login(self, username, password):
+        success, msg = self.authenticate(username, password)
+        token = self.tokens.create(username) if success else None
+        return success, msg, token
+    
+    def get_user(self, username):
+        return self.users.get(username)
+    
+    def logout(self, token):
+        return self.tokens.revoke(token)
     
-    def is_admin(self):
-        return self.current_user and self.current_user["role"] == "admin"
+    def is_admin(self, token):
+        user = self.get_current_user(token)
+        return bool(user) and user["role"] == "admin"
     
-    def get_current_user(self):
-        return self.current_user
+    def get_current_user(self, token):
+        if not token:
+            return None
+        username = self.tokens.resolve(token)
+        return self.users.get(username) if username else None
     
     def add_purchase(self, username):
         if username in self.users:
-            self.users[username]["total_purchases"] += 1
-            if self.current_user and self.current_user["username"] == username:
-                self.current_user["total_purchases"] = self.users[username]["total_purchases"]
+            with self._user_lock(username):
+                self.users[username]["total_purchases"] += 1
+            self.storage.save_user(self.users[username])
+    
+    def add_purchases(self, usernames):
+        with self.storage.transaction():
+            for username, count in Counter(usernames).items():
+                user = self.users.get(username)
+                if not user:
+                    continue
+                with self._user_lock(username):
+                    user["total_purchases"] += count
+                self.storage.save_user(user)
     
     def can_become_admin(self, username):
         user = self.users.get(username)
@@ -76,28 +305,35 @@ class AuthSystem:
         return False, f"Need {5 - purchases} more purchases to be eligible"
     
     def make_admin(self, username, admin_password):
-        if self._hash_password(admin_password) != self.users["admin"]["password"]:
+        if not admin_password or not self._check_password("admin", admin_password):
             return False, "Invalid admin password"
         
         user = self.users.get(username)
         if not user:
             return False, "User not found"
-        if user["role"] == "admin":
-            return False, "User is already an admin"
-        if user["total_purchases"] < 5:
-            return False, f"User needs at least 5 purchases (currently has {user['total_purchases']})"
         
-        user["role"] = "admin"
-        if self.current_user and self.current_user["username"] == username:
-            self.current_user["role"] = "admin"
+        with self._user_lock(username):
+            if user["role"] == "admin":
+                return False, "User is already an admin"
+            if user["total_purchases"] < 5:
+                return False, f"User needs at least 5 purchases (currently has {user['total_purchases']})"
+            user["role"] = "admin"
         
+        self.storage.save_user(user)
         return True, f"Successfully promoted {username} to admin"
     
     def get_all_users(self):
         return self.users
     
-    def set_delivery_address(self, username, address):
+    def set_delivery_address(self, username, address, district=None):
+        if username in self.users:
+            with self._user_lock(username):
+                self.users[username]["delivery_address"] = address
+                self.users[username]["delivery_district"] = district
+            self.storage.save_user(self.users[username])
+    
+    def set_membership(self, username, package_name):
         if username in self.users:
-            self.users[username]["delivery_address"] = address
-            if self.current_user and self.current_user["username"] == username:
-                self.current_user["delivery_address"] = address
\ No newline at end of file
+            with self._user_lock(username):
+                self.users[username]["membership"] = package_name
+            self.storage.save_user(self.users[username])
\ No newline at end of file
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from api import StoreAPI
+
+
+PATHS = ["/search?q=smart", "/appliances?category=Kitchen%20appliances", "/categories",
+         "/appliances/5", "/search?q=mix"]
+
+
+async def request(reader, writer, method, path, body=None, session_id=None):
+    data = json.dumps(body).encode() if body is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(data)}\r\n"
+    if session_id is not None:
+        head += f"X-Session-Id: {session_id}\r\n"
+    writer.write((head + "\r\n").encode() + data)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(port, number, requests, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _, created = await request(reader, writer, "POST", "/sessions")
+    session_id = created["session_id"]
+
+    for i in range(requests):
+        start = time.perf_counter()
+        if i % 10 == 9:
+            status, _ = await request(reader, writer, "POST", "/cart/items",
+                                      {"appliance_id": 1 + (number + i) % 21, "quantity": 1},
+                                      session_id)
+        else:
+            status, _ = await request(reader, writer, "GET", PATHS[(number + i) % len(PATHS)])
+        latencies.append(time.perf_counter() - start)
+        assert status in (200, 409), status
+
+    writer.close()
+
+
+def print_histogram(latencies):
+    buckets = {}
+    for latency in latencies:
+        bucket = 0.0001
+        while latency > bucket:
+            bucket *= 2
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+
+    for bucket in sorted(buckets):
+        share = buckets[bucket] / len(latencies)
+        print(f"  <= {bucket * 1000:>9.2f} ms {buckets[bucket]:>8,} {'#' * max(1, int(share * 50))}")
+
+
+async def main(clients, requests):
+    api = StoreAPI()
+    server = await api.serve("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, n, requests, latencies) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    server.close()
+    await server.wait_closed()
+    api.executor.shutdown()
+
+    latencies.sort()
+    print(f"{len(latencies):,} requests from {clients} clients in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} req/s)")
+    print(f"p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    print_histogram(latencies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+                     int(sys.argv[2]) if len(sys.argv) > 2 else 200))
@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from auth import AuthSystem
+from database import Database
+from storage import MemoryStorage, SQLiteStorage
+
+
+def checkout(database, auth, rng, username):
+    appliance_ids = rng.sample(range(1, database.next_appliance_id), 3)
+    with database.transaction():
+        items = []
+        for appliance_id in appliance_ids:
+            appliance = database.get_appliance(appliance_id)
+            items.append({
+                "name": appliance["name"],
+                "quantity": 1,
+                "unit_price": appliance["price"],
+                "total_price": appliance["price"]
+            })
+            database.update_appliance_status(appliance_id, "Sold")
+        database.add_sale(username, items, sum(item["total_price"] for item in items),
+                          "STORE PICKUP", 0, "2026-01-01 12:00:00")
+        auth.add_purchase(username)
+
+
+def run(name, storage, orders, catalog_size=1000, seed=7):
+    rng = random.Random(seed)
+    database = Database(storage)
+    auth = AuthSystem(storage)
+    auth.register("shopper", "secret")
+
+    for i in range(catalog_size):
+        database.add_appliance(f"Item {i}", rng.randint(1000, 100000), "Available", "Bench")
+
+    start = time.perf_counter()
+    for _ in range(orders):
+        checkout(database, auth, rng, "shopper")
+    elapsed = time.perf_counter() - start
+
+    storage.close()
+    print(f"{name:<12} {orders:>8,} orders {elapsed:>8.3f}s {orders / elapsed:>12,.0f} orders/s")
+
+
+def main(orders):
+    run("memory", MemoryStorage(), orders)
+    with tempfile.TemporaryDirectory() as directory:
+        run("sqlite-wal", SQLiteStorage(os.path.join(directory, "bench.db")), orders)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from delivery import SLOT_FORMAT, DeliveryScheduler
+
+
+DISTRICTS = [f"District {number}" for number in range(50)]
+TIERS = [None, "Bronze", "Silver", "Gold"]
+NOW = datetime(2026, 1, 5, 8, 0)
+
+
+def build_requests(count, seed=42):
+    rng = random.Random(seed)
+    return [(rng.choice(DISTRICTS), rng.choices(TIERS, weights=[70, 15, 10, 5])[0])
+            for _ in range(count)]
+
+
+def summarize(label, requests, slots, elapsed):
+    waits = {}
+    for (_, membership), slot in zip(requests, slots):
+        if slot is None:
+            continue
+        hours = (datetime.strptime(slot["start"], SLOT_FORMAT) - NOW).total_seconds() / 3600
+        waits.setdefault(membership or "None", []).append(hours)
+
+    booked = sum(slot is not None for slot in slots)
+    print(f"{label:<14} {booked:>9,} {len(slots) - booked:>9,} {len(slots) / elapsed:>12,.0f} "
+          f"{elapsed / len(slots) * 1e6:>10.2f}", end="")
+    for tier in ("Gold", "Silver", "Bronze", "None"):
+        samples = waits.get(tier, [])
+        print(f" {sum(samples) / len(samples) if samples else 0:>9.1f}", end="")
+    print()
+
+
+def main(count):
+    requests = build_requests(count)
+    print(f"{'mode':<14} {'booked':>9} {'rejected':>9} {'bookings/s':>12} {'us/booking':>10} "
+          f"{'Gold (h)':>9} {'Silver (h)':>9} {'Bronze (h)':>9} {'None (h)':>9}")
+
+    scheduler = DeliveryScheduler(capacity=40)
+    start = time.perf_counter()
+    slots = [scheduler.book(district, membership, NOW) for district, membership in requests]
+    summarize("one by one", requests, slots, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    released = sum(scheduler.release(slot) for slot in slots if slot is not None)
+    elapsed = time.perf_counter() - start
+    print(f"{'release':<14} {released:>9,} {'':>9} {released / elapsed:>12,.0f} {elapsed / released * 1e6:>10.2f}")
+
+    for batch_size in (256, 4096):
+        scheduler = DeliveryScheduler(capacity=40)
+        start = time.perf_counter()
+        slots = []
+        for low in range(0, count, batch_size):
+            slots.extend(scheduler.book_many(requests[low:low + batch_size], NOW))
+        summarize(f"batch {batch_size}", requests, slots, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cart import ShoppingCart
+from membership import Membership
+
+
+def legacy_calculate_discount(price, package_name):
+    if not package_name:
+        return price
+    package = Membership.get_package_info(package_name)
+    if package:
+        return round(price * (1 - package["discount"] / 100))
+    return price
+
+
+def legacy_total(cart, package_name):
+    total = 0
+    for item in cart.items.values():
+        price = round(legacy_calculate_discount(item["appliance"]["price"], package_name))
+        total += price * item["quantity"]
+    return round(total)
+
+
+def build_cart(lines, distinct_prices, seed=11):
+    rng = random.Random(seed)
+    prices = [rng.randint(100, 90000) * 100 for _ in range(distinct_prices)]
+    cart = ShoppingCart()
+    for appliance_id in range(1, lines + 1):
+        cart.add_item({"id": appliance_id, "name": f"SKU {appliance_id}",
+                       "price": rng.choice(prices), "status": "Available",
+                       "category": "B2B", "stock": 100}, rng.randint(1, 20))
+    return cart
+
+
+def measure(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(lines):
+    print(f"{'lines':>8} {'prices':>8} {'legacy (ms)':>12} {'memoized (ms)':>14} {'speedup':>9} {'hit rate':>9}")
+    for distinct in (100, 5000, lines):
+        cart = build_cart(lines, distinct)
+        for package in ("Bronze", "Gold"):
+            assert cart.get_total(package) == legacy_total(cart, package)
+
+        Membership.invalidate_discount_cache()
+        repeat = max(3, 100000 // lines)
+        legacy = measure(lambda: legacy_total(cart, "Gold"), repeat)
+        memoized = measure(lambda: cart.get_total("Gold"), repeat)
+
+        stats = Membership.get_discount_cache_stats()
+        hit_rate = stats["hits"] / max(1, stats["hits"] + stats["misses"])
+        print(f"{lines:>8,} {distinct:>8,} {legacy * 1000:>12.3f} {memoized * 1000:>14.3f} "
+              f"{legacy / memoized:>8.1f}x {hit_rate:>8.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from auth import AuthSystem
+
+
+USERS = 64
+
+
+def run(label, auth, logins, threads, cached):
+    if not cached:
+        auth.credential_cache.clear()
+
+    def login(number):
+        if not cached:
+            auth.credential_cache.clear()
+        return auth.authenticate(f"user{number % USERS}", "correct horse")[0]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        assert all(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {threads:>8} {logins:>8,} {logins / elapsed:>12,.1f}")
+
+
+def main(logins):
+    workers = os.cpu_count() or 1
+    print(f"{'mode':<28} {'threads':>8} {'logins':>8} {'logins/s':>12}")
+
+    for kdf_workers in (0, workers):
+        auth = AuthSystem(kdf_workers=kdf_workers)
+        for number in range(USERS):
+            auth.register(f"user{number}", "correct horse")
+
+        label = "kdf inline" if not kdf_workers else f"kdf pool ({kdf_workers} procs)"
+        run(label, auth, logins, workers * 2, cached=False)
+        run(label + " + cache", auth, logins * 100, workers * 2, cached=True)
+        auth.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
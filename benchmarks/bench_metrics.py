@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cart import ShoppingCart
+from database import Database
+from metrics import METRICS, SamplingProfiler
+
+
+def per_call(func, calls):
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def measure(label, raw, instrumented, calls):
+    baseline = min(per_call(raw, calls) for _ in range(5))
+
+    METRICS.disable()
+    disabled = min(per_call(instrumented, calls) for _ in range(5))
+
+    METRICS.enable()
+    enabled = min(per_call(instrumented, calls) for _ in range(5))
+    METRICS.disable()
+
+    print(f"{label:<28} {baseline:>10.0f} {disabled:>10.0f} {disabled - baseline:>+10.0f} "
+          f"{enabled:>10.0f} {enabled - baseline:>+10.0f}")
+
+
+def main(calls):
+    database = Database()
+    cart = ShoppingCart()
+    for appliance in list(database.appliances.values())[:3]:
+        cart.add_item(appliance, 2)
+
+    get_total = ShoppingCart.get_total.__wrapped__
+    search = Database.search_appliances.__wrapped__
+
+    print(f"{'call':<28} {'raw (ns)':>10} {'off (ns)':>10} {'off +':>10} {'on (ns)':>10} {'on +':>10}")
+    measure("cart.get_total", lambda: get_total(cart, "Gold"), lambda: cart.get_total("Gold"), calls)
+    measure("database.search_appliances", lambda: search(database, "mixer", 20),
+            lambda: database.search_appliances("mixer", 20), calls)
+    measure("timer() block", lambda: None, lambda: METRICS.timer("bench").__enter__(), calls)
+
+    METRICS.enable(SamplingProfiler(0.001))
+    with METRICS.profile("bench"):
+        per_call(lambda: cart.get_total("Gold"), calls)
+    print(f"\nprofiler: {METRICS.profiler.samples} samples, top frames:")
+    for function, own, cumulative in METRICS.profiler.top(5):
+        print(f"  {function:<40} self {own:>5}  total {cumulative:>5}")
+    METRICS.disable()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,81 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from auth import AuthSystem
+from cart import ShoppingCart
+from database import Database
+from generators import DISTRICTS, pick_user, populate_catalog, populate_users
+from models import OrderRequest
+from orders import OrderService
+from storage import JournalStorage, SQLiteStorage
+
+
+CATALOG_SIZE = 20000
+USERS = 5000
+
+
+def build_requests(database, users, count, seed):
+    rng = random.Random(seed)
+    available = [app for app in database.appliances.values() if app.status == "Available"]
+    requests = []
+    for _ in range(count):
+        cart = ShoppingCart()
+        for appliance in rng.sample(available, rng.randint(1, 4)):
+            cart.add_item(appliance, 1)
+        user = pick_user(rng, users)
+        requests.append(OrderRequest(user, cart, rng.random() < 0.5, None))
+    return requests
+
+
+def run(make_storage, orders, group_size):
+    directory = tempfile.mkdtemp()
+    try:
+        storage = make_storage(directory)
+        database = Database(storage)
+        auth = AuthSystem(storage)
+        populate_catalog(database, CATALOG_SIZE)
+        users = populate_users(auth, USERS)
+        for number, user in enumerate(users):
+            if not user["delivery_address"]:
+                user["delivery_district"] = DISTRICTS[number % len(DISTRICTS)]
+                user["delivery_address"] = f"1 Main Street, {user['delivery_district']}, Tashkent"
+        service = OrderService(database, auth)
+        requests = build_requests(database, users, orders, seed=7)
+
+        start = time.perf_counter()
+        if group_size == 1:
+            results = [service.place(request) for request in requests]
+        else:
+            results = service.place_many(requests, group_size)
+        elapsed = time.perf_counter() - start
+
+        placed = sum(result.success for result in results)
+        assert placed == len(database.sales)
+        database.close()
+        return placed / elapsed
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(orders):
+    backends = [
+        ("memory", lambda directory: None),
+        ("sqlite", lambda directory: SQLiteStorage(os.path.join(directory, "store.db"))),
+        ("journal", lambda directory: JournalStorage(os.path.join(directory, "journal"))),
+    ]
+    print(f"{'storage':<10} {'per-order/s':>12} {'batch 16/s':>12} {'batch 256/s':>12} {'speedup':>9}")
+    for label, make_storage in backends:
+        single = run(make_storage, orders, 1)
+        small = run(make_storage, orders, 16)
+        large = run(make_storage, orders, 256)
+        print(f"{label:<10} {single:>12,.0f} {small:>12,.0f} {large:>12,.0f} {large / single:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
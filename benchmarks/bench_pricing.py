@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pricing
+from cart import ShoppingCart
+from membership import Membership
+
+
+def legacy_totals(cart, package_name):
+    original = discounted = 0
+    for item in cart.items.values():
+        price = item["appliance"]["price"]
+        final_price = round(Membership.calculate_discount(price, package_name)) if package_name else price
+        original += price * item["quantity"]
+        discounted += final_price * item["quantity"]
+    return original, discounted
+
+
+def build_cart(lines, seed=3):
+    rng = random.Random(seed)
+    cart = ShoppingCart()
+    for appliance_id in range(1, lines + 1):
+        appliance = {"id": appliance_id, "name": f"Part {appliance_id}",
+                     "price": rng.randint(1000, 9000000), "status": "Available",
+                     "category": "B2B", "stock": 1000}
+        cart.add_item(appliance, rng.randint(1, 50))
+    return cart
+
+
+def measure(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(sizes):
+    print(f"numpy: {'yes' if pricing.numpy is not None else 'no (pure Python path)'}")
+    print(f"{'lines':>8} {'package':>8} {'legacy (ms)':>12} {'engine (ms)':>12} {'speedup':>9}"
+          f" {'totals only (ms)':>17}")
+    for lines in sizes:
+        cart = build_cart(lines)
+        repeat = max(3, 200000 // lines)
+        for package in (None, "Silver", "Gold"):
+            result = cart.price(package)
+            assert (result["original_total"], result["discounted_total"]) == legacy_totals(cart, package)
+
+            # checkout used to run two display passes plus two get_total passes
+            legacy = measure(lambda: [legacy_totals(cart, package) for _ in range(4)], repeat)
+            engine = measure(lambda: cart.price(package), repeat)
+            totals = measure(lambda: cart.get_total(package), repeat)
+            print(f"{lines:>8,} {package or '-':>8} {legacy * 1000:>12.3f} {engine * 1000:>12.3f} "
+                  f"{legacy / engine:>8.1f}x {totals * 1000:>17.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000, 100000])
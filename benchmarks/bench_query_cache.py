@@ -0,0 +1,45 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_search import CATEGORIES, QUERIES, build_database
+from query_cache import QueryCache
+
+
+def workload(database, operations, write_ratio, seed=3):
+    rng = random.Random(seed)
+    appliance_ids = list(database.appliances)
+    start = time.perf_counter()
+    for _ in range(operations):
+        roll = rng.random()
+        if roll < write_ratio:
+            database.update_appliance(rng.choice(appliance_ids), price=rng.randint(100000, 9000000))
+        elif roll < 0.6:
+            database.search_appliances(QUERIES[min(int(rng.expovariate(0.5)), len(QUERIES) - 1)], 20)
+        elif roll < 0.9:
+            database.get_appliances_by_category(rng.choice(CATEGORIES))
+        else:
+            database.get_all_categories()
+    return (time.perf_counter() - start) / operations
+
+
+def main(size, operations):
+    print(f"{'writes':>8} {'uncached (ms)':>14} {'cached (ms)':>12} {'speedup':>9} {'hit rate':>9} {'evictions':>10}")
+    database = build_database(size)
+    for write_ratio in (0.0, 0.001, 0.01, 0.1):
+        database.query_cache = QueryCache(max_size=0)
+        uncached = workload(database, operations, write_ratio)
+
+        database.query_cache = QueryCache()
+        cached = workload(database, operations, write_ratio)
+        stats = database.get_query_cache_stats()
+        print(f"{write_ratio:>8.1%} {uncached * 1000:>14.3f} {cached * 1000:>12.3f} "
+              f"{uncached / cached:>8.1f}x {stats['hit_rate']:>8.1%} {stats['evictions']:>10,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
@@ -0,0 +1,72 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from models import Appliance, CartLine, Sale, SaleItem
+
+
+def appliance_rows(count):
+    for appliance_id in range(1, count + 1):
+        yield appliance_id, f"Product {appliance_id}", 100000 + appliance_id, "Available", f"Category {appliance_id % 50}", 10
+
+
+def as_dict(appliance_id, name, price, status, category, stock):
+    return {"id": appliance_id, "name": name, "price": price,
+            "status": status, "category": category, "stock": stock}
+
+
+def sale_item_dict(appliance):
+    return {"appliance_id": appliance["id"], "name": appliance["name"],
+            "category": appliance["category"], "quantity": 2,
+            "unit_price": appliance["price"], "total_price": appliance["price"] * 2}
+
+
+def sale_dict(sale_id, items):
+    return {"id": sale_id, "username": "shopper", "customer_id": None, "membership": None,
+            "items": items, "total_amount": sum(item["total_price"] for item in items),
+            "delivery_address": "STORE PICKUP", "delivery_fee": 0, "date": "2026-01-01 12:00:00"}
+
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def report(label, count, legacy, compact):
+    print(f"{label:<22} {count:>10,} {legacy / 2 ** 20:>12.1f} {compact / 2 ** 20:>12.1f} "
+          f"{legacy / count:>10.0f} {compact / count:>10.0f} {legacy / compact:>8.1f}x")
+
+
+def main(count):
+    print(f"{'records':<22} {'count':>10} {'dict (MiB)':>12} {'slots (MiB)':>12} "
+          f"{'dict B/rec':>10} {'slots B/rec':>10} {'saving':>9}")
+
+    legacy = measure(lambda: {row[0]: as_dict(*row) for row in appliance_rows(count)})
+    compact = measure(lambda: {row[0]: Appliance(*row) for row in appliance_rows(count)})
+    report("appliances", count, legacy, compact)
+
+    dict_catalog = [as_dict(*row) for row in appliance_rows(count // 10)]
+    catalog = [Appliance(*row) for row in appliance_rows(count // 10)]
+    lines = len(catalog)
+    legacy = measure(lambda: {app["id"]: {"appliance": app.copy(), "quantity": 1} for app in dict_catalog})
+    compact = measure(lambda: {app.id: CartLine(app.id, app, 1) for app in catalog})
+    report("cart lines", lines, legacy, compact)
+
+    sales = count // 10
+    legacy = measure(lambda: [sale_dict(i, [sale_item_dict(dict_catalog[(i * 3 + k) % lines]) for k in range(3)])
+                              for i in range(sales)])
+    compact = measure(lambda: [Sale(i, "shopper", [SaleItem.for_line(CartLine(app.id, app, 2))
+                                                   for app in (catalog[(i * 3 + k) % lines] for k in range(3))],
+                                    0, "STORE PICKUP", 0, "2026-01-01 12:00:00")
+                               for i in range(sales)])
+    report("sales (3 items each)", sales, legacy, compact)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
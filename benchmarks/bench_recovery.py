@@ -0,0 +1,95 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from database import Database
+from models import SaleItem
+from storage import JournalStorage
+
+
+def write_history(directory, operations, seed=8):
+    rng = random.Random(seed)
+    storage = JournalStorage(directory, sync="none", snapshot_every=10 ** 12)
+    database = Database(storage)
+    appliance_ids = database.add_appliances(
+        [(f"Product {i}", rng.randint(1000, 90000) * 100, "Available", f"Category {i % 20}", 1000)
+         for i in range(max(1, operations // 10))])
+
+    for _ in range(operations):
+        appliance = database.get_appliance(rng.choice(appliance_ids))
+        if rng.random() < 0.25:
+            quantity = rng.randint(1, 3)
+            database.add_sale(f"user{rng.randrange(1000)}",
+                              [SaleItem(appliance.name, quantity, appliance.price, appliance.price * quantity,
+                                        appliance.id, appliance.category)],
+                              appliance.price * quantity, "STORE PICKUP", 0, "2026-01-01 12:00:00")
+        else:
+            database.update_appliance(appliance.id, price=rng.randint(1000, 90000) * 100)
+    storage.flush()
+    return storage
+
+
+def recover(directory):
+    start = time.perf_counter()
+    storage = JournalStorage(directory, snapshot_every=10 ** 12)
+    opened = time.perf_counter() - start
+    database = Database(storage)
+    return storage, database, opened, time.perf_counter() - start
+
+
+def throughput(mode, threads, writes):
+    directory = tempfile.mkdtemp()
+    try:
+        storage = JournalStorage(directory, sync=mode, snapshot_every=10 ** 12)
+        database = Database(storage)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda n: database.update_appliance_status(n % 21 + 1, "Available"),
+                          range(writes)))
+        elapsed = time.perf_counter() - start
+        storage.close()
+        return writes / elapsed
+    finally:
+        shutil.rmtree(directory)
+
+
+def main(sizes):
+    print(f"{'operations':>12} {'journal (MiB)':>14} {'replay (s)':>11} {'snapshot (MiB)':>15} "
+          f"{'load (s)':>9} {'speedup':>8} {'startup replay/snapshot (s)':>28}")
+    for operations in sizes:
+        directory = tempfile.mkdtemp()
+        try:
+            write_history(directory, operations)
+            journal_size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+            storage, database, replay_time, replay_startup = recover(directory)
+            expected = (len(database.sales), database.get_sales_report()["total_revenue"])
+            storage.snapshot()
+            snapshot_size = sum(os.path.getsize(os.path.join(directory, name))
+                                for name in os.listdir(directory) if name.startswith("snapshot"))
+            storage.flush()
+
+            storage, database, snapshot_time, snapshot_startup = recover(directory)
+            assert (len(database.sales), database.get_sales_report()["total_revenue"]) == expected
+            storage.close()
+
+            print(f"{operations:>12,} {journal_size / 2 ** 20:>14.1f} {replay_time:>11.2f} "
+                  f"{snapshot_size / 2 ** 20:>15.1f} {snapshot_time:>9.2f} {replay_time / snapshot_time:>7.1f}x "
+                  f"{replay_startup:>17.2f} / {snapshot_startup:.2f}")
+        finally:
+            shutil.rmtree(directory)
+
+    print(f"\n{'sync':>8} {'threads':>8} {'writes/s':>10}")
+    for mode in ("group", "async", "none"):
+        for threads in (1, 16):
+            print(f"{mode:>8} {threads:>8} {throughput(mode, threads, 2000):>10,.0f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
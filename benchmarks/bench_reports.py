@@ -0,0 +1,92 @@
+import os
+import random
+import sys
+import time
+from array import array
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from reports import ReportEngine, SalesColumns
+
+
+TIERS = ["None", "Bronze", "Silver", "Gold"]
+CATEGORIES = ["Kitchen appliances", "Cleaning devices", "Heating and cooling devices",
+              "Personal care devices", "Smart home devices"]
+SKUS = 100000
+
+
+def synthetic_columns(sales, seed=42):
+    rng = random.Random(seed)
+    columns = SalesColumns()
+    for tier in TIERS:
+        columns.tiers.encode(tier)
+    for category in CATEGORIES:
+        columns.categories.encode(category)
+    for sku in range(1, SKUS + 1):
+        columns.skus.encode(sku)
+
+    first_day = date(2025, 1, 1).toordinal()
+    item_count = 0
+    item_ends = array("q")
+    item_counts = [rng.randint(1, 4) for _ in range(sales)]
+    for count in item_counts:
+        item_count += count
+        item_ends.append(item_count)
+
+    columns.columns["day"] = array("i", (first_day + i * 365 // sales for i in range(sales)))
+    columns.columns["tier"] = array("i", (rng.choices(range(4), weights=[70, 15, 10, 5], k=sales)))
+    columns.columns["pickup"] = array("b", (rng.random() < 0.4 for _ in range(sales)))
+    columns.columns["item_end"] = item_ends
+    columns.item_columns["category"] = array("i", (rng.randrange(len(CATEGORIES)) for _ in range(item_count)))
+    columns.item_columns["sku"] = array("i", (int(rng.paretovariate(1.1)) % SKUS for _ in range(item_count)))
+    columns.item_columns["quantity"] = array("i", (rng.randint(1, 3) for _ in range(item_count)))
+    columns.item_columns["total_price"] = array("q", (rng.randrange(100000, 20000000, 1000)
+                                                       for _ in range(item_count)))
+
+    totals = array("q")
+    prices = columns.item_columns["total_price"]
+    start = 0
+    for end in item_ends:
+        totals.append(sum(prices[start:end]))
+        start = end
+    columns.columns["total"] = totals
+    columns.last_id = sales
+    return columns
+
+
+def run(columns, workers, start=None, end=None):
+    engine = ReportEngine(workers)
+    engine.MIN_PARALLEL_SALES = 0
+    try:
+        engine.report(columns, start, end)
+        began = time.perf_counter()
+        report = engine.report(columns, start, end)
+        return time.perf_counter() - began, report
+    finally:
+        engine.close()
+
+
+def main(sales):
+    began = time.perf_counter()
+    columns = synthetic_columns(sales)
+    print(f"Generated {sales:,} sales / {len(columns.item_columns['sku']):,} items "
+          f"in {time.perf_counter() - began:.1f} s on {os.cpu_count()} core(s)\n")
+
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)) | {1})
+    print(f"{'workers':>8} {'all (s)':>9} {'sales/s':>12} {'speedup':>8} {'1 month (s)':>12}")
+    baseline = None
+    expected = None
+    for workers in counts:
+        elapsed, report = run(columns, workers)
+        month, _ = run(columns, workers, "2025-06-01", "2025-06-30")
+        if expected is None:
+            baseline = elapsed
+            expected = report
+        assert report == expected
+        print(f"{workers:>8} {elapsed:>9.2f} {sales / elapsed:>12,.0f} {baseline / elapsed:>7.1f}x {month:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000000)
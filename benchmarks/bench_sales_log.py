@@ -0,0 +1,86 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from database import Database
+from models import Sale
+from sales_log import SalesLog
+
+
+START = 1735689600
+NAMES = ["Mixer", "Oven", "Blender", "Microwave", "Refrigerator", "Air Conditioner",
+         "Washing Machine", "Vacuum Cleaner", "Smart TV", "Laptop"]
+
+
+def generate_sales(count, users, seed=5):
+    rng = random.Random(seed)
+    step = 365 * 24 * 3600 // count
+    for sale_id in range(1, count + 1):
+        items = []
+        for _ in range(rng.randint(1, 4)):
+            price = rng.randint(100, 90000) * 100
+            quantity = rng.randint(1, 3)
+            items.append({"name": rng.choice(NAMES), "quantity": quantity,
+                          "unit_price": price, "total_price": price * quantity})
+        date = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(START + sale_id * step))
+        yield {"id": sale_id, "username": f"user{rng.randrange(users)}", "customer_id": None,
+               "membership": None, "items": items,
+               "total_amount": sum(item["total_price"] for item in items),
+               "delivery_address": "STORE PICKUP", "delivery_fee": 0,
+               "date": date, "delivery_slot": None}
+
+
+def measure(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main(count):
+    directory = tempfile.mkdtemp()
+    try:
+        tracemalloc.start()
+        database = Database()
+        for sale in generate_sales(count, 1000):
+            database._store_sale(Sale.from_dict(sale))
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        log = SalesLog(directory)
+        start = time.perf_counter()
+        log.append_many(generate_sales(count, 1000))
+        append_time = time.perf_counter() - start
+        log_bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        month_start = START + 180 * 24 * 3600
+        month_end = month_start + 30 * 24 * 3600
+        scan, expected = measure(lambda: database.get_revenue_between(month_start, month_end))
+        columnar, revenue = measure(lambda: log.revenue_between(month_start, month_end))
+        assert revenue == expected
+
+        user_scan, expected = measure(lambda: database.get_sales_between(month_start, month_end, "user7"))
+        user_columnar, rows = measure(lambda: log.between(month_start, month_end, "user7"))
+        assert rows == expected
+
+        print(f"sales:              {count:,}")
+        print(f"dict records:       {dict_bytes / 2 ** 20:.1f} MiB in memory")
+        print(f"columnar files:     {log_bytes / 2 ** 20:.1f} MiB on disk "
+              f"(appended in {append_time * 1000:.0f} ms)")
+        print(f"month revenue:      {scan * 1000:.2f} ms scan vs {columnar * 1000:.2f} ms columnar "
+              f"({scan / columnar:.1f}x)")
+        print(f"user month history: {user_scan * 1000:.2f} ms scan vs {user_columnar * 1000:.2f} ms columnar "
+              f"({user_scan / user_columnar:.1f}x)")
+        log.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,75 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from database import Database
+
+
+BRANDS = ["Artel", "Samsung", "LG", "Bosch", "Philips", "Tefal", "Xiaomi", "Braun", "Midea", "Haier"]
+PRODUCTS = ["Mixer", "Oven", "Blender", "Microwave", "Refrigerator", "Toaster", "Kettle",
+            "Vacuum Cleaner", "Air Conditioner", "Heater", "Fan", "Hair Dryer", "Smart Speaker",
+            "Холодильник", "Crème Brûlée Torch"]
+CATEGORIES = ["Kitchen appliances", "Cleaning devices", "Heating and cooling devices",
+              "Personal care devices", "Smart home devices"]
+QUERIES = ["mixer", "sam", "oven", "lg", "ac", "smart", "dryer", "cleaner 3", "kitchen", "zzz",
+           "холод", "crème"]
+TYPOS = {"refrigirator": "Refrigerator", "mixr": "Mixer", "vacum": "Vacuum",
+         "samsnug": "Samsung", "toastre": "Toaster", "blendr": "Blender", "kettel": "Kettle"}
+TOP_K = 20
+
+
+def linear_search(database, keyword):
+    keyword = keyword.lower()
+    return [app for app in database.appliances.values()
+            if (keyword in app["name"].lower() or
+                keyword in app["category"].lower()) and
+                app["status"] == "Available"]
+
+
+def build_database(size, seed=42):
+    rng = random.Random(seed)
+    database = Database()
+    for _ in range(size):
+        name = f"{rng.choice(BRANDS)} {rng.choice(PRODUCTS)} {rng.randint(100, 9999)}"
+        status = "Available" if rng.random() < 0.9 else "Sold"
+        database.add_appliance(name, rng.randint(100000, 9000000), status, rng.choice(CATEGORIES))
+    return database
+
+
+def measure(func, database, repeat, queries=QUERIES):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            func(database, query)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def main(sizes):
+    print(f"{'items':>10} {'linear (ms)':>12} {'ranked (ms)':>12} {f'top-{TOP_K} (ms)':>12} "
+          f"{'typo (ms)':>10} {'typo hits':>10}")
+    for size in sizes:
+        database = build_database(size)
+
+        for query in QUERIES:
+            ranked = {app["id"] for app in database.search_appliances(query)}
+            assert ranked >= {app["id"] for app in linear_search(database, query)}, query
+
+        hits = 0
+        for typo, expected in TYPOS.items():
+            top = database.search_appliances(typo, TOP_K)
+            hits += bool(top) and all(expected in app["name"] for app in top)
+
+        repeat = max(1, 100000 // size)
+        linear = measure(linear_search, database, repeat)
+        ranked = measure(lambda db, q: db.search_appliances(q), database, repeat)
+        top_k = measure(lambda db, q: db.search_appliances(q, TOP_K), database, repeat)
+        typo = measure(lambda db, q: db.search_appliances(q, TOP_K), database, repeat, list(TYPOS))
+        print(f"{size:>10,} {linear * 1000:>12.3f} {ranked * 1000:>12.3f} {top_k * 1000:>12.3f} "
+              f"{typo * 1000:>10.3f} {hits:>6}/{len(TYPOS)}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
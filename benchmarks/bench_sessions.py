@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from auth import AuthSystem
+from database import Database
+from session import SessionManager
+
+
+CATEGORIES = ["Kitchen appliances", "Cleaning devices", "Smart home devices"]
+SHOPPERS = 200
+KEYWORDS = ["mixer", "smart", "vacuum", "item 1"]
+
+
+def shop(database, sessions, number):
+    rng = random.Random(number)
+    start = time.perf_counter()
+
+    session = sessions.create()
+    username = f"shopper{number % SHOPPERS}"
+    assert session.login(username, "secret")[0]
+
+    database.get_appliances_by_category(rng.choice(CATEGORIES))
+    results = database.search_appliances(rng.choice(KEYWORDS), 20)
+    for appliance in rng.sample(results, min(2, len(results))):
+        session.cart.add_item(appliance, rng.randint(1, 3))
+
+    reservation = session.cart.reserve(database)
+    if reservation is not None:
+        items = [{"name": item["appliance"]["name"], "quantity": item["quantity"],
+                  "unit_price": item["appliance"]["price"],
+                  "total_price": item["appliance"]["price"] * item["quantity"]}
+                 for item in session.cart.get_items().values()]
+        with database.transaction():
+            database.add_sale(username, items, session.cart.get_total(), "STORE PICKUP", 0,
+                              "2026-01-01 12:00:00")
+            database.commit_reservation(reservation)
+            sessions.auth.add_purchase(username)
+
+    sessions.close(session.session_id)
+    return time.perf_counter() - start
+
+
+def run(threads, total_sessions, catalog_size=5000):
+    database = Database()
+    for appliance_id in list(database.appliances):
+        database.set_stock(appliance_id, 1000000)
+    for i in range(catalog_size):
+        database.add_appliance(f"Item {i}", 100000 + i, "Available", CATEGORIES[i % 3], 1000000)
+    sessions = SessionManager(AuthSystem())
+    for number in range(SHOPPERS):
+        sessions.auth.register(f"shopper{number}", "secret")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(lambda n: shop(database, sessions, n), range(total_sessions)))
+    elapsed = time.perf_counter() - start
+
+    assert len(database.sales) == total_sessions
+    assert sessions.count() == 0
+
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{threads:>8} {total_sessions:>10,} {total_sessions / elapsed:>12,.0f} {p50:>10.3f} {p99:>10.3f}")
+
+
+def main(total_sessions):
+    print(f"{'threads':>8} {'sessions':>10} {'sessions/s':>12} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for threads in (1, 8, 32, 128):
+        run(threads, total_sessions)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from database import Database
+
+
+def buy(database, appliance_id):
+    reservation = database.reserve_stock([(appliance_id, 1)])
+    if reservation is None:
+        return False
+    database.commit_reservation(reservation)
+    return True
+
+
+def run(threads, stock, attempts):
+    database = Database()
+    appliance_id = database.add_appliance("Hot Deal TV", 5000000, "Available", "Flash sale", stock)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda _: buy(database, appliance_id), range(attempts)))
+    elapsed = time.perf_counter() - start
+
+    sold = sum(results)
+    assert sold == min(stock, attempts), (sold, stock)
+    assert database.get_stock(appliance_id) == stock - sold
+    assert (database.get_appliance(appliance_id)["status"] == "Sold") == (sold == stock)
+
+    print(f"{threads:>8} {attempts:>10,} {sold:>8,} {elapsed:>9.3f}s {attempts / elapsed:>14,.0f}")
+
+
+def main():
+    print(f"{'threads':>8} {'attempts':>10} {'sold':>8} {'time':>10} {'attempts/s':>14}")
+    for threads in (1, 4, 16, 64):
+        run(threads, stock=50000, attempts=100000)
+
+
+if __name__ == "__main__":
+    main()
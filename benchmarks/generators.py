@@ -0,0 +1,115 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from auth import hash_password
+from membership import Membership
+from models import SaleItem
+
+
+BRANDS = ["Artel", "Samsung", "LG", "Bosch", "Philips", "Tefal", "Xiaomi", "Braun", "Midea", "Haier",
+          "Panasonic", "Electrolux", "Beko", "Hofmann", "Shivaki"]
+PRODUCTS = {
+    "Kitchen appliances": ["Mixer", "Oven", "Blender", "Microwave", "Refrigerator", "Toaster",
+                           "Kettle", "Dishwasher", "Coffee Machine", "Multicooker"],
+    "Cleaning devices": ["Vacuum Cleaner", "Robot Vacuum", "Steam Mop", "Washing Machine",
+                         "Window Cleaner"],
+    "Heating and cooling devices": ["Air Conditioner", "Heater", "Fan", "Humidifier",
+                                    "Air Purifier"],
+    "Personal care devices": ["Hair Dryer", "Shaver", "Hair Straightener", "Electric Toothbrush",
+                              "Trimmer"],
+    "Smart home devices": ["Smart Speaker", "Smart Plug", "Smart Camera", "Smart Lock",
+                           "Smart Thermostat"],
+}
+CATEGORIES = sorted(PRODUCTS)
+CITIES = ["Tashkent", "Samarkand", "Bukhara", "Namangan", "Andijan", "Fergana", "Nukus"]
+DISTRICTS = ["Chilanzar", "Yunusabad", "Mirzo Ulugbek", "Yakkasaray", "Shaykhantahur", "Sergeli",
+             "Almazar", "Uchtepa", "Bektemir", "Mirabad", "Yashnabad"]
+PASSWORD = "bench-password"
+START_DATE = datetime(2025, 1, 1)
+
+
+def generate_catalog(size, seed=42, sold_ratio=0.1):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(size):
+        category = rng.choice(CATEGORIES)
+        name = f"{rng.choice(BRANDS)} {rng.choice(PRODUCTS[category])} {rng.randint(100, 9999)}"
+        status = "Sold" if rng.random() < sold_ratio else "Available"
+        price = rng.randrange(100000, 20000000, 1000)
+        stock = 0 if status == "Sold" else rng.randint(1, 500)
+        rows.append((name, price, status, category, stock))
+    return rows
+
+
+def populate_catalog(database, size, seed=42, batch_size=10000):
+    rows = generate_catalog(size, seed)
+    for start in range(0, len(rows), batch_size):
+        database.add_appliances(rows[start:start + batch_size])
+    return rows
+
+
+def generate_users(count, seed=42, password=PASSWORD):
+    rng = random.Random(seed)
+    tiers = [None] + Membership.get_all_packages()
+    stored = hash_password(password)
+    users = []
+    for number in range(count):
+        address = None
+        district = None
+        if rng.random() < 0.6:
+            district = rng.choice(DISTRICTS)
+            address = f"{rng.randint(1, 200)} Street {rng.randint(1, 99)}, {district}, {rng.choice(CITIES)}"
+        users.append({
+            "username": f"user{number:06d}",
+            "password": stored,
+            "role": "customer",
+            "membership": rng.choices(tiers, weights=[70, 15, 10, 5])[0],
+            "total_purchases": 0,
+            "delivery_address": address,
+            "delivery_district": district
+        })
+    return users
+
+
+def populate_users(auth, count, seed=42, password=PASSWORD):
+    users = generate_users(count, seed, password)
+    for user in users:
+        auth.users[user["username"]] = user
+        auth.storage.save_user(user)
+    return users
+
+
+def pick_user(rng, users):
+    return users[min(int(rng.paretovariate(1.2)) - 1, len(users) - 1)]
+
+
+def generate_sales(database, users, count, seed=42, days=365):
+    rng = random.Random(seed)
+    users = list(users)
+    rng.shuffle(users)
+    appliance_ids = list(database.appliances)
+    step = timedelta(days=days) / max(count, 1)
+
+    sale_ids = []
+    for number in range(count):
+        user = pick_user(rng, users)
+        items = []
+        for appliance_id in rng.sample(appliance_ids, min(rng.randint(1, 4), len(appliance_ids))):
+            appliance = database.appliances[appliance_id]
+            quantity = rng.randint(1, 3)
+            items.append(SaleItem(appliance.name, quantity, appliance.price, appliance.price * quantity,
+                                  appliance.id, appliance.category))
+
+        delivery = user["delivery_address"] is not None and rng.random() < 0.7
+        fee = 50000 if delivery and not Membership.has_free_delivery(user["membership"]) else 0
+        total = sum(item.total_price for item in items) + fee
+        date = (START_DATE + step * number).strftime("%Y-%m-%d %H:%M:%S")
+        sale_ids.append(database.add_sale(user["username"], items, total,
+                                          user["delivery_address"] if delivery else "STORE PICKUP",
+                                          fee, date, membership=user["membership"]))
+        user["total_purchases"] += 1
+    return sale_ids
@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from auth import AuthSystem
+from cart import ShoppingCart
+from database import Database
+from generators import CATEGORIES, PASSWORD, generate_sales, pick_user, populate_catalog, populate_users
+from membership import Membership
+from models import OrderRequest
+from orders import OrderService
+from query_cache import QueryCache
+
+
+SCALES = {
+    "small": {"catalog": 10000, "users": 2000, "sales": 20000, "operations": 500},
+    "medium": {"catalog": 100000, "users": 20000, "sales": 200000, "operations": 2000},
+    "large": {"catalog": 500000, "users": 100000, "sales": 1000000, "operations": 5000},
+}
+QUERIES = ["mixer", "samsung", "oven 12", "lg", "smart", "dryer", "vacuum cleaner", "kitchen",
+           "refrigirator", "blendr", "air", "zzz"]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+class Fixture:
+
+    def __init__(self, scale, seed):
+        self.scale = scale
+        self.seed = seed
+        self.database = Database()
+        self.auth = AuthSystem()
+
+        start = time.perf_counter()
+        populate_catalog(self.database, scale["catalog"], seed)
+        self.users = populate_users(self.auth, scale["users"], seed)
+        generate_sales(self.database, self.users, scale["sales"], seed)
+        self.setup_seconds = time.perf_counter() - start
+
+        self.available = [app for app in self.database.appliances.values() if app.status == "Available"]
+        self.tiers = [None] + Membership.get_all_packages()
+
+
+def scenario_search(fixture, rng, operations):
+    database = fixture.database
+    cache = database.query_cache
+    database.query_cache = QueryCache(max_size=0)
+    try:
+        for _ in range(operations):
+            query = rng.choice(QUERIES)
+            yield lambda: database.search_appliances(query, 20)
+    finally:
+        database.query_cache = cache
+
+
+def scenario_search_cached(fixture, rng, operations):
+    database = fixture.database
+    for query in QUERIES:
+        database.search_appliances(query, 20)
+    for _ in range(operations):
+        query = rng.choice(QUERIES)
+        yield lambda: database.search_appliances(query, 20)
+
+
+def scenario_category_browse(fixture, rng, operations):
+    database = fixture.database
+
+    def browse(category, pages):
+        cursor = None
+        for _ in range(pages):
+            page = database.get_available_page(20, cursor, category)
+            if not page:
+                break
+            cursor = page[-1]["id"]
+
+    for _ in range(operations):
+        category = rng.choice(CATEGORIES)
+        pages = rng.randint(1, 5)
+        yield lambda: browse(category, pages)
+
+
+def scenario_cart_pricing(fixture, rng, operations):
+    for _ in range(operations):
+        cart = ShoppingCart()
+        for appliance in rng.sample(fixture.available, rng.randint(1, 10)):
+            cart.add_item(appliance, rng.randint(1, 3))
+        membership = rng.choice(fixture.tiers)
+        yield lambda: cart.get_total(membership)
+
+
+def scenario_checkout(fixture, rng, operations):
+    orders = OrderService(fixture.database, fixture.auth)
+    for _ in range(operations):
+        cart = ShoppingCart()
+        for appliance in rng.sample(fixture.available, rng.randint(1, 4)):
+            cart.add_item(appliance, 1)
+        request = OrderRequest(pick_user(rng, fixture.users), cart)
+        yield lambda: orders.place(request)
+
+
+def scenario_login(fixture, rng, operations):
+    auth = fixture.auth
+    for _ in range(max(1, operations // 50)):
+        username = rng.choice(fixture.users)["username"]
+        auth.credential_cache.clear()
+        yield lambda: auth.login(username, PASSWORD)
+
+
+def scenario_login_cached(fixture, rng, operations):
+    auth = fixture.auth
+    usernames = [user["username"] for user in rng.sample(fixture.users, min(20, len(fixture.users)))]
+    for username in usernames:
+        auth.authenticate(username, PASSWORD)
+    for _ in range(operations):
+        username = rng.choice(usernames)
+        yield lambda: auth.login(username, PASSWORD)
+
+
+def scenario_purchase_history(fixture, rng, operations):
+    database = fixture.database
+    for _ in range(operations):
+        username = pick_user(rng, fixture.users)["username"]
+        yield lambda: database.get_user_purchases_page(username, 5)
+
+
+SCENARIOS = {
+    "search": scenario_search,
+    "search_cached": scenario_search_cached,
+    "category_browse": scenario_category_browse,
+    "cart_pricing": scenario_cart_pricing,
+    "checkout": scenario_checkout,
+    "login": scenario_login,
+    "login_cached": scenario_login_cached,
+    "purchase_history": scenario_purchase_history,
+}
+
+
+def percentile(samples, percent):
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+def run_scenario(name, fixture, operations, seed):
+    rng = random.Random(f"{seed}:{name}")
+    samples = []
+    for operation in SCENARIOS[name](fixture, rng, operations):
+        start = time.perf_counter_ns()
+        operation()
+        samples.append(time.perf_counter_ns() - start)
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        "operations": len(samples),
+        "ops_per_second": len(samples) / (total / 1e9) if total else 0,
+        "mean_us": total / len(samples) / 1000,
+        "p50_us": percentile(samples, 50) / 1000,
+        "p95_us": percentile(samples, 95) / 1000,
+        "p99_us": percentile(samples, 99) / 1000,
+        "max_us": samples[-1] / 1000
+    }
+
+
+def compare(results, baseline, threshold, min_delta_us):
+    regressions = []
+    print(f"\n{'scenario':<18} {'base p50 (us)':>14} {'p50 (us)':>10} {'change':>9} {'status':>10}")
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            print(f"{name:<18} {'-':>14} {result['p50_us']:>10.1f} {'-':>9} {'new':>10}")
+            continue
+
+        change = result["p50_us"] / previous["p50_us"] - 1 if previous["p50_us"] else 0
+        significant = abs(result["p50_us"] - previous["p50_us"]) >= min_delta_us
+        status = "ok"
+        if significant and change > threshold:
+            status = "REGRESSED"
+            regressions.append(name)
+        elif significant and change < -threshold:
+            status = "improved"
+        print(f"{name:<18} {previous['p50_us']:>14.1f} {result['p50_us']:>10.1f} {change:>+8.1%} {status:>10}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tech House benchmark suite")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", help="comma-separated scenarios to run (default: all)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE,
+                        help="compare against a stored baseline (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE,
+                        help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative p50 slowdown that counts as a regression (default: 0.2)")
+    parser.add_argument("--min-delta-us", type=float, default=1.0,
+                        help="ignore p50 changes smaller than this many microseconds (default: 1.0)")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    if args.baseline and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; record one first with --save-baseline", file=sys.stderr)
+        sys.exit(2)
+
+    scale = SCALES[args.scale]
+    fixture = Fixture(scale, args.seed)
+    print(f"Generated {scale['catalog']:,} appliances, {scale['users']:,} users and "
+          f"{scale['sales']:,} sales in {fixture.setup_seconds:.1f} s (seed {args.seed})\n")
+
+    print(f"{'scenario':<18} {'ops':>7} {'ops/s':>12} {'mean (us)':>10} {'p50 (us)':>10} {'p99 (us)':>10}")
+    results = {}
+    for name in names:
+        result = results[name] = run_scenario(name, fixture, scale["operations"], args.seed)
+        print(f"{name:<18} {result['operations']:>7,} {result['ops_per_second']:>12,.0f} "
+              f"{result['mean_us']:>10.1f} {result['p50_us']:>10.1f} {result['p99_us']:>10.1f}")
+
+    report = {
+        "meta": {
+            "scale": args.scale,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            **scale
+        },
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["scale"] != args.scale or baseline["meta"]["seed"] != args.seed:
+            print(f"\nWarning: baseline was recorded with scale={baseline['meta']['scale']} "
+                  f"seed={baseline['meta']['seed']}")
+        regressions = compare(results, baseline, args.threshold, args.min_delta_us)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} scenario(s) regressed by more than {args.threshold:.0%}: "
+              f"{', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
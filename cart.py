@@ -1,4 +1,7 @@
 from membership import Membership
+from metrics import timed
+from models import CartLine
+from pricing import price_cart
 
 
 class ShoppingCart:
@@ -13,9 +16,9 @@ class ShoppingCart:
         appliance_id = appliance["id"]
 
         if appliance_id in self.items:
-            self.items[appliance_id]["quantity"] += int(quantity)
+            self.items[appliance_id].quantity += int(quantity)
         else:
-            self.items[appliance_id] = {"appliance": appliance.copy(), "quantity": int(quantity)}
+            self.items[appliance_id] = CartLine(appliance_id, appliance, int(quantity))
         return True
 
     def remove_item(self, appliance_id):
@@ -28,9 +31,9 @@ class ShoppingCart:
         if appliance_id not in self.items or not self._is_valid_quantity(quantity):
             return False
 
-        self.items[appliance_id]["quantity"] -= int(quantity)
+        self.items[appliance_id].quantity -= int(quantity)
 
-        if self.items[appliance_id]["quantity"] <= 0:
+        if self.items[appliance_id].quantity <= 0:
             del self.items[appliance_id]
 
         return True
@@ -47,24 +50,30 @@ class ShoppingCart:
         if quantity <= 0:
             del self.items[appliance_id]
         else:
-            self.items[appliance_id]["quantity"] = quantity
+            self.items[appliance_id].quantity = quantity
         
         return True
 
     def update_quantity(self, appliance_id, quantity):
         return self.set_quantity(appliance_id, quantity)
 
+    @timed("cart.get_total")
     def get_total(self, membership_package=None):
-        total = 0
-        for item in self.items.values():
-            price = item["appliance"]["price"]
-            if membership_package:
-                price = round(Membership.calculate_discount(price, membership_package))
-            total += price * item["quantity"]
-        return round(total)
+        return round(self.price(membership_package, with_lines=False)["discounted_total"])
+
+    def price(self, membership_package=None, with_lines=True):
+        return price_cart(list(self.items.values()), membership_package, with_lines)
+
+    def get_quantity(self, appliance_id):
+        item = self.items.get(appliance_id)
+        return item.quantity if item else 0
+
+    def reserve(self, database):
+        return database.reserve_stock((appliance_id, item.quantity)
+                                      for appliance_id, item in self.items.items())
 
     def get_item_count(self):
-        return sum(item["quantity"] for item in self.items.values())
+        return sum(item.quantity for item in self.items.values())
 
     def get_unique_item_count(self):
         return len(self.items)
@@ -78,7 +87,7 @@ class ShoppingCart:
     def get_items(self):
         return self.items.copy()
 
-    def display(self, membership_package=None):
+    def display(self, membership_package=None, pricing=None):
         print("SHOPPING CART")
 
         if self.is_empty():
@@ -87,20 +96,15 @@ class ShoppingCart:
 
         print(f"\n{'Product':<35} {'Qty':>5} {'Price':>12} {'Subtotal':>12}")
 
-        original_total = discounted_total = 0
-
-        for item in self.items.values():
-            appliance = item["appliance"]
-            quantity = item["quantity"]
-            original_price = appliance["price"]
-
-            final_price = round(Membership.calculate_discount(original_price, membership_package)) if membership_package else original_price
-
-            original_subtotal = original_price * quantity
-            final_subtotal = final_price * quantity
+        pricing = pricing or self.price(membership_package)
 
-            original_total += original_subtotal
-            discounted_total += final_subtotal
+        for line in pricing["lines"]:
+            appliance = line["appliance"]
+            quantity = line["quantity"]
+            original_price = line["unit_price"]
+            final_price = line["final_price"]
+            original_subtotal = line["original_subtotal"]
+            final_subtotal = line["final_subtotal"]
 
             name = appliance["name"][:27] + "..." if len(appliance["name"]) > 30 else appliance["name"]
 
@@ -118,11 +122,11 @@ class ShoppingCart:
                 print(f"Membership: {membership_package} ({package_info['discount']}% discount)")
 
         print("-" * 70)
-        print(f"{'TOTAL (after discount)':<35} {self.get_item_count():>5} {' '*12} {self._format_price(discounted_total):>12}")
+        print(f"{'TOTAL (after discount)':<35} {self.get_item_count():>5} {' '*12} {self._format_price(pricing['discounted_total']):>12}")
 
-        savings = original_total - discounted_total
+        savings = pricing["savings"]
         if savings > 0:
-            print(f"{'TOTAL (before discount)':<35} {'':>5} {' '*12} {self._format_price(original_total):>12}")
+            print(f"{'TOTAL (before discount)':<35} {'':>5} {' '*12} {self._format_price(pricing['original_total']):>12}")
             print(f"{'YOU SAVE':<35} {'':>5} {' '*12} {self._format_price(savings):>12}")
 
     def _is_valid_quantity(self, quantity):
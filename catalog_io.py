@@ -0,0 +1,86 @@
+import csv
+import json
+import os
+from itertools import islice
+
+
+FIELDS = ["id", "name", "price", "status", "category", "stock"]
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Unsupported catalog format: {extension or path}")
+
+
+def read_records(path, file_format=None):
+    file_format = file_format or detect_format(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def parse_record(record):
+    try:
+        name = str(record.get("name") or "").strip()
+        price = int(float(record.get("price") or 0))
+        stock = record.get("stock")
+        stock = 1 if stock in (None, "") else int(stock)
+    except (TypeError, ValueError, OverflowError, AttributeError):
+        return None
+
+    if not name or price <= 0 or stock < 0:
+        return None
+
+    default_status = "Available" if stock > 0 else "Sold"
+    return (name, price, str(record.get("status") or default_status),
+            str(record.get("category") or "").strip(), stock)
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_catalog(database, path, file_format=None, batch_size=10000):
+    imported = rejected = 0
+
+    for batch in batched(map(parse_record, read_records(path, file_format)), batch_size):
+        rows = [row for row in batch if row is not None]
+        with database.transaction():
+            imported += len(database.add_appliances(rows))
+        rejected += len(batch) - len(rows)
+
+    return imported, rejected
+
+
+def export_catalog(database, path, file_format=None):
+    file_format = file_format or detect_format(path)
+    appliances = database.get_all_appliances()
+    count = 0
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for appliance in appliances:
+                writer.writerow([appliance[field] for field in FIELDS])
+                count += 1
+        else:
+            for appliance in appliances:
+                f.write(json.dumps({field: appliance[field] for field in FIELDS}) + "\n")
+                count += 1
+
+    return count
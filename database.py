@@ -1,157 +1,590 @@
+import itertools
+import threading
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime
+from analytics import SalesAnalytics
+from metrics import timed
+from models import Appliance, Sale
+from sales_log import parse_timestamp
+from query_cache import QueryCache
+from reports import ReportEngine, SalesColumns
+from search_index import SearchIndex, tokenize
+from storage import MemoryStorage
 
 
 class Database:
+    STOCK_LOCK_STRIPES = 64
     
-    def __init__(self):
+    def __init__(self, storage=None, sales_log=None):
         self.appliances = {}
         self.customers = {}
         self.sales = {}
         self.next_appliance_id = 1
         self.next_customer_id = 1
         self.next_sale_id = 1
-        self._initialize_data()
+        self.search_index = SearchIndex()
+        self.query_cache = QueryCache()
+        self.category_index = {}
+        self.status_index = {}
+        self.categories = []
+        self.available_ids = []
+        self.available_by_category = {}
+        self.sales_by_user = {}
+        self.sales_by_customer = {}
+        self.reservations = {}
+        self.analytics = SalesAnalytics()
+        self.sales_columns = SalesColumns()
+        self.reports = ReportEngine()
+        self._reservation_ids = itertools.count(1)
+        self._catalog_lock = threading.RLock()
+        self._sales_lock = threading.Lock()
+        self._customer_lock = threading.Lock()
+        self._report_lock = threading.Lock()
+        self._stock_locks = [threading.Lock() for _ in range(self.STOCK_LOCK_STRIPES)]
+        self.storage = storage or MemoryStorage()
+        self.sales_log = sales_log
+        self._load()
+    
+    def _load(self):
+        for row in self.storage.load_appliances():
+            appliance = Appliance.from_dict(row)
+            self.appliances[appliance.id] = appliance
+            self._index_appliance(appliance)
+        for row in self.storage.load_sales():
+            self._store_sale(Sale.from_dict(row))
+        
+        counters = self.storage.load_counters()
+        self.next_appliance_id = max(counters.get("appliance", 1),
+                                     max(self.appliances) + 1 if self.appliances else 1)
+        self.next_sale_id = max(counters.get("sale", 1), max(self.sales) + 1 if self.sales else 1)
+        
+        if self.sales_log is not None:
+            logged = self.sales_log.last_id()
+            self.sales_log.append_many(sale for sale_id, sale in sorted(self.sales.items())
+                                       if sale_id > logged)
+        
+        if not self.appliances and not self.sales:
+            with self.transaction():
+                self._initialize_data()
+    
+    def transaction(self):
+        return self.storage.transaction()
+    
+    def close(self):
+        self.reports.close()
+        self.storage.close()
+        if self.sales_log is not None:
+            self.sales_log.close()
     
     def _initialize_data(self):
-        self.add_appliance("Mixer", 450000, "Available", "Kitchen appliances")
-        self.add_appliance("Oven", 2500000, "Available", "Kitchen appliances")
-        self.add_appliance("Blender", 350000, "Available", "Kitchen appliances")
-        self.add_appliance("Microwave", 800000, "Available", "Kitchen appliances")
-        self.add_appliance("Refrigerator", 3500000, "Available", "Kitchen appliances")
-        self.add_appliance("Toaster", 180000, "Available", "Kitchen appliances")
-        self.add_appliance("Coffee Maker", 550000, "Available", "Kitchen appliances")
-        
-        self.add_appliance("Vacuum Cleaner", 1200000, "Available", "Cleaning devices")
-        self.add_appliance("Robot Vacuum", 2800000, "Available", "Cleaning devices")
-        self.add_appliance("Steam Cleaner", 980000, "Available", "Cleaning devices")
-        
-        self.add_appliance("Air Conditioner", 4500000, "Available", "Heating and cooling devices")
-        self.add_appliance("Heater", 650000, "Available", "Heating and cooling devices")
-        self.add_appliance("Fan", 280000, "Available", "Heating and cooling devices")
-        self.add_appliance("Humidifier", 420000, "Available", "Heating and cooling devices")
-        
-        self.add_appliance("Hair Dryer", 180000, "Available", "Personal care devices")
-        self.add_appliance("Electric Shaver", 320000, "Available", "Personal care devices")
-        self.add_appliance("Electric Toothbrush", 250000, "Available", "Personal care devices")
-        
-        self.add_appliance("Smart Speaker", 550000, "Available", "Smart home devices")
-        self.add_appliance("Smart Doorbell", 780000, "Available", "Smart home devices")
-        self.add_appliance("Smart Thermostat", 920000, "Available", "Smart home devices")
-        self.add_appliance("Smart Light Bulbs", 150000, "Available", "Smart home devices")
-    
-    def add_appliance(self, name, price, status, category):
-        if not name or price <= 0:
+        self.add_appliance("Mixer", 450000, "Available", "Kitchen appliances", 10)
+        self.add_appliance("Oven", 2500000, "Available", "Kitchen appliances", 10)
+        self.add_appliance("Blender", 350000, "Available", "Kitchen appliances", 10)
+        self.add_appliance("Microwave", 800000, "Available", "Kitchen appliances", 10)
+        self.add_appliance("Refrigerator", 3500000, "Available", "Kitchen appliances", 10)
+        self.add_appliance("Toaster", 180000, "Available", "Kitchen appliances", 10)
+        self.add_appliance("Coffee Maker", 550000, "Available", "Kitchen appliances", 10)
+        
+        self.add_appliance("Vacuum Cleaner", 1200000, "Available", "Cleaning devices", 10)
+        self.add_appliance("Robot Vacuum", 2800000, "Available", "Cleaning devices", 10)
+        self.add_appliance("Steam Cleaner", 980000, "Available", "Cleaning devices", 10)
+        
+        self.add_appliance("Air Conditioner", 4500000, "Available", "Heating and cooling devices", 10)
+        self.add_appliance("Heater", 650000, "Available", "Heating and cooling devices", 10)
+        self.add_appliance("Fan", 280000, "Available", "Heating and cooling devices", 10)
+        self.add_appliance("Humidifier", 420000, "Available", "Heating and cooling devices", 10)
+        
+        self.add_appliance("Hair Dryer", 180000, "Available", "Personal care devices", 10)
+        self.add_appliance("Electric Shaver", 320000, "Available", "Personal care devices", 10)
+        self.add_appliance("Electric Toothbrush", 250000, "Available", "Personal care devices", 10)
+        
+        self.add_appliance("Smart Speaker", 550000, "Available", "Smart home devices", 10)
+        self.add_appliance("Smart Doorbell", 780000, "Available", "Smart home devices", 10)
+        self.add_appliance("Smart Thermostat", 920000, "Available", "Smart home devices", 10)
+        self.add_appliance("Smart Light Bulbs", 150000, "Available", "Smart home devices", 10)
+    
+    def add_appliance(self, name, price, status, category, stock=1):
+        if not name or price <= 0 or stock < 0:
             return None
         
-        appliance_id = self.next_appliance_id
-        self.appliances[appliance_id] = {
-            "id": appliance_id,
-            "name": name,
-            "price": price,
-            "status": status,
-            "category": category
-        }
-        self.next_appliance_id += 1
+        with self._catalog_lock:
+            appliance_id = self.next_appliance_id
+            appliance = Appliance(appliance_id, name, price, status, category, stock)
+            self.appliances[appliance_id] = appliance
+            self.next_appliance_id += 1
+            self._index_appliance(appliance)
+        
+        self.storage.save_appliance(appliance)
         return appliance_id
     
+    def add_appliances(self, rows):
+        valid = [row for row in rows if row[0] and row[1] > 0 and row[4] >= 0]
+        if not valid:
+            return []
+        
+        with self._catalog_lock:
+            first_id = self.next_appliance_id
+            self.next_appliance_id += len(valid)
+            
+            appliances = []
+            by_category = {}
+            by_status = {}
+            for appliance_id, (name, price, status, category, stock) in enumerate(valid, first_id):
+                appliance = Appliance(appliance_id, name, price, status, category, stock)
+                self.appliances[appliance_id] = appliance
+                appliances.append(appliance)
+                by_category.setdefault(category, []).append(appliance_id)
+                by_status.setdefault(status, []).append(appliance_id)
+            
+            for category, appliance_ids in by_category.items():
+                if category not in self.category_index:
+                    self.category_index[category] = set()
+                    insort(self.categories, category)
+                self.category_index[category].update(appliance_ids)
+            for status, appliance_ids in by_status.items():
+                self.status_index.setdefault(status, set()).update(appliance_ids)
+            
+            self.analytics.adjust_inventory(sum(SalesAnalytics.inventory_value_of(app)
+                                                for app in appliances))
+            
+            self.query_cache.invalidate()
+            available = [app for app in appliances if app.status == "Available"]
+            self.search_index.add_many((app.id, app.name, app.category) for app in available)
+            self._add_available_ids(self.available_ids, [app.id for app in available])
+            for app in available:
+                insort(self.available_by_category.setdefault(app.category, []), app.id)
+        
+        self.storage.save_appliances(appliances)
+        return [app.id for app in appliances]
+    
     def get_appliance(self, appliance_id):
         return self.appliances.get(appliance_id)
     
+    def get_stock(self, appliance_id):
+        appliance = self.appliances.get(appliance_id)
+        return appliance.stock if appliance else 0
+    
+    def set_stock(self, appliance_id, stock):
+        if stock < 0:
+            return False
+        
+        with self._stock_lock(appliance_id):
+            appliance = self.appliances.get(appliance_id)
+            if not appliance:
+                return False
+            
+            with self._catalog_lock:
+                self._unindex_appliance(appliance)
+                appliance.stock = stock
+                appliance.status = "Available" if stock > 0 else "Sold"
+                self._index_appliance(appliance)
+        
+        self.storage.save_appliance(appliance)
+        return True
+    
+    def reserve_stock(self, items):
+        return self.reserve_many([items])[0]
+    
+    def reserve_many(self, orders):
+        orders = [self._order_lines(items) for items in orders]
+        locks = self._stock_locks_for(appliance_id for items in orders if items
+                                      for appliance_id, _ in items)
+        
+        reserved = []
+        reserved_value = 0
+        for lock in locks:
+            lock.acquire()
+        try:
+            for items in orders:
+                available = items is not None
+                for appliance_id, quantity in items or ():
+                    appliance = self.appliances.get(appliance_id)
+                    if (appliance is None or appliance.status != "Available"
+                            or appliance.stock < quantity):
+                        available = False
+                        break
+                if not available:
+                    reserved.append(None)
+                    continue
+                
+                for appliance_id, quantity in items:
+                    appliance = self.appliances[appliance_id]
+                    appliance.stock -= quantity
+                    reserved_value += appliance.price * quantity
+                reserved.append(items)
+            self.analytics.adjust_inventory(-reserved_value)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        
+        reservation_ids = []
+        for items in reserved:
+            if items is None:
+                reservation_ids.append(None)
+                continue
+            reservation_id = next(self._reservation_ids)
+            self.reservations[reservation_id] = items
+            reservation_ids.append(reservation_id)
+        return reservation_ids
+    
+    def _order_lines(self, items):
+        totals = {}
+        for appliance_id, quantity in items:
+            quantity = int(quantity)
+            if quantity <= 0:
+                return None
+            totals[appliance_id] = totals.get(appliance_id, 0) + quantity
+        return list(totals.items())
+    
+    def commit_reservation(self, reservation_id):
+        return self.commit_reservations([reservation_id]) == 1
+    
+    def commit_reservations(self, reservation_ids):
+        committed = 0
+        changed = {}
+        for reservation_id in reservation_ids:
+            items = self.reservations.pop(reservation_id, None)
+            if items is None:
+                continue
+            committed += 1
+            
+            for appliance_id, quantity in items:
+                with self._stock_lock(appliance_id):
+                    appliance = self.appliances.get(appliance_id)
+                    if appliance is None:
+                        continue
+                    if appliance.stock == 0:
+                        self._set_status(appliance, "Sold")
+                    changed[appliance_id] = appliance
+        
+        if len(changed) == 1:
+            self.storage.save_appliance(next(iter(changed.values())))
+        elif changed:
+            self.storage.save_appliances(list(changed.values()))
+        return committed
+    
+    def release_reservation(self, reservation_id):
+        items = self.reservations.pop(reservation_id, None)
+        if items is None:
+            return False
+        
+        restocked = []
+        for appliance_id, quantity in items:
+            with self._stock_lock(appliance_id):
+                appliance = self.appliances.get(appliance_id)
+                if appliance:
+                    appliance.stock += quantity
+                    if appliance.status == "Available":
+                        self.analytics.adjust_inventory(appliance.price * quantity)
+                    elif appliance.status == "Sold":
+                        self._set_status(appliance, "Available")
+                        restocked.append(appliance)
+        
+        if len(restocked) == 1:
+            self.storage.save_appliance(restocked[0])
+        elif restocked:
+            self.storage.save_appliances(restocked)
+        return True
+    
+    def _stock_lock(self, appliance_id):
+        return self._stock_locks[hash(appliance_id) % self.STOCK_LOCK_STRIPES]
+    
+    def _stock_locks_for(self, appliance_ids):
+        stripes = sorted({hash(appliance_id) % self.STOCK_LOCK_STRIPES
+                          for appliance_id in appliance_ids})
+        return [self._stock_locks[stripe] for stripe in stripes]
+    
     def add_customer(self, name, address, purchased_appliances):
-        customer_id = self.next_customer_id
-        self.customers[customer_id] = {
-            "id": customer_id,
-            "name": name,
-            "address": address,
-            "purchased_appliances": purchased_appliances
-        }
-        self.next_customer_id += 1
+        with self._customer_lock:
+            customer_id = self.next_customer_id
+            self.customers[customer_id] = {
+                "id": customer_id,
+                "name": name,
+                "address": address,
+                "purchased_appliances": purchased_appliances
+            }
+            self.next_customer_id += 1
         return customer_id
     
-    def add_sale(self, username, items, total_amount, delivery_address, delivery_fee, date):
-        sale_id = self.next_sale_id
-        self.sales[sale_id] = {
-            "id": sale_id,
-            "username": username,
-            "items": items,  
-            "total_amount": total_amount,
-            "delivery_address": delivery_address,
-            "delivery_fee": delivery_fee,
-            "date": date
-        }
-        self.next_sale_id += 1
+    @timed("database.add_sale")
+    def add_sale(self, username, items, total_amount, delivery_address, delivery_fee, date,
+                 customer_id=None, membership=None):
+        with self._sales_lock:
+            sale_id = self.next_sale_id
+            sale = Sale(sale_id, username, items, total_amount, delivery_address, delivery_fee, date,
+                        customer_id, membership)
+            self.next_sale_id += 1
+            self._store_sale(sale)
+            if self.sales_log is not None:
+                self.sales_log.append(sale)
+        
+        self.storage.save_sale(sale)
         return sale_id
     
+    @timed("database.add_sales")
+    def add_sales(self, rows):
+        with self._sales_lock:
+            sales = []
+            for sale_id, row in enumerate(rows, self.next_sale_id):
+                sale = Sale(sale_id, **row)
+                self._store_sale(sale)
+                sales.append(sale)
+            self.next_sale_id += len(sales)
+            if self.sales_log is not None:
+                self.sales_log.append_many(sales)
+        
+        self.storage.save_sales(sales)
+        return [sale.id for sale in sales]
+    
+    def _store_sale(self, sale):
+        sale_id = sale.id
+        self.sales[sale_id] = sale
+        self.sales_by_user.setdefault(sale.username, []).append(sale_id)
+        if sale.customer_id is not None:
+            self.sales_by_customer.setdefault(sale.customer_id, []).append(sale_id)
+        self.analytics.record_sale(sale)
+    
     def get_user_purchases(self, username):
-        return [sale for sale in self.sales.values() 
-                if sale.get("username") == username]
+        return [self.sales[sale_id] for sale_id in list(self.sales_by_user.get(username, []))]
+    
+    def get_user_purchase_count(self, username):
+        return len(self.sales_by_user.get(username, []))
+    
+    def get_user_purchases_page(self, username, limit=10, offset=0, before_id=None):
+        sale_ids = self.sales_by_user.get(username, [])
+        
+        end = len(sale_ids) if before_id is None else bisect_left(sale_ids, before_id)
+        end -= offset
+        start = max(0, end - limit)
+        
+        return [self.sales[sale_ids[i]] for i in range(end - 1, start - 1, -1)]
+    
+    def get_sales_between(self, start=None, end=None, username=None):
+        if self.sales_log is not None:
+            return self.sales_log.between(start, end, username)
+        
+        start = parse_timestamp(start)
+        end = parse_timestamp(end)
+        with self._sales_lock:
+            sales = ([self.sales[sale_id] for sale_id in self.sales_by_user.get(username, [])]
+                     if username is not None else list(self.sales.values()))
+        
+        results = []
+        for sale in sales:
+            timestamp = parse_timestamp(sale.date)
+            if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                results.append({"id": sale.id, "timestamp": timestamp, "username": sale.username,
+                                "total_amount": sale.total_amount, "delivery_fee": sale.delivery_fee})
+        return results
+    
+    def get_revenue_between(self, start=None, end=None, username=None):
+        if self.sales_log is not None:
+            return self.sales_log.revenue_between(start, end, username)
+        return sum(row["total_amount"] for row in self.get_sales_between(start, end, username))
     
     def get_appliances_by_category(self, category):
-        return [app for app in self.appliances.values() 
-                if app["category"] == category and app["status"] == "Available"]
+        with self._catalog_lock:
+            return self._appliances_for(self._cached(
+                ("category", category), lambda: self.available_by_category.get(category, ())))
     
     def get_available_appliances(self):
-        return [app for app in self.appliances.values() 
-                if app["status"] == "Available"]
+        with self._catalog_lock:
+            return self._appliances_for(self.available_ids)
+    
+    def get_available_count(self, category=None):
+        with self._catalog_lock:
+            if category is None:
+                return len(self.available_ids)
+            return len(self.available_by_category.get(category, ()))
+    
+    def iter_available(self, category=None, after_id=None, batch_size=100):
+        after_id = 0 if after_id is None else after_id
+        while True:
+            with self._catalog_lock:
+                ids = self.available_ids if category is None else self.available_by_category.get(category, [])
+                start = bisect_right(ids, after_id)
+                batch = [self.appliances[appliance_id] for appliance_id in ids[start:start + batch_size]]
+            
+            if not batch:
+                return
+            yield from batch
+            after_id = batch[-1].id
+    
+    def iter_available_by_category(self, after=None, batch_size=100):
+        category, after_id = after or (None, None)
+        with self._catalog_lock:
+            start = 0 if category is None else bisect_left(self.categories, category)
+            categories = self.categories[start:]
+        
+        for name in categories:
+            yield from self.iter_available(name, after_id if name == category else None, batch_size)
+    
+    def get_available_page(self, limit=20, after_id=None, category=None):
+        return list(itertools.islice(self.iter_available(category, after_id, limit), limit))
     
     def get_all_appliances(self):
-        return list(self.appliances.values())
+        with self._catalog_lock:
+            return list(self.appliances.values())
     
-    def search_appliances(self, keyword):
+    @timed("database.search_appliances")
+    def search_appliances(self, keyword, limit=None):
         if not keyword:
             return []
         
-        keyword = keyword.lower()
-        return [app for app in self.appliances.values() 
-                if (keyword in app["name"].lower() or 
-                    keyword in app["category"].lower()) and 
-                    app["status"] == "Available"]
+        query = " ".join(tokenize(keyword))
+        with self._catalog_lock:
+            return self._appliances_for(self._cached(
+                ("search", query, limit), lambda: self.search_index.search(query, limit)))
     
     def update_appliance_status(self, appliance_id, status):
-        if appliance_id in self.appliances:
-            self.appliances[appliance_id]["status"] = status
-            return True
-        return False
+        with self._stock_lock(appliance_id), self._catalog_lock:
+            appliance = self.appliances.get(appliance_id)
+            if not appliance:
+                return False
+            self._set_status(appliance, status)
+        
+        self.storage.save_appliance(appliance)
+        return True
     
     def update_appliance(self, appliance_id, name=None, price=None, category=None):
-        if appliance_id not in self.appliances:
-            return False
-        
-        if name:
-            self.appliances[appliance_id]["name"] = name
-        if price and price > 0:
-            self.appliances[appliance_id]["price"] = price
-        if category:
-            self.appliances[appliance_id]["category"] = category
+        with self._stock_lock(appliance_id), self._catalog_lock:
+            appliance = self.appliances.get(appliance_id)
+            if not appliance:
+                return False
+            
+            self._unindex_appliance(appliance)
+            
+            if name:
+                appliance.name = name
+            if price and price > 0:
+                appliance.price = price
+            if category:
+                appliance.category = category
+            
+            self._index_appliance(appliance)
         
+        self.storage.save_appliance(appliance)
         return True
     
     def delete_appliance(self, appliance_id):
-        if appliance_id in self.appliances:
-            del self.appliances[appliance_id]
-            return True
-        return False
+        with self._stock_lock(appliance_id), self._catalog_lock:
+            appliance = self.appliances.pop(appliance_id, None)
+            if not appliance:
+                return False
+            self._unindex_appliance(appliance)
+        
+        self.storage.delete_appliance(appliance_id)
+        return True
+    
+    def _set_status(self, appliance, status):
+        with self._catalog_lock:
+            if appliance.status != status:
+                self._unindex_appliance(appliance)
+                appliance.status = status
+                self._index_appliance(appliance)
+    
+    def _appliances_for(self, appliance_ids):
+        return [self.appliances[appliance_id] for appliance_id in appliance_ids]
+    
+    def _add_available_ids(self, ids, new_ids):
+        if not ids or not new_ids or ids[-1] < new_ids[0]:
+            ids.extend(new_ids)
+        else:
+            for appliance_id in new_ids:
+                insort(ids, appliance_id)
+    
+    def _remove_available_id(self, ids, appliance_id):
+        position = bisect_left(ids, appliance_id)
+        if position < len(ids) and ids[position] == appliance_id:
+            del ids[position]
+    
+    def _index_appliance(self, appliance):
+        self.query_cache.invalidate()
+        appliance_id = appliance.id
+        category = appliance.category
+        
+        if category not in self.category_index:
+            self.category_index[category] = set()
+            insort(self.categories, category)
+        self.category_index[category].add(appliance_id)
+        self.status_index.setdefault(appliance.status, set()).add(appliance_id)
+        self.analytics.adjust_inventory(SalesAnalytics.inventory_value_of(appliance))
+        
+        if appliance.status == "Available":
+            self.search_index.add(appliance_id, appliance.name, category)
+            insort(self.available_ids, appliance_id)
+            insort(self.available_by_category.setdefault(category, []), appliance_id)
+    
+    def _unindex_appliance(self, appliance):
+        self.query_cache.invalidate()
+        appliance_id = appliance.id
+        category = appliance.category
+        
+        in_category = self.category_index[category]
+        in_category.discard(appliance_id)
+        if not in_category:
+            del self.category_index[category]
+            del self.categories[bisect_left(self.categories, category)]
+        
+        with_status = self.status_index[appliance.status]
+        with_status.discard(appliance_id)
+        if not with_status:
+            del self.status_index[appliance.status]
+        self.analytics.adjust_inventory(-SalesAnalytics.inventory_value_of(appliance))
+        
+        self.search_index.remove(appliance_id)
+        if appliance.status == "Available":
+            self._remove_available_id(self.available_ids, appliance_id)
+            in_category = self.available_by_category[category]
+            self._remove_available_id(in_category, appliance_id)
+            if not in_category:
+                del self.available_by_category[category]
     
     def get_customer_purchase_history(self, customer_id):
-        return [sale for sale in self.sales.values() 
-                if sale["customer_id"] == customer_id]
+        return [self.sales[sale_id] for sale_id in list(self.sales_by_customer.get(customer_id, []))]
     
     def get_all_categories(self):
-        categories = set()
-        for app in self.appliances.values():
-            categories.add(app["category"])
-        return sorted(list(categories))
+        with self._catalog_lock:
+            return list(self._cached(("categories",), lambda: self.categories))
+    
+    def get_query_cache_stats(self):
+        return self.query_cache.stats()
+    
+    def _cached(self, key, compute):
+        result = self.query_cache.get(key)
+        if result is None:
+            result = tuple(compute())
+            self.query_cache.put(key, result)
+        return result
+    
+    def get_sales_report(self):
+        return self.analytics.report()
+    
+    def export_sales_columns(self):
+        with self._report_lock:
+            return self._export_sales_columns()
+    
+    def _export_sales_columns(self):
+        columns = self.sales_columns
+        with self._sales_lock:
+            end_id = self.next_sale_id
+        columns.extend(sale for sale in map(self.sales.get, range(columns.last_id + 1, end_id))
+                       if sale is not None)
+        return columns
+    
+    def get_sales_report_between(self, start=None, end=None, top=10):
+        with self._report_lock:
+            return self.reports.report(self._export_sales_columns(), start, end, top)
+    
+    def verify_analytics(self):
+        with self._catalog_lock, self._sales_lock:
+            return self.analytics.verify(list(self.appliances.values()), list(self.sales.values()))
     
     def get_sales_stats(self):
-        total_sales = len(self.sales)
-        sold_items = [app for app in self.appliances.values() 
-                      if app["status"] == "Sold"]
-        available_items = [app for app in self.appliances.values() 
-                          if app["status"] == "Available"]
-        
-        return {
-            "total_sales": total_sales,
-            "sold_items": len(sold_items),
-            "available_items": len(available_items),
-            "total_items": len(self.appliances)
-        }
\ No newline at end of file
+        with self._catalog_lock:
+            return {
+                "total_sales": len(self.sales),
+                "sold_items": len(self.status_index.get("Sold", ())),
+                "available_items": len(self.status_index.get("Available", ())),
+                "total_items": len(self.appliances)
+            }
\ No newline at end of file
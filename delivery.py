@@ -0,0 +1,186 @@
+import heapq
+import threading
+from datetime import datetime, timedelta
+from models import DeliverySlot
+
+
+SLOT_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def describe_slot(slot):
+    if slot is None:
+        return "Ready for pickup in: 2 hours"
+    return f"Delivery on {slot['start']}-{slot['end'][-5:]} ({slot['district']})"
+
+
+class _Slot:
+    __slots__ = ("start", "record", "booked", "queued")
+
+    def __init__(self, start, record, ranks):
+        self.start = start
+        self.record = record
+        self.booked = 0
+        self.queued = [True] * ranks
+
+
+class _District:
+
+    def __init__(self, name, first_day, ranks):
+        self.name = name
+        self.slots = {}
+        self.heaps = [[] for _ in range(ranks)]
+        self.next_day = first_day
+
+
+class DeliveryScheduler:
+    WINDOWS = ((9, 12), (12, 15), (15, 18), (18, 21))
+    CAPACITY = 20
+    HORIZON_DAYS = 14
+    PRIORITY = {"Gold": 0, "Silver": 1}
+    LEAD_TIMES = (timedelta(hours=4), timedelta(hours=24), timedelta(hours=48))
+    CAPACITY_SHARE = (1.0, 0.8, 0.6)
+    UNKNOWN_DISTRICT = "Unknown"
+    SWEEP_INTERVAL = timedelta(hours=1)
+
+    def __init__(self, capacity=None, windows=None, horizon_days=None):
+        self.capacity = capacity or self.CAPACITY
+        self.windows = windows or self.WINDOWS
+        self.horizon_days = horizon_days or self.HORIZON_DAYS
+        self.limits = [max(1, int(self.capacity * share)) for share in self.CAPACITY_SHARE]
+        self.districts = {}
+        self._next_sweep = None
+        self._lock = threading.Lock()
+
+    def rank(self, membership):
+        return self.PRIORITY.get(membership, len(self.LEAD_TIMES) - 1)
+
+    def peek(self, district, membership=None, now=None):
+        now = now or datetime.now()
+        rank = self.rank(membership)
+        earliest = now + self.LEAD_TIMES[rank]
+        limit = self.limits[rank]
+        name = self._name(district)
+
+        with self._lock:
+            state = self.districts.get(name.casefold())
+            for day in range(self.horizon_days + 1):
+                for start, end in self._window_times(now.date() + timedelta(days=day)):
+                    if start < earliest:
+                        continue
+                    slot = state.slots.get(start.strftime(SLOT_FORMAT)) if state else None
+                    if slot is None:
+                        return DeliverySlot(state.name if state else name,
+                                            start.strftime(SLOT_FORMAT), end.strftime(SLOT_FORMAT))
+                    if slot.booked < limit:
+                        return slot.record
+        return None
+
+    def book(self, district, membership=None, now=None):
+        return self.book_many([(district, membership)], now)[0]
+
+    def book_many(self, requests, now=None):
+        now = now or datetime.now()
+        queue = [(self.rank(membership), position, district)
+                 for position, (district, membership) in enumerate(requests)]
+        heapq.heapify(queue)
+
+        booked = [None] * len(requests)
+        with self._lock:
+            self._sweep(now)
+            while queue:
+                rank, position, district = heapq.heappop(queue)
+                slot = self._next_slot(self._district(district, now), rank, now)
+                if slot is not None:
+                    slot.booked += 1
+                    booked[position] = slot.record
+        return booked
+
+    def release(self, record):
+        with self._lock:
+            district = self.districts.get(record["district"].casefold())
+            slot = district.slots.get(record["start"]) if district else None
+            if slot is None or not slot.booked:
+                return False
+
+            slot.booked -= 1
+            for rank, limit in enumerate(self.limits):
+                if not slot.queued[rank] and slot.booked < limit:
+                    slot.queued[rank] = True
+                    heapq.heappush(district.heaps[rank], (slot.start, slot.record["start"], slot))
+            return True
+
+    def occupy(self, record, now=None):
+        now = now or datetime.now()
+        start = datetime.strptime(record["start"], SLOT_FORMAT)
+        with self._lock:
+            self._sweep(now)
+            district = self._district(record["district"], now)
+            while district.next_day <= start.date():
+                if not self._extend(district, now):
+                    break
+            slot = district.slots.get(record["start"])
+            if slot is None:
+                return False
+            slot.booked += 1
+            return True
+
+    def _name(self, district):
+        return " ".join((district or "").split()) or self.UNKNOWN_DISTRICT
+
+    def _district(self, name, now):
+        name = self._name(name)
+        key = name.casefold()
+        district = self.districts.get(key)
+        if district is None:
+            district = self.districts[key] = _District(name, now.date(), len(self.limits))
+        return district
+
+    def _next_slot(self, district, rank, now):
+        earliest = now + self.LEAD_TIMES[rank]
+        limit = self.limits[rank]
+        heap = district.heaps[rank]
+        while True:
+            if not heap:
+                if not self._extend(district, now):
+                    return None
+                continue
+
+            start, _, slot = heap[0]
+            if start >= earliest and slot.booked < limit:
+                return slot
+            heapq.heappop(heap)
+            slot.queued[rank] = False
+
+    def _extend(self, district, now):
+        day = max(district.next_day, now.date())
+        if day > now.date() + timedelta(days=self.horizon_days):
+            return False
+
+        for start, end in self._window_times(day):
+            record = DeliverySlot(district.name, start.strftime(SLOT_FORMAT), end.strftime(SLOT_FORMAT))
+            slot = district.slots[record.start] = _Slot(start, record, len(self.limits))
+            for heap in district.heaps:
+                heapq.heappush(heap, (start, record.start, slot))
+        district.next_day = day + timedelta(days=1)
+        return True
+
+    def _window_times(self, day):
+        midnight = datetime.combine(day, datetime.min.time())
+        return [(midnight + timedelta(hours=start_hour), midnight + timedelta(hours=end_hour))
+                for start_hour, end_hour in self.windows]
+
+    def _sweep(self, now):
+        if self._next_sweep is not None and now < self._next_sweep:
+            return
+        self._next_sweep = now + self.SWEEP_INTERVAL
+
+        for key, district in list(self.districts.items()):
+            past = [start for start, slot in district.slots.items() if slot.start < now]
+            for start in past:
+                del district.slots[start]
+            if not any(slot.booked for slot in district.slots.values()):
+                del self.districts[key]
+            elif past:
+                for heap in district.heaps:
+                    heap[:] = [entry for entry in heap if entry[0] >= now]
+                    heapq.heapify(heap)
@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+
+class ScriptExhausted(Exception):
+    pass
+
+
+class HeadlessDriver:
+    OUTPUT_BUFFER_SIZE = 1 << 20
+
+    def __init__(self, inputs):
+        self.inputs = list(inputs)
+        self.position = 0
+        self.timings = {}
+        self.elapsed = 0.0
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".jsonl", ".ndjson")):
+                return cls(cls._parse_jsonl(f))
+            return cls(line.rstrip("\r\n") for line in f)
+
+    @staticmethod
+    def _parse_jsonl(lines):
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            step = json.loads(line)
+            if isinstance(step, dict):
+                step = step.get("inputs", step.get("input", []))
+            if isinstance(step, list):
+                yield from (str(value) for value in step)
+            else:
+                yield str(step)
+
+    def input(self, prompt=""):
+        if self.position >= len(self.inputs):
+            raise ScriptExhausted()
+        value = self.inputs[self.position]
+        self.position += 1
+        print(f"{prompt}{value}")
+        return value
+
+    def record(self, action, seconds):
+        self.timings.setdefault(action, []).append(seconds)
+
+    def run(self, app, output=None):
+        target = output or os.devnull
+        start = time.perf_counter()
+        with open(target, "w", buffering=self.OUTPUT_BUFFER_SIZE, encoding="utf-8") as f:
+            with redirect_stdout(f):
+                try:
+                    app.run()
+                except (ScriptExhausted, SystemExit):
+                    pass
+        self.elapsed = time.perf_counter() - start
+
+    def print_report(self, stream=None):
+        stream = stream or sys.stdout
+        print(f"Replayed {self.position} of {len(self.inputs)} inputs in {self.elapsed * 1000:.2f} ms",
+              file=stream)
+        print(f"\n{'Action':<25} {'Calls':>7} {'Total (ms)':>12} {'Mean (ms)':>12} {'Max (ms)':>12}",
+              file=stream)
+        for action, samples in sorted(self.timings.items(), key=lambda item: -sum(item[1])):
+            total = sum(samples) * 1000
+            print(f"{action:<25} {len(samples):>7} {total:>12.3f} {total / len(samples):>12.3f} "
+                  f"{max(samples) * 1000:>12.3f}", file=stream)
@@ -1,24 +1,40 @@
+import argparse
+import itertools
 import os
 import time
-from cart import ShoppingCart
+from datetime import datetime
 from membership import Membership
 from database import Database
+from delivery import describe_slot
+from metrics import METRICS, SamplingProfiler
+from models import OrderRequest
+from orders import OrderService
 from auth import AuthSystem
+from session import SessionManager
+from storage import JournalStorage, SQLiteStorage
+from sales_log import SalesLog
+from headless import HeadlessDriver
+import catalog_io
 
 
 class TechHouseApp:
-    DELIVERY_FEE = 50000
+    DELIVERY_FEE = OrderService.DELIVERY_FEE
+    HISTORY_PAGE_SIZE = 5
+    CATALOG_PAGE_SIZE = 20
     
-    def __init__(self):
-        self.database = Database()
-        self.cart = ShoppingCart()
-        self.auth = AuthSystem()
+    def __init__(self, storage=None, driver=None, sales_log=None):
+        self.database = Database(storage, sales_log)
+        self.auth = AuthSystem(storage)
+        self.sessions = SessionManager(self.auth)
+        self.orders = OrderService(self.database, self.auth)
+        self.session = self.sessions.create()
+        self.driver = driver
     
     def run(self):
         self._clear()
         print("WELCOME TO TECH HOUSE - Home Appliance Store")
         print("Your one-stop shop for quality home appliances!\n")
-        input("Press ENTER to continue...")
+        self._input("Press ENTER to continue...")
         self._auth_menu()
     
     def _auth_menu(self):
@@ -30,47 +46,47 @@ class TechHouseApp:
             print("3. Continue as guest")
             print("0. Exit\n")
             
-            choice = input("Select: ").strip()
+            choice = self._input("Select: ").strip()
             
             if choice == "1":
-                if self._login():
+                if self._run_action(self._login):
                     self._main_menu()
             elif choice == "2":
-                self._register()
+                self._run_action(self._register)
             elif choice == "3":
                 print("\nEntering as guest...")
-                time.sleep(1)
+                self._pause(1)
                 self._main_menu()
             elif choice == "0":
                 self._exit()
                 break
             else:
                 print("\nInvalid choice!")
-                time.sleep(1)
+                self._pause(1)
     
     def _login(self):
         self._clear()
         print("LOGIN\n")
         
-        username = input("Username: ").strip()
-        password = input("Password: ").strip()
+        username = self._input("Username: ").strip()
+        password = self._input("Password: ").strip()
         
-        success, msg = self.auth.login(username, password)
+        success, msg = self.session.login(username, password)
         print(f"\n{msg}")
-        time.sleep(1.5)
+        self._pause(1.5)
         return success
     
     def _register(self):
         self._clear()
         print("REGISTER\n")
         
-        username = input("Username: ").strip()
-        password = input("Password: ").strip()
-        confirm_password = input("Confirm Password: ").strip()
+        username = self._input("Username: ").strip()
+        password = self._input("Password: ").strip()
+        confirm_password = self._input("Confirm Password: ").strip()
         
         if password != confirm_password:
             print("\nPasswords do not match!")
-            time.sleep(1.5)
+            self._pause(1.5)
             return
         
         success, msg = self.auth.register(username, password)
@@ -79,7 +95,7 @@ class TechHouseApp:
         if success:
             print("You can now login with your credentials.")
         
-        time.sleep(2)
+        self._pause(2)
     
     def _main_menu(self):
         menu_actions = {
@@ -94,31 +110,35 @@ class TechHouseApp:
             "9": self._set_delivery_address,
             "10": self._add_product,
             "11": self._make_admin,
+            "12": self._import_catalog,
+            "13": self._export_catalog,
+            "14": self._sales_report,
+            "15": self._show_metrics,
         }
         
         while True:
             self._clear()
             self._show_main_header()
-            choice = input("\nSelect: ").strip()
+            choice = self._input("\nSelect: ").strip()
             
             if choice == "0":
-                self.auth.logout()
+                self.session.logout()
                 print("\nReturning to main menu...")
-                time.sleep(1)
+                self._pause(1)
                 break
             elif choice == "99":
                 self._exit_app()
                 return
             elif choice in menu_actions:
-                menu_actions[choice]()
+                self._run_action(menu_actions[choice])
             else:
                 print("\nInvalid choice!")
-                time.sleep(1)
+                self._pause(1)
     
     def _show_main_header(self):
         print("MAIN MENU\n")
         
-        user = self.auth.get_current_user()
+        user = self.session.get_current_user()
         if user:
             print(f"Logged in as: {user['username']} ({user['role']})")
             if user.get('membership'):
@@ -133,7 +153,7 @@ class TechHouseApp:
         else:
             print("Guest Mode (Login to access membership benefits)")
         
-        print(f"Cart: {self.cart.get_item_count()} items\n")
+        print(f"Cart: {self.session.cart.get_item_count()} items\n")
         
         print("SHOPPING")
         print("1. View by category")
@@ -149,10 +169,14 @@ class TechHouseApp:
             print("8. View purchase history")
             print("9. Set delivery address")
 
-            if self.auth.is_admin():
+            if self.session.is_admin():
                 print("\nADMIN")
                 print("10. Add product")
                 print("11. Make user admin")
+                print("12. Import catalog (CSV/JSONL)")
+                print("13. Export catalog (CSV/JSONL)")
+                print("14. Sales report")
+                print("15. Metrics")
 
         print("\n0. Back/Logout")
         print("99. Exit Application")
@@ -165,7 +189,7 @@ class TechHouseApp:
 
         if not categories:
             print("No categories available\n")
-            input("Press ENTER...")
+            self._input("Press ENTER...")
             return
 
         print("0. Cancel / Back")
@@ -174,86 +198,116 @@ class TechHouseApp:
         for i, category in enumerate(categories, 1):
             print(f"{i}. {category}")
 
-        choice = input("\nSelect category (number), A for all, 0 to cancel: ").strip().lower()
+        choice = self._input("\nSelect category (number), A for all, 0 to cancel: ").strip().lower()
 
         if choice == "0":
             return
         elif choice == "a":
-            self._view_all_products()   
+            self._view_all_products()
+            return
         elif choice.isdigit():
             idx = int(choice) - 1
             if 0 <= idx < len(categories):
                 self._show_category_products(categories[idx])
+                return
             else:
                 print("\nInvalid category!")
-                time.sleep(1)
+                self._pause(1)
         else:
             print("\nInvalid choice!")
-            time.sleep(1)
+            self._pause(1)
 
-        input("\nPress ENTER...")
+        self._input("\nPress ENTER...")
     
     def _show_category_products(self, category):
-        appliances = self.database.get_appliances_by_category(category)
+        total = self.database.get_available_count(category)
         
-        print(f"\n{category}\n")
-        
-        if not appliances:
-            print("No products available in this category")
+        if not total:
+            print("\nNo products available in this category")
+            self._input("\nPress ENTER...")
             return
         
+        self._browse(category,
+                     lambda after: self.database.iter_available(category, after, self.CATALOG_PAGE_SIZE + 1),
+                     total, self._print_products)
+    
+    def _print_products(self, appliances):
+        for app in appliances:
+            print(f"ID: {app['id']:>3} | {app['name']:<30} | {self._fmt(app['price'])}")
+    
+    def _print_products_by_category(self, appliances):
+        category = None
         for app in appliances:
+            if app["category"] != category:
+                category = app["category"]
+                print(f"\n{category}\n")
             print(f"ID: {app['id']:>3} | {app['name']:<30} | {self._fmt(app['price'])}")
     
+    def _browse(self, title, pages, total, render, prompt="\nSelect (ENTER to go back): ",
+                cursor=lambda app: app["id"]):
+        cursors = [None]
+        while True:
+            self._clear()
+            print(f"{title}\n")
+            
+            page = list(itertools.islice(pages(cursors[-1]), self.CATALOG_PAGE_SIZE + 1))
+            has_next = len(page) > self.CATALOG_PAGE_SIZE
+            page = page[:self.CATALOG_PAGE_SIZE]
+            render(page)
+            
+            first = (len(cursors) - 1) * self.CATALOG_PAGE_SIZE + 1
+            print(f"\nShowing {first}-{first + len(page) - 1} of {total} product(s)")
+            if has_next:
+                print("N. Next page")
+            if len(cursors) > 1:
+                print("P. Previous page")
+            
+            choice = self._input(prompt).strip()
+            if choice.lower() == "n" and has_next:
+                cursors.append(cursor(page[-1]))
+            elif choice.lower() == "p" and len(cursors) > 1:
+                cursors.pop()
+            else:
+                return choice
+    
     def _search_products(self):
         self._clear()
         print("SEARCH PRODUCTS\n")
         
-        keyword = input("Enter keyword: ").strip()
+        keyword = self._input("Enter keyword: ").strip()
         
         if not keyword:
             print("\nPlease enter a search term\n")
-            input("Press ENTER...")
+            self._input("Press ENTER...")
             return
         
-        results = self.database.search_appliances(keyword)
+        results = self.database.search_appliances(keyword, self.CATALOG_PAGE_SIZE)
         
         print(f"\nSearch results for '{keyword}':\n")
         
         if results:
             for app in results:
                 print(f"ID: {app['id']:>3} | {app['name']:<30} | {self._fmt(app['price'])}")
-            print(f"\nFound {len(results)} product(s)")
+            print(f"\nShowing {len(results)} best match(es)")
         else:
             print("No products found")
         
-        input("\nPress ENTER...")
+        self._input("\nPress ENTER...")
     
     def _view_all_products(self):
-        self._clear()
-        print("ALL AVAILABLE PRODUCTS\n")
-        
-        appliances = self.database.get_available_appliances()
+        total = self.database.get_available_count()
         
-        if not appliances:
+        if not total:
+            self._clear()
+            print("ALL AVAILABLE PRODUCTS\n")
             print("No products available\n")
-            input("Press ENTER...")
+            self._input("Press ENTER...")
             return
         
-        categories = {}
-        for app in appliances:
-            cat = app["category"]
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(app)
-        
-        for category in sorted(categories.keys()):
-            print(f"\n{category}\n")
-            for app in categories[category]:
-                print(f"ID: {app['id']:>3} | {app['name']:<30} | {self._fmt(app['price'])}")
-        
-        print(f"\nTotal products: {len(appliances)}")
-        input("\nPress ENTER...")
+        self._browse("ALL AVAILABLE PRODUCTS",
+                     lambda after: self.database.iter_available_by_category(after, self.CATALOG_PAGE_SIZE + 1),
+                     total, self._print_products_by_category,
+                     cursor=lambda app: (app["category"], app["id"]))
     
     def _view_membership(self):
         self._clear()
@@ -261,11 +315,11 @@ class TechHouseApp:
 
         Membership.display_packages()
 
-        user = self.auth.get_current_user()
+        user = self.session.get_current_user()
 
         if not user:
             print("\nLogin to set a membership and unlock discounts!\n")
-            input("Press ENTER...")
+            self._input("Press ENTER...")
             return
 
         current = user.get("membership")
@@ -292,7 +346,7 @@ class TechHouseApp:
         print("3. Gold (15% discount + Free delivery)")
         print("0. Keep current / Back")
 
-        choice = input("\nSelect: ").strip()
+        choice = self._input("\nSelect: ").strip()
         packages = {"1": "Bronze", "2": "Silver", "3": "Gold"}
 
         if choice == "0":
@@ -300,73 +354,79 @@ class TechHouseApp:
 
         if choice in packages:
             selected = packages[choice]
-            user["membership"] = selected
-            self.auth.users[user["username"]]["membership"] = selected
+            self.auth.set_membership(user["username"], selected)
             print(f"\nMembership successfully set to {selected}!")
         else:
             print("\nInvalid choice!")
 
-        time.sleep(1.5)
+        self._pause(1.5)
     
     def _add_to_cart(self):
-        self._clear()
-        print("ADD TO CART\n")
+        total = self.database.get_available_count()
         
-        appliances = self.database.get_available_appliances()
-        
-        if not appliances:
+        if not total:
+            self._clear()
+            print("ADD TO CART\n")
             print("No products available\n")
-            input("Press ENTER...")
+            self._input("Press ENTER...")
             return
         
-        for app in appliances:
-            print(f"ID: {app['id']:>3} | {app['name']:<30} | {self._fmt(app['price'])}")
-        
-        app_id = input("\nEnter product ID (0 to cancel): ").strip()
+        app_id = self._browse("ADD TO CART",
+                              lambda after: self.database.iter_available(None, after, self.CATALOG_PAGE_SIZE + 1),
+                              total, self._print_products,
+                              "\nEnter product ID, N/P to change page (0 to cancel): ")
         
         if app_id.isdigit() and app_id != "0":
             app_id = int(app_id)
             appliance = self.database.get_appliance(app_id)
             
             if appliance and appliance["status"] == "Available":
-                qty_str = input("Quantity (default 1): ").strip()
+                qty_str = self._input("Quantity (default 1): ").strip()
                 if qty_str == "":
                     qty = 1
                 elif qty_str.isdigit():
                     qty = int(qty_str)
                 else:
                     print("\nInvalid quantity!")
-                    time.sleep(1.5)
+                    self._pause(1.5)
                     return
 
                 if qty <= 0:
                     print("\nQuantity must be at least 1!")
-                    time.sleep(1.5)
+                    self._pause(1.5)
                     return
 
-                self.cart.add_item(appliance, qty)
+                in_cart = self.session.cart.get_quantity(app_id)
+                if in_cart + qty > appliance["stock"]:
+                    print(f"\nOnly {appliance['stock']} in stock"
+                          f"{f' ({in_cart} already in your cart)' if in_cart else ''}!")
+                    self._pause(1.5)
+                    return
+
+                self.session.cart.add_item(appliance, qty)
                 print(f"\nAdded {qty} x {appliance['name']} to cart!")
             else:
                 print("\nInvalid product ID or product unavailable!")
         
-        time.sleep(1.5)
+        self._pause(1.5)
     
     def _view_cart(self):
         self._clear()
         
-        user = self.auth.get_current_user()
+        user = self.session.get_current_user()
         membership = user.get('membership') if user else None
         
-        self.cart.display(membership)
+        pricing = self.session.cart.price(membership)
+        self.session.cart.display(membership, pricing)
         
-        if not self.cart.is_empty():
+        if not self.session.cart.is_empty():
             print()
             if membership and Membership.has_free_delivery(membership):
                 print("Delivery: FREE (Gold membership benefit)")
             else:
                 print(f"Delivery: {self._fmt(self.DELIVERY_FEE)}")
             
-            total_with_delivery = self.cart.get_total(membership)
+            total_with_delivery = round(pricing["discounted_total"])
             if not (membership and Membership.has_free_delivery(membership)):
                 total_with_delivery += self.DELIVERY_FEE
             
@@ -379,36 +439,36 @@ class TechHouseApp:
             print("3. Remove item")
             print("0. Done")
 
-            c = input("Select: ").strip()
+            c = self._input("Select: ").strip()
             if c == "0":
                 break
 
-            pid = input("Enter product ID: ").strip()
+            pid = self._input("Enter product ID: ").strip()
             if not pid.isdigit():
                 print("Invalid ID!")
                 continue
             pid = int(pid)
 
             if c == "1":
-                q = input("Set quantity to: ").strip()
+                q = self._input("Set quantity to: ").strip()
                 if q.isdigit():
-                    self.cart.set_quantity(pid, int(q))
+                    self.session.cart.set_quantity(pid, int(q))
             elif c == "2":
-                q = input("Remove how many?: ").strip()
+                q = self._input("Remove how many?: ").strip()
                 if q.isdigit():
-                    self.cart.remove_quantity(pid, int(q))
+                    self.session.cart.remove_quantity(pid, int(q))
             elif c == "3":
-                self.cart.remove_item(pid)
+                self.session.cart.remove_item(pid)
 
-        input("\nPress ENTER...")
+        self._input("\nPress ENTER...")
     
     def _checkout(self):
-        if self.cart.is_empty():
+        if self.session.cart.is_empty():
             print("\nYour cart is empty!")
-            time.sleep(1)
+            self._pause(1)
             return
         
-        user = self.auth.get_current_user()
+        user = self.session.get_current_user()
         membership = user.get('membership') if user else None
         
         self._clear()
@@ -416,111 +476,77 @@ class TechHouseApp:
         print("1. Store Pickup (Free)")
         print("2. Home Delivery")
         
-        fulfillment_choice = input("\nSelect (1-2): ").strip()
+        fulfillment_choice = self._input("\nSelect (1-2): ").strip()
         is_delivery = fulfillment_choice == "2"
         
-        delivery_address = "STORE PICKUP"
-        current_delivery_fee = 0
-
+        delivery_address = None
+        delivery_district = None
         if is_delivery:
-            current_delivery_fee = 0 if (membership and Membership.has_free_delivery(membership)) else self.DELIVERY_FEE
-            
             delivery_address = user.get('delivery_address') if user else None
+            delivery_district = user.get('delivery_district') if user else None
             if not delivery_address:
                 print("\nPLEASE ENTER YOUR DELIVERY ADDRESS:")
-                street = input("Street/Building: ").strip()
-                district = input("District: ").strip()
-                city = input("City: ").strip()
+                street = self._input("Street/Building: ").strip()
+                district = self._input("District: ").strip()
+                city = self._input("City: ").strip()
                 
                 if not street or not city:
                     print("\nAddress incomplete! Checkout cancelled.")
-                    time.sleep(2)
+                    self._pause(2)
                     return
                 
                 delivery_address = f"{street}, {district}, {city}"
+                delivery_district = district or city
                 
                 if user:
-                    save = input("\nSave this address for future orders? (yes/no): ").strip().lower()
+                    save = self._input("\nSave this address for future orders? (yes/no): ").strip().lower()
                     if save == "yes" or save == "y":
-                        self.auth.set_delivery_address(user['username'], delivery_address)
-
-        from datetime import datetime, timedelta
-        now = datetime.now()
-        
-        if not is_delivery:
-            delivery_msg = "Ready for pickup in: 2 hours"
-        elif membership == "Gold":
-            delivery_time = now + timedelta(hours=5)
-            delivery_msg = f"Express Delivery by: {delivery_time.strftime('%H:%M Today')}"
-        elif membership == "Silver":
-            delivery_time = now + timedelta(days=1)
-            delivery_msg = f"Standard Delivery by: {delivery_time.strftime('%Y-%m-%d %H:%M')}"
-        else:
-            delivery_time = now + timedelta(days=3)
-            delivery_msg = f"Economy Delivery by: {delivery_time.strftime('%Y-%m-%d %H:%M')}"
+                        self.auth.set_delivery_address(user['username'], delivery_address, delivery_district)
 
+        request = OrderRequest(user, self.session.cart, is_delivery, delivery_address, delivery_district)
+        quote = self.orders.quote(request)
+        
         self._clear()
         print("CHECKOUT SUMMARY\n")
         
-        self.cart.display(membership)
-        
-        discounted_subtotal = self.cart.get_total(membership)
-        final_total = discounted_subtotal + current_delivery_fee
+        pricing = quote["pricing"]
+        self.session.cart.display(membership, pricing)
         
         print(f"\nMethod: {'Delivery' if is_delivery else 'Store Pickup'}")
-        print(f"Schedule: {delivery_msg}")
-        print(f"Fee: {self._fmt(current_delivery_fee) if current_delivery_fee > 0 else 'FREE'}\n")
+        print(f"Schedule: {quote['schedule']}")
+        print(f"Fee: {self._fmt(quote['delivery_fee']) if quote['delivery_fee'] > 0 else 'FREE'}\n")
         
-        original_subtotal = self.cart.get_total(None)
-        savings = original_subtotal - discounted_subtotal
+        original_subtotal = round(pricing["original_total"])
+        savings = original_subtotal - quote["subtotal"]
         if savings > 0:
             print(f"Subtotal (before discount): {self._fmt(original_subtotal)}")
-            print(f"Subtotal (after discount):  {self._fmt(discounted_subtotal)}")
+            print(f"Subtotal (after discount):  {self._fmt(quote['subtotal'])}")
             print(f"You save:                 {self._fmt(savings)}")
         else:
-            print(f"Subtotal: {self._fmt(discounted_subtotal)}")
-        print(f"TOTAL TO PAY: {self._fmt(final_total)}\n")
+            print(f"Subtotal: {self._fmt(quote['subtotal'])}")
+        print(f"TOTAL TO PAY: {self._fmt(quote['total'])}\n")
         
-        confirm = input("Confirm purchase? (yes/no): ").strip().lower()
+        confirm = self._input("Confirm purchase? (yes/no): ").strip().lower()
         
         if confirm == "yes" or confirm == "y":
-            purchase_items = []
-            for item in self.cart.get_items().values():
-                appliance = item["appliance"]
-                purchase_items.append({
-                    "name": appliance["name"],
-                    "quantity": item["quantity"],
-                    "unit_price": appliance["price"],
-                    "total_price": appliance["price"] * item["quantity"]
-                })
-                self.database.update_appliance_status(appliance["id"], "Sold")
-            
-            username = user['username'] if user else "Guest"
-            self.database.add_sale(
-                username=username,
-                items=purchase_items,
-                total_amount=final_total,
-                delivery_address=delivery_address,
-                delivery_fee=current_delivery_fee,
-                date=f"{now.strftime('%Y-%m-%d %H:%M:%S')} (Est. Arrival: {delivery_msg})"
-            )
-            
-            if user:
-                self.auth.add_purchase(user['username'])
+            result = self.orders.place(request)
+            if not result.success:
+                print(f"\n{result.message}. Order cancelled")
+                self._pause(3)
+                return
             
-            print(f"\nORDER COMPLETED AT {now.strftime('%H:%M:%S')}!")
-            print(f"Fulfillment: {delivery_msg}")
-            self.cart.clear()
+            print(f"\nORDER COMPLETED AT {datetime.now().strftime('%H:%M:%S')}!")
+            print(f"Fulfillment: {describe_slot(result.delivery_slot)}")
         else:
             print("\nOrder cancelled")
         
-        time.sleep(3)
+        self._pause(3)
     
     def _check_admin_status(self):
-        user = self.auth.get_current_user()
+        user = self.session.get_current_user()
         if not user:
             print("\nPlease login first!")
-            time.sleep(1)
+            self._pause(1)
             return
         
         self._clear()
@@ -543,52 +569,80 @@ class TechHouseApp:
                 remaining = 5 - user.get('total_purchases', 0)
                 print(f"\nComplete {remaining} more purchase(s) to become eligible.")
         
-        input("\nPress ENTER...")
+        self._input("\nPress ENTER...")
     
     def _view_purchase_history(self):
-        user = self.auth.get_current_user()
+        user = self.session.get_current_user()
         if not user:
             print("\nPlease login first!")
-            time.sleep(1)
+            self._pause(1)
             return
         
-        self._clear()
-        print("PURCHASE HISTORY\n")
-        
-        purchases = self.database.get_user_purchases(user['username'])
+        total_orders = self.database.get_user_purchase_count(user['username'])
         
-        if not purchases:
+        if not total_orders:
+            self._clear()
+            print("PURCHASE HISTORY\n")
             print("You haven't made any purchases yet.")
             print("Start shopping to build your purchase history!\n")
-            input("Press ENTER...")
+            self._input("Press ENTER...")
             return
         
-        print(f"Total Orders: {len(purchases)}\n")
-        
-        for i, sale in enumerate(purchases, 1):
-            print(f"Order #{sale['id']} - {sale['date']}\n")
+        offset = 0
+        while True:
+            self._clear()
+            print("PURCHASE HISTORY\n")
             
-            print(f"{'Item':<30} {'Qty':>5} {'Unit Price':>15} {'Total':>15}")
+            purchases = self.database.get_user_purchases_page(
+                user['username'], self.HISTORY_PAGE_SIZE, offset)
             
-            for item in sale['items']:
-                print(f"{item['name']:<30} {item['quantity']:>5} "
-                      f"{self._fmt(item['unit_price']):>15} "
-                      f"{self._fmt(item['total_price']):>15}")
+            print(f"Total Orders: {total_orders} "
+                  f"(showing {offset + 1}-{offset + len(purchases)}, newest first)\n")
             
-            print(f"\nDelivery Fee: {self._fmt(sale['delivery_fee']) if sale['delivery_fee'] > 0 else 'FREE'}")
-            print(f"Total Amount: {self._fmt(sale['total_amount'])}")
-            print(f"Delivered to: {sale['delivery_address']}")
+            for i, sale in enumerate(purchases, 1):
+                print(f"Order #{sale['id']} - {sale['date']}\n")
+                
+                print(f"{'Item':<30} {'Qty':>5} {'Unit Price':>15} {'Total':>15}")
+                
+                for item in sale['items']:
+                    print(f"{item['name']:<30} {item['quantity']:>5} "
+                          f"{self._fmt(item['unit_price']):>15} "
+                          f"{self._fmt(item['total_price']):>15}")
+                
+                print(f"\nDelivery Fee: {self._fmt(sale['delivery_fee']) if sale['delivery_fee'] > 0 else 'FREE'}")
+                print(f"Total Amount: {self._fmt(sale['total_amount'])}")
+                print(f"Delivered to: {sale['delivery_address']}")
+                if sale.get('delivery_slot'):
+                    print(describe_slot(sale['delivery_slot']))
+                
+                if i < len(purchases):
+                    print()
             
-            if i < len(purchases):
-                print()
-        
-        input("\nPress ENTER...")
+            has_next = offset + self.HISTORY_PAGE_SIZE < total_orders
+            has_prev = offset > 0
+            if not has_next and not has_prev:
+                self._input("\nPress ENTER...")
+                return
+            
+            print()
+            if has_next:
+                print("N. Next page")
+            if has_prev:
+                print("P. Previous page")
+            choice = self._input("Select (ENTER to go back): ").strip().lower()
+            
+            if choice == "n" and has_next:
+                offset += self.HISTORY_PAGE_SIZE
+            elif choice == "p" and has_prev:
+                offset -= self.HISTORY_PAGE_SIZE
+            elif choice == "":
+                return
     
     def _set_delivery_address(self):
-        user = self.auth.get_current_user()
+        user = self.session.get_current_user()
         if not user:
             print("\nPlease login first!")
-            time.sleep(1)
+            self._pause(1)
             return
         
         self._clear()
@@ -597,20 +651,20 @@ class TechHouseApp:
         current_address = user.get('delivery_address')
         if current_address:
             print(f"Current Address: {current_address}")
-            update = input("\nUpdate address? (yes/no): ").strip().lower()
+            update = self._input("\nUpdate address? (yes/no): ").strip().lower()
             if update != "yes" and update != "y":
                 return
         
         print("\nEnter your delivery address:")
-        street = input("Street/Building: ").strip()
-        district = input("District: ").strip()
-        city = input("City: ").strip()
-        postal = input("Postal Code (optional): ").strip()
-        phone = input("Phone Number: ").strip()
+        street = self._input("Street/Building: ").strip()
+        district = self._input("District: ").strip()
+        city = self._input("City: ").strip()
+        postal = self._input("Postal Code (optional): ").strip()
+        phone = self._input("Phone Number: ").strip()
         
         if not street or not city:
             print("\nStreet and City are required!")
-            time.sleep(1.5)
+            self._pause(1.5)
             return
         
         address_parts = [street]
@@ -624,39 +678,46 @@ class TechHouseApp:
         
         full_address = ", ".join(address_parts)
         
-        self.auth.set_delivery_address(user['username'], full_address)
+        self.auth.set_delivery_address(user['username'], full_address, district or city)
         
         print("\nDelivery address saved successfully!")
         print(f"\n{full_address}")
-        time.sleep(2)
+        self._pause(2)
     
     def _add_product(self):
-        if not self.auth.is_admin():
+        if not self.session.is_admin():
             print("\nAdmin access required!")
-            time.sleep(1)
+            self._pause(1)
             return
         
         self._clear()
         print("[ADMIN] ADD PRODUCT\n")
         
-        name = input("Product name: ").strip()
-        price_str = input("Price (UZS): ").strip()
+        name = self._input("Product name: ").strip()
+        price_str = self._input("Price (UZS): ").strip()
         
         if not name:
             print("\nProduct name cannot be empty!")
-            time.sleep(1)
+            self._pause(1)
             return
         
         if not price_str.isdigit():
             print("\nInvalid price!")
-            time.sleep(1)
+            self._pause(1)
             return
         
         price = int(price_str)
         if price <= 0:
             print("\nPrice must be greater than 0!")
-            time.sleep(1)
+            self._pause(1)
+            return
+        
+        stock_str = self._input("Stock quantity (default 1): ").strip()
+        if stock_str and not stock_str.isdigit():
+            print("\nInvalid stock quantity!")
+            self._pause(1)
             return
+        stock = int(stock_str) if stock_str else 1
         
         categories = self.database.get_all_categories()
         print("\nSelect category:")
@@ -664,41 +725,43 @@ class TechHouseApp:
             print(f"{i}. {cat}")
         print(f"{len(categories) + 1}. Create new category")
         
-        cat_choice = input("\nSelect: ").strip()
+        cat_choice = self._input("\nSelect: ").strip()
         
         if not cat_choice.isdigit():
             print("\nInvalid choice!")
-            time.sleep(1)
+            self._pause(1)
             return
         
         cat_idx = int(cat_choice) - 1
         
         if cat_idx == len(categories):
-            category = input("Enter new category name: ").strip()
+            category = self._input("Enter new category name: ").strip()
             if not category:
                 print("\nCategory name cannot be empty!")
-                time.sleep(1)
+                self._pause(1)
                 return
         elif 0 <= cat_idx < len(categories):
             category = categories[cat_idx]
         else:
             print("\nInvalid choice!")
-            time.sleep(1)
+            self._pause(1)
             return
         
-        app_id = self.database.add_appliance(name, price, "Available", category)
+        app_id = self.database.add_appliance(name, price, "Available" if stock > 0 else "Sold",
+                                             category, stock)
         print(f"\nProduct added successfully!")
         print(f"Product ID: {app_id}")
         print(f"Name: {name}")
         print(f"Price: {self._fmt(price)}")
         print(f"Category: {category}")
+        print(f"Stock: {stock}")
         
-        time.sleep(3)
+        self._pause(3)
     
     def _make_admin(self):
-        if not self.auth.is_admin():
+        if not self.session.is_admin():
             print("\nAdmin access required!")
-            time.sleep(1)
+            self._pause(1)
             return
         
         self._clear()
@@ -722,44 +785,293 @@ class TechHouseApp:
         
         if not eligible_users:
             print("\nNo eligible users for promotion\n")
-            input("Press ENTER...")
+            self._input("Press ENTER...")
             return
         
         print(f"\nEligible users: {', '.join(eligible_users)}")
         
-        username = input("\nEnter username to promote: ").strip()
+        username = self._input("\nEnter username to promote: ").strip()
         
         if username not in users:
             print("\nUser not found!")
-            time.sleep(1)
+            self._pause(1)
             return
         
-        password = input("Enter admin password: ").strip()
+        password = self._input("Enter admin password: ").strip()
         
         success, msg = self.auth.make_admin(username, password)
         
         print(f"\n{msg}")
-        time.sleep(2)
+        self._pause(2)
+    
+    def _import_catalog(self):
+        if not self.session.is_admin():
+            print("\nAdmin access required!")
+            self._pause(1)
+            return
+        
+        self._clear()
+        print("[ADMIN] IMPORT CATALOG\n")
+        
+        path = self._input("File path (.csv or .jsonl): ").strip()
+        
+        try:
+            imported, rejected = catalog_io.import_catalog(self.database, path)
+        except (OSError, ValueError) as e:
+            print(f"\nImport failed: {e}")
+            self._pause(2)
+            return
+        
+        print(f"\nImported {imported} product(s)")
+        if rejected:
+            print(f"Skipped {rejected} invalid row(s)")
+        self._input("\nPress ENTER...")
+    
+    def _export_catalog(self):
+        if not self.session.is_admin():
+            print("\nAdmin access required!")
+            self._pause(1)
+            return
+        
+        self._clear()
+        print("[ADMIN] EXPORT CATALOG\n")
+        
+        path = self._input("File path (.csv or .jsonl): ").strip()
+        
+        try:
+            count = catalog_io.export_catalog(self.database, path)
+        except (OSError, ValueError) as e:
+            print(f"\nExport failed: {e}")
+            self._pause(2)
+            return
+        
+        print(f"\nExported {count} product(s) to {path}")
+        self._input("\nPress ENTER...")
+    
+    def _sales_report(self):
+        if not self.session.is_admin():
+            print("\nAdmin access required!")
+            self._pause(1)
+            return
+        
+        self._clear()
+        print("[ADMIN] SALES REPORT\n")
+        
+        report = self.database.get_sales_report()
+        print(f"Orders: {report['total_sales']}")
+        print(f"Revenue: {report['total_revenue']:,} UZS")
+        print(f"Units sold: {report['total_units']}")
+        print(f"Average basket: {report['average_basket_size']:.2f} item(s)")
+        print(f"Average order: {report['average_order_value']:,.0f} UZS")
+        print(f"Delivery: {report['fulfillment']['delivery']} | Pickup: {report['fulfillment']['pickup']}")
+        print(f"Inventory value: {report['inventory_value']:,} UZS")
+        
+        week_ago = time.time() - 7 * 24 * 3600
+        print(f"Revenue (last 7 days): {self.database.get_revenue_between(week_ago):,} UZS")
+        
+        if report["revenue_by_day"]:
+            print("\nREVENUE BY DAY")
+            for day, revenue in sorted(report["revenue_by_day"].items())[-7:]:
+                print(f"  {day}: {revenue:,} UZS")
+        
+        if report["revenue_by_tier"]:
+            print("\nREVENUE BY MEMBERSHIP")
+            for tier, revenue in sorted(report["revenue_by_tier"].items()):
+                print(f"  {tier}: {revenue:,} UZS")
+        
+        if report["sales_by_category"]:
+            print("\nSALES BY CATEGORY")
+            for category, revenue in sorted(report["sales_by_category"].items(),
+                                            key=lambda entry: entry[1], reverse=True):
+                print(f"  {category}: {revenue:,} UZS")
+        
+        if report["units_by_sku"]:
+            print("\nTOP PRODUCTS")
+            top = sorted(report["units_by_sku"].items(), key=lambda entry: entry[1], reverse=True)[:5]
+            for sku, units in top:
+                appliance = self.database.get_appliance(sku) if isinstance(sku, int) else None
+                name = appliance["name"] if appliance else sku
+                print(f"  {name}: {units} unit(s)")
+        
+        period = self._input("\nReport for a period (YYYY-MM-DD YYYY-MM-DD), ENTER to go back: ").split()
+        if not period:
+            return
+        
+        try:
+            report = self.database.get_sales_report_between(period[0], period[-1])
+        except ValueError:
+            print("\nInvalid date! Use YYYY-MM-DD.")
+            self._pause(1)
+            return
+        
+        self._clear()
+        print(f"[ADMIN] SALES REPORT {period[0]} - {period[-1]}\n")
+        print(f"Orders: {report['total_sales']}")
+        print(f"Revenue: {report['total_revenue']:,} UZS")
+        print(f"Units sold: {report['total_units']}")
+        print(f"Average order: {report['average_order_value']:,.0f} UZS")
+        print(f"Delivery: {report['fulfillment']['delivery']} | Pickup: {report['fulfillment']['pickup']}")
+        
+        if report["revenue_by_tier"]:
+            print("\nREVENUE BY MEMBERSHIP")
+            for tier, revenue in sorted(report["revenue_by_tier"].items()):
+                print(f"  {tier}: {revenue:,} UZS")
+        
+        if report["sales_by_category"]:
+            print("\nSALES BY CATEGORY")
+            for category, revenue in sorted(report["sales_by_category"].items(),
+                                            key=lambda entry: entry[1], reverse=True):
+                print(f"  {category}: {revenue:,} UZS")
+        
+        if report["top_skus"]:
+            print("\nTOP PRODUCTS")
+            for sku, units in report["top_skus"][:5]:
+                appliance = self.database.get_appliance(sku) if isinstance(sku, int) else None
+                name = appliance["name"] if appliance else sku
+                print(f"  {name}: {units} unit(s)")
+        
+        self._input("\nPress ENTER...")
+    
+    def _show_metrics(self):
+        if not self.session.is_admin():
+            print("\nAdmin access required!")
+            self._pause(1)
+            return
+        
+        self._clear()
+        print("[ADMIN] METRICS\n")
+        
+        if not METRICS.enabled:
+            print("Metrics are disabled (start with --metrics or TECHHOUSE_METRICS=1).")
+            self._input("\nPress ENTER...")
+            return
+        
+        timings = METRICS.snapshot()
+        if not timings:
+            print("No calls recorded yet.")
+        else:
+            print(f"{'Call':<30} {'Count':>8} {'Mean (ms)':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'Max (ms)':>10}")
+            for name, summary in timings.items():
+                print(f"{name:<30} {summary['count']:>8} {summary['mean_ms']:>10.3f} {summary['p50_ms']:>10.3f} "
+                      f"{summary['p99_ms']:>10.3f} {summary['max_ms']:>10.3f}")
+        
+        if METRICS.profiler is not None:
+            print(f"\nPROFILE ({METRICS.profiler.samples} samples)")
+            for function, own, cumulative in METRICS.profiler.top(10):
+                print(f"  {function:<45} self {own:>6}  total {cumulative:>6}")
+        
+        print("\n1. Dump as JSON")
+        print("2. Dump as Prometheus text")
+        print("3. Reset counters")
+        print("0. Back")
+        choice = self._input("\nSelect: ").strip()
+        
+        if choice == "3":
+            METRICS.reset()
+            print("\nCounters reset.")
+            self._pause(1)
+            return
+        if choice not in ("1", "2"):
+            return
+        
+        text = METRICS.to_json() if choice == "1" else METRICS.to_prometheus()
+        path = self._input("File path (ENTER to print): ").strip()
+        if path:
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            except OSError as e:
+                print(f"\nCould not write {path}: {e}")
+            else:
+                print(f"\nMetrics written to {path}")
+        else:
+            print()
+            print(text)
+        self._input("\nPress ENTER...")
     
     def _exit_app(self):
         self._clear()
         print("THANK YOU FOR VISITING TECH HOUSE!")
         print("We hope to see you again soon!")
-        time.sleep(2)
+        self._pause(2)
+        self.close()
         exit(0)
     
+    def close(self):
+        self.database.close()
+        self.auth.close()
+    
     def _exit(self):
         self._clear()
         print("LOGGING OUT")
-        time.sleep(1)
+        self._pause(1)
+    
+    def _run_action(self, action):
+        name = action.__name__.lstrip("_")
+        with METRICS.profile(name):
+            if not self.driver:
+                return action()
+            
+            start = time.perf_counter()
+            try:
+                return action()
+            finally:
+                self.driver.record(name, time.perf_counter() - start)
+    
+    def _input(self, prompt=""):
+        if self.driver:
+            return self.driver.input(prompt)
+        return input(prompt)
+    
+    def _pause(self, seconds):
+        if not self.driver:
+            time.sleep(seconds)
     
     def _clear(self):
-        os.system("cls" if os.name == "nt" else "clear")
+        if self.driver:
+            print("\033[2J\033[H", end="")
+        else:
+            os.system("cls" if os.name == "nt" else "clear")
     
     def _fmt(self, price):
         return f"{int(price):,} UZS"
 
 
 if __name__ == "__main__":
-    app = TechHouseApp()
-    app.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Tech House - Home Appliance Store")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument("--db", help="SQLite database file for persistent storage")
+    backend.add_argument("--journal", help="directory for the journal and snapshots of in-memory state")
+    parser.add_argument("--sales-log", help="directory for the columnar sales history")
+    parser.add_argument("--script", help="run menu input from a text or JSONL script without pauses")
+    parser.add_argument("--output", help="file for screen output in --script mode (default: discard)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="record call counts and latency histograms (admin menu 15)")
+    parser.add_argument("--profile", type=float, nargs="?", const=5.0, metavar="MS",
+                        help="sample the stack every MS milliseconds during menu actions (implies --metrics)")
+    args = parser.parse_args()
+    
+    if args.metrics or args.profile:
+        METRICS.enable(SamplingProfiler(args.profile / 1000) if args.profile else None)
+    
+    storage = None
+    if args.db:
+        storage = SQLiteStorage(args.db)
+    elif args.journal:
+        storage = JournalStorage(args.journal)
+    sales_log = SalesLog(args.sales_log) if args.sales_log else None
+    
+    if args.script:
+        driver = HeadlessDriver.from_file(args.script)
+        app = TechHouseApp(storage, driver, sales_log)
+        try:
+            driver.run(app, args.output)
+        finally:
+            app.close()
+        driver.print_report()
+    else:
+        app = TechHouseApp(storage, sales_log=sales_log)
+        try:
+            app.run()
+        finally:
+            app.close()
\ No newline at end of file
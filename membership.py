@@ -1,9 +1,15 @@
+import functools
 from datetime import datetime, timedelta
+from types import MappingProxyType
+
+
+def _freeze(packages):
+    return MappingProxyType({name: MappingProxyType(dict(info)) for name, info in packages.items()})
 
 
 class Membership:
     
-    PACKAGES = {
+    PACKAGES = _freeze({
         "Bronze": {
             "discount": 5,
             "free_delivery": False,
@@ -19,7 +25,11 @@ class Membership:
             "free_delivery": True,
             "description": "Premium membership with 15% discount and free delivery"
         }
-    }
+    })
+    
+    DISCOUNT_CACHE_SIZE = 65536
+    _multipliers = None
+    _multipliers_source = None
     
     @staticmethod
     def get_package_info(package_name):
@@ -27,17 +37,67 @@ class Membership:
             return None
         return Membership.PACKAGES.get(package_name, None)
     
+    @staticmethod
+    def get_packages():
+        return {name: dict(info) for name, info in Membership.PACKAGES.items()}
+    
     @staticmethod
     def calculate_discount(price, package_name):
-        if not package_name:
+        if not package_name or Membership.get_discount_multiplier(package_name) is None:
             return price
-            
-        package = Membership.get_package_info(package_name)
-        if package:
-            discount = package["discount"]
-            discounted_price = price * (1 - discount / 100)
-            return round(discounted_price)
-        return price
+        return Membership.discounted_price(price, package_name)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=DISCOUNT_CACHE_SIZE)
+    def discounted_price(price, package_name):
+        return round(price * Membership.get_discount_multiplier(package_name))
+    
+    @staticmethod
+    def get_discount_multiplier(package_name):
+        if Membership._multipliers_source is not Membership.PACKAGES:
+            Membership.invalidate_discount_cache()
+        if Membership._multipliers is None:
+            Membership._multipliers_source = Membership.PACKAGES
+            Membership._multipliers = {name: 1 - info["discount"] / 100
+                                       for name, info in Membership.PACKAGES.items()}
+        return Membership._multipliers.get(package_name)
+    
+    @staticmethod
+    def set_package(name, discount, free_delivery=False, description=""):
+        packages = Membership.get_packages()
+        packages[name] = {
+            "discount": discount,
+            "free_delivery": free_delivery,
+            "description": description
+        }
+        Membership.PACKAGES = _freeze(packages)
+        Membership.invalidate_discount_cache()
+    
+    @staticmethod
+    def remove_package(name):
+        if name not in Membership.PACKAGES:
+            return False
+        packages = Membership.get_packages()
+        del packages[name]
+        Membership.PACKAGES = _freeze(packages)
+        Membership.invalidate_discount_cache()
+        return True
+    
+    @staticmethod
+    def invalidate_discount_cache():
+        Membership._multipliers = None
+        Membership._multipliers_source = None
+        Membership.discounted_price.cache_clear()
+    
+    @staticmethod
+    def get_discount_cache_stats():
+        info = Membership.discounted_price.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize
+        }
     
     @staticmethod
     def has_free_delivery(package_name):
@@ -0,0 +1,277 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class Histogram:
+    SUB_BUCKET_BITS = 3
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = {}
+            self.count = 0
+            self.total = 0
+            self.min = None
+            self.max = 0
+
+    def record(self, value):
+        index = self.bucket(value)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    @classmethod
+    def bucket(cls, value):
+        if value < 2 * cls.SUB_BUCKETS:
+            return max(value, 0)
+        exponent = value.bit_length() - cls.SUB_BUCKET_BITS - 1
+        return exponent * cls.SUB_BUCKETS + (value >> exponent)
+
+    @classmethod
+    def bucket_bounds(cls, index):
+        if index < 2 * cls.SUB_BUCKETS:
+            return index, index
+        exponent = index // cls.SUB_BUCKETS - 1
+        mantissa = index - exponent * cls.SUB_BUCKETS
+        return mantissa << exponent, ((mantissa + 1) << exponent) - 1
+
+    def percentile(self, percent):
+        with self._lock:
+            if not self.count:
+                return 0
+            rank = max(1, -(-self.count * percent // 100))
+            seen = 0
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= rank:
+                    return min(self.bucket_bounds(index)[1], self.max)
+            return self.max
+
+    def buckets(self):
+        with self._lock:
+            return [(self.bucket_bounds(index)[1], self.counts[index]) for index in sorted(self.counts)]
+
+    def summary(self):
+        with self._lock:
+            count = self.count
+            total = self.total
+            low = self.min or 0
+            high = self.max
+        return {
+            "count": count,
+            "total_ms": total / 1e6,
+            "mean_ms": total / count / 1e6 if count else 0,
+            "min_ms": low / 1e6,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p90_ms": self.percentile(90) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "max_ms": high / 1e6
+        }
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.histogram.record(time.perf_counter_ns() - self.start)
+        return False
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+NULL_CONTEXT = _NullContext()
+
+
+class SamplingProfiler:
+
+    def __init__(self, interval=0.005, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def profile(self, label):
+        return _ProfileRun(self, label, threading.get_ident())
+
+    def sample(self, label, thread_id):
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        stack.append(label)
+        stack.reverse()
+        with self._lock:
+            self.stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def reset(self):
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+
+    def top(self, limit=10):
+        own = Counter()
+        cumulative = Counter()
+        with self._lock:
+            for stack, count in self.stacks.items():
+                own[stack[-1]] += count
+                for function in set(stack[1:]):
+                    cumulative[function] += count
+        return [(function, count, cumulative[function]) for function, count in own.most_common(limit)]
+
+    def collapsed(self):
+        with self._lock:
+            return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class _ProfileRun:
+
+    def __init__(self, profiler, label, thread_id):
+        self.profiler = profiler
+        self.label = label
+        self.thread_id = thread_id
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.profiler.interval):
+            self.profiler.sample(self.label, self.thread_id)
+
+
+class Metrics:
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self.profiler = None
+        self._lock = threading.Lock()
+
+    def enable(self, profiler=None):
+        self.enabled = True
+        if profiler is not None:
+            self.profiler = profiler
+
+    def disable(self):
+        self.enabled = False
+        self.profiler = None
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def timed(self, name):
+        def decorate(func):
+            histogram = self.histogram(name)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    histogram.record(time.perf_counter_ns() - start)
+            return wrapper
+        return decorate
+
+    def timer(self, name):
+        if not self.enabled:
+            return NULL_CONTEXT
+        return _Timer(self.histogram(name))
+
+    def profile(self, label):
+        profiler = self.profiler
+        if profiler is None:
+            return NULL_CONTEXT
+        return profiler.profile(label)
+
+    def reset(self):
+        for histogram in list(self.histograms.values()):
+            histogram.reset()
+        if self.profiler is not None:
+            self.profiler.reset()
+
+    def snapshot(self):
+        return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())
+                if histogram.count}
+
+    def to_json(self):
+        payload = {"enabled": self.enabled, "timings": self.snapshot()}
+        if self.profiler is not None:
+            payload["profile"] = {
+                "samples": self.profiler.samples,
+                "interval_ms": self.profiler.interval * 1000,
+                "top": [{"function": function, "self": own, "cumulative": cumulative}
+                        for function, own, cumulative in self.profiler.top(20)]
+            }
+        return json.dumps(payload, indent=2)
+
+    def to_prometheus(self, prefix="techhouse"):
+        lines = [f"# HELP {prefix}_call_duration_seconds Latency of instrumented store calls.",
+                 f"# TYPE {prefix}_call_duration_seconds histogram"]
+        for name, histogram in sorted(self.histograms.items()):
+            if not histogram.count:
+                continue
+            label = f'name="{name}"'
+            cumulative = 0
+            for upper, count in histogram.buckets():
+                cumulative += count
+                lines.append(f'{prefix}_call_duration_seconds_bucket{{{label},le="{upper / 1e9:.9g}"}} '
+                             f"{cumulative}")
+            lines.append(f'{prefix}_call_duration_seconds_bucket{{{label},le="+Inf"}} {histogram.count}')
+            lines.append(f"{prefix}_call_duration_seconds_sum{{{label}}} {histogram.total / 1e9:.9f}")
+            lines.append(f"{prefix}_call_duration_seconds_count{{{label}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics(enabled=os.environ.get("TECHHOUSE_METRICS") == "1")
+timed = METRICS.timed
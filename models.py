@@ -0,0 +1,156 @@
+class Record:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={getattr(self, key)!r}" for key in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return self.__slots__
+
+    def values(self):
+        return [getattr(self, key) for key in self.__slots__]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.__slots__]
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def copy(self):
+        return type(self)(**self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        return cls(**{key: data[key] for key in cls.__slots__ if key in data})
+
+
+class Appliance(Record):
+    __slots__ = ("id", "name", "price", "status", "category", "stock")
+
+    def __init__(self, id, name, price, status, category, stock=1):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.status = status
+        self.category = category
+        self.stock = stock
+
+
+class CartLine(Record):
+    __slots__ = ("appliance_id", "appliance", "quantity")
+
+    def __init__(self, appliance_id, appliance, quantity):
+        self.appliance_id = appliance_id
+        self.appliance = appliance
+        self.quantity = quantity
+
+
+class SaleItem(Record):
+    __slots__ = ("appliance_id", "name", "category", "quantity", "unit_price", "total_price")
+
+    def __init__(self, name, quantity, unit_price, total_price, appliance_id=None, category=None):
+        self.appliance_id = appliance_id
+        self.name = name
+        self.category = category
+        self.quantity = quantity
+        self.unit_price = unit_price
+        self.total_price = total_price
+
+    @classmethod
+    def for_line(cls, line):
+        appliance = line.appliance
+        return cls(appliance.name, line.quantity, appliance.price,
+                   appliance.price * line.quantity, appliance.id, appliance.category)
+
+
+class DeliverySlot(Record):
+    __slots__ = ("district", "start", "end")
+
+    def __init__(self, district, start, end):
+        self.district = district
+        self.start = start
+        self.end = end
+
+
+class Sale(Record):
+    __slots__ = ("id", "username", "customer_id", "membership", "items", "total_amount",
+                 "delivery_address", "delivery_fee", "date", "delivery_slot")
+
+    def __init__(self, id, username, items, total_amount, delivery_address, delivery_fee, date,
+                 customer_id=None, membership=None, delivery_slot=None):
+        self.id = id
+        self.username = username
+        self.customer_id = customer_id
+        self.membership = membership
+        self.items = [SaleItem.from_dict(item) for item in items]
+        self.total_amount = total_amount
+        self.delivery_address = delivery_address
+        self.delivery_fee = delivery_fee
+        self.date = date
+        self.delivery_slot = DeliverySlot.from_dict(delivery_slot) if delivery_slot else None
+
+
+class OrderRequest(Record):
+    __slots__ = ("user", "cart", "delivery", "address", "district")
+
+    def __init__(self, user, cart, delivery=False, address=None, district=None):
+        self.user = user
+        self.cart = cart
+        self.delivery = delivery
+        self.address = address
+        self.district = district
+
+
+class OrderResult(Record):
+    __slots__ = ("success", "message", "sale_id", "total_amount", "delivery_fee", "delivery_slot")
+
+    def __init__(self, success, message, sale_id=None, total_amount=0, delivery_fee=0,
+                 delivery_slot=None):
+        self.success = success
+        self.message = message
+        self.sale_id = sale_id
+        self.total_amount = total_amount
+        self.delivery_fee = delivery_fee
+        self.delivery_slot = delivery_slot
+
+
+def to_json(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
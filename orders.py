@@ -0,0 +1,186 @@
+from datetime import datetime, timedelta
+from delivery import DeliveryScheduler, describe_slot
+from membership import Membership
+from metrics import timed
+from models import OrderResult, SaleItem
+from pricing import price_columns
+
+
+class OrderService:
+    DELIVERY_FEE = 50000
+    GROUP_SIZE = 256
+    EMPTY_CART = "Your cart is empty"
+    ADDRESS_REQUIRED = "Delivery address required"
+    OUT_OF_STOCK = "Some items in your cart are no longer in stock"
+    NO_DELIVERY_SLOTS = "No delivery slots available"
+
+    def __init__(self, database, auth, scheduler=None):
+        self.database = database
+        self.auth = auth
+        self.scheduler = scheduler or DeliveryScheduler()
+        self._restore_bookings()
+
+    def _restore_bookings(self):
+        now = datetime.now()
+        cutoff = (now - timedelta(days=self.scheduler.horizon_days)).strftime("%Y-%m-%d %H:%M:%S")
+        for sale_id in range(self.database.next_sale_id - 1, 0, -1):
+            sale = self.database.sales.get(sale_id)
+            if sale is None:
+                continue
+            if sale.date < cutoff:
+                break
+            if sale.delivery_slot is not None and sale.delivery_slot.start >= now.strftime("%Y-%m-%d %H:%M"):
+                self.scheduler.occupy(sale.delivery_slot, now)
+
+    def delivery_fee(self, membership, is_delivery):
+        if not is_delivery or Membership.has_free_delivery(membership):
+            return 0
+        return self.DELIVERY_FEE
+
+    def quote(self, request, now=None):
+        membership = self._membership(request)
+        pricing = request.cart.price(membership)
+        fee = self.delivery_fee(membership, request.delivery)
+
+        slot = None
+        schedule = describe_slot(None)
+        if request.delivery:
+            slot = self.scheduler.peek(self._district(request), membership, now)
+            schedule = describe_slot(slot) if slot else self.NO_DELIVERY_SLOTS
+        return {
+            "pricing": pricing,
+            "subtotal": round(pricing["discounted_total"]),
+            "delivery_fee": fee,
+            "total": round(pricing["discounted_total"]) + fee,
+            "delivery_slot": slot,
+            "schedule": schedule
+        }
+
+    @timed("checkout")
+    def place(self, request):
+        return self.place_many([request])[0]
+
+    @timed("checkout.batch")
+    def place_many(self, requests, group_size=None):
+        group_size = group_size or self.GROUP_SIZE
+        results = []
+        for start in range(0, len(requests), group_size):
+            results.extend(self._place_group(requests[start:start + group_size]))
+        return results
+
+    def _place_group(self, requests):
+        now = datetime.now()
+        results = [None] * len(requests)
+
+        pending = []
+        for position, request in enumerate(requests):
+            if request.cart.is_empty():
+                results[position] = OrderResult(False, self.EMPTY_CART)
+            elif request.delivery and not self._address(request):
+                results[position] = OrderResult(False, self.ADDRESS_REQUIRED)
+            else:
+                pending.append(position)
+        if not pending:
+            return results
+
+        lines = {position: list(requests[position].cart.items.values()) for position in pending}
+        subtotals = self._price(requests, lines)
+        reservations = self.database.reserve_many(
+            [(line.appliance_id, line.quantity) for line in lines[position]] for position in pending)
+
+        reserved = []
+        for position, reservation in zip(pending, reservations):
+            if reservation is None:
+                results[position] = OrderResult(False, self.OUT_OF_STOCK)
+            else:
+                reserved.append((position, reservation))
+
+        deliveries = [position for position, _ in reserved if requests[position].delivery]
+        slots = dict(zip(deliveries, self.scheduler.book_many(
+            [(self._district(requests[position]), self._membership(requests[position]))
+             for position in deliveries], now)))
+
+        orders = []
+        for position, reservation in reserved:
+            if requests[position].delivery and slots[position] is None:
+                self.database.release_reservation(reservation)
+                results[position] = OrderResult(False, self.NO_DELIVERY_SLOTS)
+            else:
+                orders.append((position, reservation))
+        if not orders:
+            return results
+
+        rows = []
+        purchases = []
+        for position, _ in orders:
+            request = requests[position]
+            membership = self._membership(request)
+            fee = self.delivery_fee(membership, request.delivery)
+            rows.append({
+                "username": request.user["username"] if request.user else "Guest",
+                "items": [SaleItem.for_line(line) for line in lines[position]],
+                "total_amount": subtotals[position] + fee,
+                "delivery_address": self._address(request) if request.delivery else "STORE PICKUP",
+                "delivery_fee": fee,
+                "date": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "membership": membership,
+                "delivery_slot": slots.get(position)
+            })
+            if request.user:
+                purchases.append(request.user["username"])
+
+        reservation_ids = [reservation for _, reservation in orders]
+        try:
+            with self.database.transaction():
+                sale_ids = self.database.add_sales(rows)
+                self.database.commit_reservations(reservation_ids)
+                if purchases:
+                    self.auth.add_purchases(purchases)
+        except Exception:
+            for reservation in reservation_ids:
+                self.database.release_reservation(reservation)
+            for position, _ in orders:
+                if slots.get(position) is not None:
+                    self.scheduler.release(slots[position])
+            raise
+
+        for (position, _), row, sale_id in zip(orders, rows, sale_ids):
+            requests[position].cart.clear()
+            results[position] = OrderResult(True, "Order completed", sale_id, row["total_amount"],
+                                            row["delivery_fee"], row["delivery_slot"])
+        return results
+
+    def _price(self, requests, lines):
+        by_tier = {}
+        for position in lines:
+            by_tier.setdefault(self._membership(requests[position]), []).append(position)
+
+        subtotals = {}
+        for membership, positions in by_tier.items():
+            prices = []
+            quantities = []
+            bounds = []
+            for position in positions:
+                start = len(prices)
+                for line in lines[position]:
+                    prices.append(line.appliance.price)
+                    quantities.append(line.quantity)
+                bounds.append((position, start, len(prices)))
+
+            final_subtotals = price_columns(prices, quantities, membership)[2]
+            if not isinstance(final_subtotals, list):
+                final_subtotals = final_subtotals.tolist()
+            for position, start, end in bounds:
+                subtotals[position] = round(sum(final_subtotals[start:end]))
+        return subtotals
+
+    def _membership(self, request):
+        return request.user.get("membership") if request.user else None
+
+    def _address(self, request):
+        return request.address or (request.user.get("delivery_address") if request.user else None)
+
+    def _district(self, request):
+        if request.address or not request.user:
+            return request.district
+        return request.user.get("delivery_district")
@@ -0,0 +1,83 @@
+from membership import Membership
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+NUMPY_MIN_LINES = 256
+
+
+def discount_factor(package_name):
+    if not package_name:
+        return None
+    return Membership.get_discount_multiplier(package_name)
+
+
+def price_columns(prices, quantities, package_name=None):
+    factor = discount_factor(package_name)
+
+    if numpy is not None and len(prices) >= NUMPY_MIN_LINES:
+        price_array = numpy.asarray(prices)
+        if price_array.dtype.kind == "i":
+            quantity_array = numpy.asarray(quantities, dtype=numpy.int64)
+            if factor is None:
+                final_array = price_array
+            else:
+                final_array = numpy.rint(price_array * factor).astype(numpy.int64)
+            return final_array, price_array * quantity_array, final_array * quantity_array
+
+    if factor is None:
+        final_prices = list(prices)
+    else:
+        discounted_price = Membership.discounted_price
+        final_prices = [discounted_price(price, package_name) for price in prices]
+
+    return (final_prices,
+            [price * quantity for price, quantity in zip(prices, quantities)],
+            [price * quantity for price, quantity in zip(final_prices, quantities)])
+
+
+def price_cart(items, package_name=None, with_lines=True):
+    appliances = [item["appliance"] for item in items]
+    prices = [appliance["price"] for appliance in appliances]
+    quantities = [item["quantity"] for item in items]
+
+    final_prices, original_subtotals, final_subtotals = price_columns(prices, quantities, package_name)
+
+    original_total = _column_sum(original_subtotals)
+    discounted_total = _column_sum(final_subtotals)
+    pricing = {
+        "original_total": original_total,
+        "discounted_total": discounted_total,
+        "savings": original_total - discounted_total,
+        "lines": []
+    }
+    if not with_lines:
+        return pricing
+
+    if numpy is not None and isinstance(final_prices, numpy.ndarray):
+        final_prices = final_prices.tolist()
+        original_subtotals = original_subtotals.tolist()
+        final_subtotals = final_subtotals.tolist()
+
+    pricing["lines"] = [
+        {
+            "appliance": appliance,
+            "quantity": quantity,
+            "unit_price": price,
+            "final_price": final_price,
+            "original_subtotal": original_subtotal,
+            "final_subtotal": final_subtotal
+        }
+        for appliance, quantity, price, final_price, original_subtotal, final_subtotal
+        in zip(appliances, quantities, prices, final_prices, original_subtotals, final_subtotals)
+    ]
+    return pricing
+
+
+def _column_sum(column):
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return int(column.sum())
+    return sum(column)
@@ -0,0 +1,223 @@
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+from analytics import PICKUP_ADDRESS
+
+
+SALE_COLUMNS = (
+    ("day", "i"),
+    ("tier", "i"),
+    ("pickup", "b"),
+    ("total", "q"),
+    ("item_end", "q"),
+)
+
+ITEM_COLUMNS = (
+    ("category", "i"),
+    ("sku", "i"),
+    ("quantity", "i"),
+    ("total_price", "q"),
+)
+
+
+def day_number(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value).date().toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+class _Codes:
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class SalesColumns:
+
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in SALE_COLUMNS}
+        self.item_columns = {name: array(typecode) for name, typecode in ITEM_COLUMNS}
+        self.tiers = _Codes()
+        self.categories = _Codes()
+        self.skus = _Codes()
+        self.last_id = 0
+        self._days = {}
+
+    def __len__(self):
+        return len(self.columns["total"])
+
+    def extend(self, sales):
+        days = self.columns["day"]
+        tiers = self.columns["tier"]
+        pickups = self.columns["pickup"]
+        totals = self.columns["total"]
+        item_ends = self.columns["item_end"]
+        categories = self.item_columns["category"]
+        skus = self.item_columns["sku"]
+        quantities = self.item_columns["quantity"]
+        prices = self.item_columns["total_price"]
+        item_count = len(quantities)
+
+        for sale in sales:
+            day = str(sale["date"])[:10]
+            code = self._days.get(day)
+            if code is None:
+                try:
+                    code = self._days[day] = date.fromisoformat(day).toordinal()
+                except ValueError:
+                    code = self._days[day] = 0
+
+            days.append(code)
+            tiers.append(self.tiers.encode(sale.get("membership") or "None"))
+            pickups.append(sale["delivery_address"] == PICKUP_ADDRESS)
+            totals.append(sale["total_amount"])
+
+            for item in sale["items"]:
+                categories.append(self.categories.encode(item.get("category") or "Unknown"))
+                skus.append(self.skus.encode(item.get("appliance_id") or item["name"]))
+                quantities.append(item["quantity"])
+                prices.append(item["total_price"])
+            item_count += len(sale["items"])
+            item_ends.append(item_count)
+            self.last_id = max(self.last_id, sale["id"])
+
+    def chunk(self, start, end):
+        item_ends = self.columns["item_end"]
+        item_start = item_ends[start - 1] if start else 0
+        item_end = item_ends[end - 1] if end else 0
+        return (item_start,
+                tuple(self.columns[name][start:end].tobytes() for name, _ in SALE_COLUMNS),
+                tuple(self.item_columns[name][item_start:item_end].tobytes() for name, _ in ITEM_COLUMNS))
+
+
+def aggregate_chunk(payload, first_day=None, last_day=None):
+    item_base, sale_data, item_data = payload
+    days, tiers, pickups, totals, item_ends = (array(typecode, data) for (_, typecode), data
+                                               in zip(SALE_COLUMNS, sale_data))
+    categories, skus, quantities, prices = (array(typecode, data) for (_, typecode), data
+                                            in zip(ITEM_COLUMNS, item_data))
+
+    revenue_by_day = {}
+    revenue_by_tier = {}
+    sales_by_category = {}
+    units_by_sku = {}
+    sales = 0
+    pickup = 0
+
+    if first_day is None and last_day is None:
+        sales = len(totals)
+        pickup = sum(pickups)
+        for day, tier, total in zip(days, tiers, totals):
+            revenue_by_day[day] = revenue_by_day.get(day, 0) + total
+            revenue_by_tier[tier] = revenue_by_tier.get(tier, 0) + total
+        for category, sku, quantity, price in zip(categories, skus, quantities, prices):
+            sales_by_category[category] = sales_by_category.get(category, 0) + price
+            units_by_sku[sku] = units_by_sku.get(sku, 0) + quantity
+    else:
+        low = first_day if first_day is not None else -1
+        high = last_day if last_day is not None else 1 << 31
+        item_start = 0
+        for day, tier, is_pickup, total, item_end in zip(days, tiers, pickups, totals, item_ends):
+            item_end -= item_base
+            if low <= day <= high:
+                sales += 1
+                pickup += is_pickup
+                revenue_by_day[day] = revenue_by_day.get(day, 0) + total
+                revenue_by_tier[tier] = revenue_by_tier.get(tier, 0) + total
+                for j in range(item_start, item_end):
+                    category = categories[j]
+                    sku = skus[j]
+                    sales_by_category[category] = sales_by_category.get(category, 0) + prices[j]
+                    units_by_sku[sku] = units_by_sku.get(sku, 0) + quantities[j]
+            item_start = item_end
+
+    return sales, pickup, revenue_by_day, revenue_by_tier, sales_by_category, units_by_sku
+
+
+def _merge(target, source):
+    for key, value in source.items():
+        target[key] = target.get(key, 0) + value
+
+
+class ReportEngine:
+    CHUNK_SIZE = 250000
+    MIN_PARALLEL_SALES = 200000
+
+    def __init__(self, workers=None, chunk_size=None):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self._pool = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def report(self, columns, start=None, end=None, top=10):
+        first_day = day_number(start)
+        last_day = day_number(end)
+        count = len(columns)
+
+        ranges = [(low, min(low + self.chunk_size, count)) for low in range(0, count, self.chunk_size)]
+        if self.workers > 1 and count >= self.MIN_PARALLEL_SALES:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers)
+            futures = [self._pool.submit(aggregate_chunk, columns.chunk(low, high), first_day, last_day)
+                       for low, high in ranges]
+            partials = [future.result() for future in futures]
+        else:
+            partials = [aggregate_chunk(columns.chunk(low, high), first_day, last_day)
+                        for low, high in ranges]
+
+        sales = 0
+        pickup = 0
+        revenue_by_day = {}
+        revenue_by_tier = {}
+        sales_by_category = {}
+        units_by_sku = {}
+        for part_sales, part_pickup, by_day, by_tier, by_category, by_sku in partials:
+            sales += part_sales
+            pickup += part_pickup
+            _merge(revenue_by_day, by_day)
+            _merge(revenue_by_tier, by_tier)
+            _merge(sales_by_category, by_category)
+            _merge(units_by_sku, by_sku)
+
+        revenue = sum(revenue_by_tier.values())
+        units = sum(units_by_sku.values())
+        top_skus = heapq.nlargest(top, units_by_sku.items(), key=lambda entry: (entry[1], -entry[0]))
+        return {
+            "total_sales": sales,
+            "total_revenue": revenue,
+            "total_units": units,
+            "average_basket_size": units / sales if sales else 0,
+            "average_order_value": revenue / sales if sales else 0,
+            "revenue_by_day": {date.fromordinal(day).isoformat() if day else "Unknown": value
+                               for day, value in sorted(revenue_by_day.items())},
+            "revenue_by_tier": {columns.tiers.values[code]: value
+                                for code, value in revenue_by_tier.items()},
+            "sales_by_category": {columns.categories.values[code]: value
+                                  for code, value in sales_by_category.items()},
+            "top_skus": [(columns.skus.values[code], units) for code, units in top_skus],
+            "fulfillment": {"delivery": sales - pickup, "pickup": pickup}
+        }
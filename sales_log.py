@@ -0,0 +1,324 @@
+import json
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+
+SALE_COLUMNS = (
+    ("sale_id", "q"),
+    ("timestamp", "q"),
+    ("total", "q"),
+    ("fee", "q"),
+    ("user", "i"),
+    ("item_end", "q"),
+)
+
+ITEM_COLUMNS = (
+    ("product", "i"),
+    ("quantity", "i"),
+    ("unit_price", "q"),
+    ("total_price", "q"),
+)
+
+
+def parse_timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(datetime.strptime(str(value)[:19], "%Y-%m-%d %H:%M:%S").timestamp())
+
+
+class _Column:
+
+    def __init__(self, path, typecode):
+        self.path = path
+        self.typecode = typecode
+        self.width = array(typecode).itemsize
+        self.file = open(path, "ab")
+        self._map = None
+        self._view = None
+        self._mapped_size = 0
+
+    def __len__(self):
+        return self.size() // self.width
+
+    def size(self):
+        return self.file.tell()
+
+    def truncate(self, count):
+        self.release()
+        self.file.truncate(count * self.width)
+        self.file.seek(count * self.width)
+
+    def append(self, values):
+        self.file.write(array(self.typecode, values).tobytes())
+
+    def flush(self):
+        self.file.flush()
+
+    def view(self):
+        size = self.size()
+        if size != self._mapped_size:
+            self.release()
+            if size:
+                with open(self.path, "rb") as f:
+                    self._map = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._map).cast(self.typecode)
+            self._mapped_size = size
+        return self._view if self._view is not None else memoryview(array(self.typecode))
+
+    def release(self):
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._mapped_size = 0
+
+    def close(self):
+        self.release()
+        self.file.close()
+
+
+class _Dictionary:
+
+    def __init__(self, path):
+        self.path = path
+        self.values = []
+        self.codes = {}
+
+        if os.path.exists(path):
+            self._load()
+        self.file = open(path, "a", encoding="utf-8")
+
+    def __len__(self):
+        return len(self.values)
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        valid = 0
+        while True:
+            end = data.find(b"\n", valid)
+            if end < 0:
+                break
+            line = data[valid:end]
+            if line.strip():
+                try:
+                    self._add(json.loads(line))
+                except ValueError:
+                    break
+            valid = end + 1
+
+        if valid != len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid)
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self._add(value)
+            self.file.write(json.dumps(value) + "\n")
+        return code
+
+    def decode(self, code):
+        return self.values[code]
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def _add(self, value):
+        code = len(self.values)
+        self.values.append(value)
+        self.codes[value] = code
+        return code
+
+
+class SalesLog:
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = {name: _Column(os.path.join(directory, f"sales.{name}.col"), typecode)
+                        for name, typecode in SALE_COLUMNS}
+        self.item_columns = {name: _Column(os.path.join(directory, f"items.{name}.col"), typecode)
+                             for name, typecode in ITEM_COLUMNS}
+        self.users = _Dictionary(os.path.join(directory, "users.dict"))
+        self.products = _Dictionary(os.path.join(directory, "products.dict"))
+        self._lock = threading.RLock()
+        self._recover()
+
+    def _recover(self):
+        for column in (*self.columns.values(), *self.item_columns.values()):
+            if column.size() != len(column) * column.width:
+                column.truncate(len(column))
+        
+        sales = min(len(column) for column in self.columns.values())
+        items = min(len(column) for column in self.item_columns.values())
+
+        item_ends = self.columns["item_end"].view()
+        users = self.columns["user"].view()
+        products = self.item_columns["product"].view()
+        while sales and item_ends[sales - 1] > items:
+            sales -= 1
+        items = item_ends[sales - 1] if sales else 0
+
+        if sales and max(users[:sales]) >= len(self.users):
+            sales = next(i for i in range(sales) if users[i] >= len(self.users))
+            items = item_ends[sales - 1] if sales else 0
+        if items and max(products[:items]) >= len(self.products):
+            item = next(i for i in range(items) if products[i] >= len(self.products))
+            sales = bisect_right(item_ends, item, 0, sales)
+            items = item_ends[sales - 1] if sales else 0
+
+        for column in self.columns.values():
+            if column.size() != sales * column.width:
+                column.truncate(sales)
+        for column in self.item_columns.values():
+            if column.size() != items * column.width:
+                column.truncate(items)
+
+        self._sorted = True
+        timestamps = self.columns["timestamp"].view()
+        for i in range(1, len(timestamps)):
+            if timestamps[i] < timestamps[i - 1]:
+                self._sorted = False
+                break
+
+    def __len__(self):
+        return len(self.columns["sale_id"])
+
+    def last_id(self):
+        with self._lock:
+            ids = self.columns["sale_id"].view()
+            return ids[len(ids) - 1] if len(ids) else 0
+
+    def append(self, sale):
+        self.append_many([sale])
+
+    def append_many(self, sales):
+        with self._lock:
+            rows = {name: [] for name, _ in SALE_COLUMNS}
+            item_rows = {name: [] for name, _ in ITEM_COLUMNS}
+            item_count = len(self.item_columns["product"])
+            timestamps = self.columns["timestamp"].view()
+            last = timestamps[len(timestamps) - 1] if len(timestamps) else None
+
+            for sale in sales:
+                timestamp = parse_timestamp(sale["date"])
+                if last is not None and timestamp < last:
+                    self._sorted = False
+                last = timestamp
+
+                rows["sale_id"].append(sale["id"])
+                rows["timestamp"].append(timestamp)
+                rows["total"].append(sale["total_amount"])
+                rows["fee"].append(sale["delivery_fee"])
+                rows["user"].append(self.users.encode(sale["username"]))
+
+                for item in sale["items"]:
+                    item_rows["product"].append(self.products.encode(item["name"]))
+                    item_rows["quantity"].append(item["quantity"])
+                    item_rows["unit_price"].append(item["unit_price"])
+                    item_rows["total_price"].append(item["total_price"])
+                item_count += len(sale["items"])
+                rows["item_end"].append(item_count)
+
+            self.users.flush()
+            self.products.flush()
+            for name, column in self.item_columns.items():
+                column.append(item_rows[name])
+                column.flush()
+            for name, column in self.columns.items():
+                column.append(rows[name])
+                column.flush()
+
+    def positions_between(self, start=None, end=None):
+        with self._lock:
+            timestamps = self.columns["timestamp"].view()
+            start = parse_timestamp(start)
+            end = parse_timestamp(end)
+
+            if self._sorted:
+                low = bisect_left(timestamps, start) if start is not None else 0
+                high = bisect_right(timestamps, end) if end is not None else len(timestamps)
+                return range(low, high)
+
+            return [i for i, timestamp in enumerate(timestamps)
+                    if (start is None or timestamp >= start) and (end is None or timestamp <= end)]
+
+    def between(self, start=None, end=None, username=None):
+        with self._lock:
+            positions = self.positions_between(start, end)
+            if username is not None:
+                user_code = self.users.codes.get(username)
+                if user_code is None:
+                    return []
+                users = self.columns["user"].view()
+                positions = [i for i in positions if users[i] == user_code]
+
+            ids = self.columns["sale_id"].view()
+            timestamps = self.columns["timestamp"].view()
+            totals = self.columns["total"].view()
+            fees = self.columns["fee"].view()
+            users = self.columns["user"].view()
+            return [{"id": ids[i],
+                     "timestamp": timestamps[i],
+                     "username": self.users.decode(users[i]),
+                     "total_amount": totals[i],
+                     "delivery_fee": fees[i]}
+                    for i in positions]
+
+    def revenue_between(self, start=None, end=None, username=None):
+        with self._lock:
+            positions = self.positions_between(start, end)
+            totals = self.columns["total"].view()
+
+            if username is None:
+                if isinstance(positions, range):
+                    return sum(totals[positions.start:positions.stop])
+                return sum(totals[i] for i in positions)
+
+            user_code = self.users.codes.get(username)
+            if user_code is None:
+                return 0
+            users = self.columns["user"].view()
+            return sum(totals[i] for i in positions if users[i] == user_code)
+
+    def items(self, sale_id):
+        with self._lock:
+            ids = self.columns["sale_id"].view()
+            position = bisect_left(ids, sale_id)
+            if position == len(ids) or ids[position] != sale_id:
+                return []
+            item_ends = self.columns["item_end"].view()
+            low = item_ends[position - 1] if position else 0
+            high = item_ends[position]
+
+            products = self.item_columns["product"].view()
+            quantities = self.item_columns["quantity"].view()
+            unit_prices = self.item_columns["unit_price"].view()
+            total_prices = self.item_columns["total_price"].view()
+            return [{"name": self.products.decode(products[i]),
+                     "quantity": quantities[i],
+                     "unit_price": unit_prices[i],
+                     "total_price": total_prices[i]}
+                    for i in range(low, high)]
+
+    def close(self):
+        with self._lock:
+            for column in list(self.columns.values()) + list(self.item_columns.values()):
+                column.close()
+            self.users.close()
+            self.products.close()
@@ -0,0 +1,281 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def edit_distance(a, b, limit):
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SearchIndex:
+    GRAM_SIZE = 3
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    CATEGORY_WEIGHT = 0.5
+    PREFIX_WEIGHT = 0.8
+    SUBSTRING_WEIGHT = 0.4
+    FUZZY_WEIGHT = 0.6
+
+    def __init__(self):
+        self.documents = {}
+        self.postings = {}
+        self.categories = {}
+        self.category_terms = {}
+        self.total_length = 0
+
+        self.term_refs = {}
+        self.sorted_terms = []
+        self.grams = {}
+        self.deletes = {}
+
+    def add(self, doc_id, name, category):
+        self.add_many([(doc_id, name, category)])
+
+    def add_many(self, documents):
+        postings = {}
+        categories = {}
+
+        for doc_id, name, category in documents:
+            if doc_id in self.documents:
+                self.remove(doc_id)
+
+            terms = tokenize(name)
+            category = category.casefold()
+            self.documents[doc_id] = (tuple(terms), category)
+            self.total_length += len(terms)
+
+            for term in terms:
+                doc_postings = postings.setdefault(term, {})
+                doc_postings[doc_id] = doc_postings.get(doc_id, 0) + 1
+            categories.setdefault(category, []).append(doc_id)
+
+        for term, doc_postings in postings.items():
+            existing = self.postings.get(term)
+            if existing is None:
+                self.postings[term] = doc_postings
+                self._add_term(term)
+            else:
+                existing.update(doc_postings)
+
+        for category, ids in categories.items():
+            existing = self.categories.get(category)
+            if existing is None:
+                self.categories[category] = set(ids)
+                for term in set(tokenize(category)):
+                    self.category_terms.setdefault(term, set()).add(category)
+                    self._add_term(term)
+            else:
+                existing.update(ids)
+
+    def remove(self, doc_id):
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            return False
+
+        terms, category = document
+        self.total_length -= len(terms)
+
+        for term in set(terms):
+            doc_postings = self.postings[term]
+            del doc_postings[doc_id]
+            if not doc_postings:
+                del self.postings[term]
+                self._remove_term(term)
+
+        ids = self.categories[category]
+        ids.discard(doc_id)
+        if not ids:
+            del self.categories[category]
+            for term in set(tokenize(category)):
+                self._discard(self.category_terms, term, category)
+                self._remove_term(term)
+        return True
+
+    def search(self, query, limit=None):
+        tokens = tokenize(query) if query else []
+        if not tokens:
+            return []
+
+        token_scores = sorted((self._score_token(token) for token in tokens), key=len)
+        scores = token_scores[0]
+        for other in token_scores[1:]:
+            scores = {doc_id: score + other[doc_id] for doc_id, score in scores.items() if doc_id in other}
+
+        key = lambda entry: (entry[1], -entry[0])
+        if limit is None:
+            ranked = sorted(scores.items(), key=key, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores.items(), key=key)
+        return [doc_id for doc_id, _ in ranked]
+
+    def expand(self, token):
+        matches = {}
+        if token in self.term_refs:
+            matches[token] = 1.0
+
+        terms = self.sorted_terms
+        position = bisect_left(terms, token)
+        while position < len(terms) and terms[position].startswith(token):
+            if terms[position] != token:
+                matches[terms[position]] = self.PREFIX_WEIGHT
+            position += 1
+
+        for term in self._substring_terms(token):
+            matches.setdefault(term, self.SUBSTRING_WEIGHT)
+
+        limit = self._typo_limit(len(token))
+        if limit:
+            candidates = set()
+            for variant in self._variants(token, limit):
+                candidates.update(self.deletes.get(variant, ()))
+            for term in candidates:
+                if term in matches:
+                    continue
+                distance = edit_distance(token, term, limit)
+                if distance <= limit:
+                    matches[term] = self.FUZZY_WEIGHT ** distance
+        return matches
+
+    def _score_token(self, token):
+        scores = {}
+        doc_count = len(self.documents)
+        if not doc_count:
+            return scores
+
+        matches = self.expand(token)
+
+        category_scores = {}
+        for term, weight in matches.items():
+            for category in self.category_terms.get(term, ()):
+                score = weight * self.CATEGORY_WEIGHT
+                if score > category_scores.get(category, 0):
+                    category_scores[category] = score
+        for category, score in category_scores.items():
+            scores.update(dict.fromkeys(self.categories[category], score))
+
+        average_length = self.total_length / doc_count or 1
+        k1 = self.BM25_K1
+        b = self.BM25_B
+        documents = self.documents
+        norms = {}
+
+        for term, weight in matches.items():
+            doc_postings = self.postings.get(term)
+            if not doc_postings:
+                continue
+
+            df = len(doc_postings)
+            boost = weight * math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) * (k1 + 1)
+            for doc_id, tf in doc_postings.items():
+                length = len(documents[doc_id][0])
+                norm = norms.get(length)
+                if norm is None:
+                    norm = norms[length] = k1 * (1 - b + b * length / average_length)
+                score = boost * tf / (tf + norm)
+                if score > scores.get(doc_id, 0):
+                    scores[doc_id] = score
+        return scores
+
+    def _substring_terms(self, token):
+        if len(token) < self.GRAM_SIZE:
+            terms = set()
+            for gram, gram_terms in self.grams.items():
+                if token in gram:
+                    terms |= gram_terms
+            return terms
+
+        postings = []
+        for gram in self._grams(token):
+            terms = self.grams.get(gram)
+            if not terms:
+                return set()
+            postings.append(terms)
+
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return {term for term in candidates if token in term}
+
+    def _add_term(self, term):
+        refs = self.term_refs.get(term, 0)
+        self.term_refs[term] = refs + 1
+        if refs:
+            return
+
+        insort(self.sorted_terms, term)
+        for gram in self._grams(term):
+            self.grams.setdefault(gram, set()).add(term)
+        if term.isalpha():
+            for variant in self._variants(term, self._index_limit(len(term))):
+                self.deletes.setdefault(variant, set()).add(term)
+
+    def _remove_term(self, term):
+        refs = self.term_refs[term] - 1
+        if refs:
+            self.term_refs[term] = refs
+            return
+
+        del self.term_refs[term]
+        del self.sorted_terms[bisect_left(self.sorted_terms, term)]
+        for gram in self._grams(term):
+            self._discard(self.grams, gram, term)
+        if term.isalpha():
+            for variant in self._variants(term, self._index_limit(len(term))):
+                self._discard(self.deletes, variant, term)
+
+    def _typo_limit(self, length):
+        if length < 4:
+            return 0
+        return 1 if length < 8 else 2
+
+    def _index_limit(self, length):
+        if length < 3:
+            return 0
+        return 1 if length < 6 else 2
+
+    def _variants(self, term, limit):
+        variants = {term}
+        frontier = {term}
+        for _ in range(limit):
+            frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+            variants |= frontier
+        return variants
+
+    def _grams(self, text):
+        size = self.GRAM_SIZE
+        if len(text) < size:
+            return {text} if text else set()
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+    def _discard(self, postings, key, value):
+        values = postings.get(key)
+        if values is None:
+            return
+        values.discard(value)
+        if not values:
+            del postings[key]
@@ -0,0 +1,115 @@
+import heapq
+import secrets
+import threading
+import time
+from cart import ShoppingCart
+
+
+class Session:
+
+    def __init__(self, session_id, auth):
+        self.session_id = session_id
+        self.auth = auth
+        self.cart = ShoppingCart()
+        self.token = None
+        self.expires = 0
+        self.lock = threading.Lock()
+
+    def login(self, username, password):
+        success, msg, token = self.auth.login(username, password)
+        if success:
+            self.logout()
+            self.token = token
+        return success, msg
+
+    def logout(self):
+        if self.token:
+            self.auth.logout(self.token)
+            self.token = None
+
+    def get_current_user(self):
+        return self.auth.get_current_user(self.token)
+
+    def is_admin(self):
+        return self.auth.is_admin(self.token)
+
+
+class SessionManager:
+
+    def __init__(self, auth, ttl=1800, max_sessions=10000, sweep_interval=60):
+        self.auth = auth
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self.sessions = {}
+        self._expiry_heap = []
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._lock = threading.Lock()
+
+    def create(self):
+        session = Session(secrets.token_urlsafe(16), self.auth)
+        now = time.monotonic()
+
+        with self._lock:
+            removed = []
+            if now >= self._next_sweep or len(self.sessions) >= self.max_sessions:
+                removed = self._sweep(now, self.max_sessions - 1)
+
+            session.expires = now + self.ttl
+            self.sessions[session.session_id] = session
+            heapq.heappush(self._expiry_heap, (session.expires, session.session_id))
+
+        for old in removed:
+            self._end(old)
+        return session
+
+    def get(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return None
+            if session.expires > now:
+                session.expires = now + self.ttl
+                return session
+            del self.sessions[session_id]
+
+        self._end(session)
+        return None
+
+    def close(self, session_id):
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+        if session:
+            self._end(session)
+        return session is not None
+
+    def sweep(self):
+        with self._lock:
+            removed = self._sweep(time.monotonic(), self.max_sessions)
+        for session in removed:
+            self._end(session)
+        return len(removed)
+
+    def count(self):
+        return len(self.sessions)
+
+    def _sweep(self, now, limit):
+        removed = []
+        heap = self._expiry_heap
+        while heap and (heap[0][0] <= now or len(self.sessions) > limit):
+            expires, session_id = heapq.heappop(heap)
+            session = self.sessions.get(session_id)
+            if session is None:
+                continue
+            if session.expires != expires:
+                heapq.heappush(heap, (session.expires, session_id))
+            else:
+                del self.sessions[session_id]
+                removed.append(session)
+        self._next_sweep = now + self.sweep_interval
+        return removed
+
+    def _end(self, session):
+        session.cart.clear()
+        session.logout()
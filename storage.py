@@ -0,0 +1,543 @@
+import gc
+import json
+import marshal
+import os
+import sqlite3
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from models import to_json
+
+
+class MemoryStorage:
+
+    def load_appliances(self):
+        return []
+
+    def load_sales(self):
+        return []
+
+    def load_users(self):
+        return []
+
+    def load_counters(self):
+        return {}
+
+    def save_appliance(self, appliance):
+        pass
+
+    def save_appliances(self, appliances):
+        pass
+
+    def delete_appliance(self, appliance_id):
+        pass
+
+    def save_sale(self, sale):
+        pass
+
+    def save_sales(self, sales):
+        pass
+
+    def save_user(self, user):
+        pass
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage:
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS appliances (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            category TEXT NOT NULL,
+            stock INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE INDEX IF NOT EXISTS idx_appliances_category ON appliances (category);
+        CREATE INDEX IF NOT EXISTS idx_appliances_status ON appliances (status);
+
+        CREATE TABLE IF NOT EXISTS sales (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            customer_id INTEGER,
+            membership TEXT,
+            items TEXT NOT NULL,
+            total_amount INTEGER NOT NULL,
+            delivery_address TEXT,
+            delivery_fee INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            delivery_slot TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_sales_username ON sales (username, id);
+
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL,
+            membership TEXT,
+            total_purchases INTEGER NOT NULL,
+            delivery_address TEXT,
+            delivery_district TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS appliances_next_id AFTER INSERT ON appliances BEGIN
+            UPDATE counters SET value = NEW.id + 1 WHERE name = 'appliance' AND value <= NEW.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS sales_next_id AFTER INSERT ON sales BEGIN
+            UPDATE counters SET value = NEW.id + 1 WHERE name = 'sale' AND value <= NEW.id;
+        END;
+    """
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self._migrate()
+        self._lock = threading.RLock()
+        self._depth = 0
+
+    def _migrate(self):
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(appliances)")}
+        if "stock" not in columns:
+            self.connection.execute(
+                "ALTER TABLE appliances ADD COLUMN stock INTEGER NOT NULL DEFAULT 1")
+        
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(sales)")}
+        if "membership" not in columns:
+            self.connection.execute("ALTER TABLE sales ADD COLUMN membership TEXT")
+        if "delivery_slot" not in columns:
+            self.connection.execute("ALTER TABLE sales ADD COLUMN delivery_slot TEXT")
+        
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(users)")}
+        if "delivery_district" not in columns:
+            self.connection.execute("ALTER TABLE users ADD COLUMN delivery_district TEXT")
+        
+        self.connection.execute(
+            "INSERT OR IGNORE INTO counters SELECT 'appliance', COALESCE(MAX(id), 0) + 1 FROM appliances")
+        self.connection.execute(
+            "INSERT OR IGNORE INTO counters SELECT 'sale', COALESCE(MAX(id), 0) + 1 FROM sales")
+
+    def load_appliances(self):
+        rows = self.connection.execute(
+            "SELECT id, name, price, status, category, stock FROM appliances ORDER BY id")
+        return [{"id": row[0], "name": row[1], "price": row[2], "status": row[3], "category": row[4],
+                 "stock": row[5]}
+                for row in rows]
+
+    def load_sales(self):
+        rows = self.connection.execute(
+            "SELECT id, username, customer_id, membership, items, total_amount, "
+            "delivery_address, delivery_fee, date, delivery_slot FROM sales ORDER BY id")
+        return [{"id": row[0], "username": row[1], "customer_id": row[2], "membership": row[3],
+                 "items": json.loads(row[4]), "total_amount": row[5], "delivery_address": row[6],
+                 "delivery_fee": row[7], "date": row[8],
+                 "delivery_slot": json.loads(row[9]) if row[9] else None}
+                for row in rows]
+
+    def load_users(self):
+        rows = self.connection.execute(
+            "SELECT username, password, role, membership, total_purchases, delivery_address, "
+            "delivery_district FROM users")
+        return [{"username": row[0], "password": row[1], "role": row[2], "membership": row[3],
+                 "total_purchases": row[4], "delivery_address": row[5], "delivery_district": row[6]}
+                for row in rows]
+
+    def load_counters(self):
+        return dict(self.connection.execute("SELECT name, value FROM counters"))
+
+    def save_appliance(self, appliance):
+        self._execute(
+            "INSERT OR REPLACE INTO appliances (id, name, price, status, category, stock) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (appliance["id"], appliance["name"], appliance["price"],
+             appliance["status"], appliance["category"], appliance["stock"]))
+
+    def save_appliances(self, appliances):
+        with self.transaction():
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO appliances (id, name, price, status, category, stock) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(appliance["id"], appliance["name"], appliance["price"],
+                  appliance["status"], appliance["category"], appliance["stock"])
+                 for appliance in appliances])
+
+    def delete_appliance(self, appliance_id):
+        self._execute("DELETE FROM appliances WHERE id = ?", (appliance_id,))
+
+    def save_sale(self, sale):
+        self.save_sales([sale])
+
+    def save_sales(self, sales):
+        with self.transaction():
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO sales (id, username, customer_id, membership, items, "
+                "total_amount, delivery_address, delivery_fee, date, delivery_slot) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(sale["id"], sale["username"], sale["customer_id"], sale["membership"],
+                  json.dumps(sale["items"], default=to_json),
+                  sale["total_amount"], sale["delivery_address"], sale["delivery_fee"], sale["date"],
+                  json.dumps(sale["delivery_slot"], default=to_json) if sale.get("delivery_slot") else None)
+                 for sale in sales])
+
+    def save_user(self, user):
+        self._execute(
+            "INSERT OR REPLACE INTO users (username, password, role, membership, "
+            "total_purchases, delivery_address, delivery_district) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (user["username"], user["password"], user["role"], user["membership"],
+             user["total_purchases"], user["delivery_address"], user.get("delivery_district")))
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            if self._depth == 0:
+                self.connection.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.connection.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self.connection.execute("COMMIT")
+
+    def close(self):
+        self.connection.close()
+
+    def _execute(self, sql, params):
+        with self.transaction():
+            self.connection.execute(sql, params)
+
+
+APPLIANCE_FIELDS = ("id", "name", "price", "status", "category", "stock")
+SALE_FIELDS = ("id", "username", "customer_id", "membership", "items", "total_amount",
+               "delivery_address", "delivery_fee", "date", "delivery_slot")
+SALE_ITEM_FIELDS = ("appliance_id", "name", "category", "quantity", "unit_price", "total_price")
+DELIVERY_SLOT_FIELDS = ("district", "start", "end")
+USER_FIELDS = ("username", "password", "role", "membership", "total_purchases", "delivery_address",
+               "delivery_district")
+
+
+class JournalStorage:
+
+    FRAME_HEADER = struct.Struct("<II")
+    SYNC_MODES = ("group", "async", "none")
+
+    def __init__(self, directory, sync="group", flush_interval=0.05, snapshot_every=50000):
+        if sync not in self.SYNC_MODES:
+            raise ValueError(f"Unknown sync mode: {sync}")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.sync = sync
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.appliances = {}
+        self.sales = {}
+        self.users = {}
+        self.counters = {}
+        self.replayed = 0
+
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._batch = []
+        self._written = 0
+        self._since_snapshot = 0
+        self._snapshot_lock = threading.Lock()
+        self._synced = threading.Condition()
+        self._synced_seq = 0
+        self._syncing = False
+        self._closed = threading.Event()
+
+        self.generation = self._recover()
+        self._journal = open(self._path("journal", self.generation), "ab")
+        self._background = threading.Thread(target=self._maintain, daemon=True)
+        self._background.start()
+
+    def load_appliances(self):
+        return [dict(zip(APPLIANCE_FIELDS, row)) for _, row in sorted(self.appliances.items())]
+
+    def load_sales(self):
+        sales = []
+        for _, row in sorted(self.sales.items()):
+            sale = dict(zip(SALE_FIELDS, row))
+            sale["items"] = [dict(zip(SALE_ITEM_FIELDS, item)) for item in sale["items"]]
+            if sale.get("delivery_slot"):
+                sale["delivery_slot"] = dict(zip(DELIVERY_SLOT_FIELDS, sale["delivery_slot"]))
+            sales.append(sale)
+        return sales
+
+    def load_users(self):
+        return [dict(zip(USER_FIELDS, row)) for row in self.users.values()]
+
+    def load_counters(self):
+        return dict(self.counters)
+
+    def save_appliance(self, appliance):
+        self._record(("A", self._row(appliance, APPLIANCE_FIELDS)))
+
+    def save_appliances(self, appliances):
+        self._record(("M", [self._row(appliance, APPLIANCE_FIELDS) for appliance in appliances]))
+
+    def delete_appliance(self, appliance_id):
+        self._record(("D", appliance_id))
+
+    def save_sale(self, sale):
+        row = list(self._row(sale, SALE_FIELDS))
+        row[SALE_FIELDS.index("items")] = tuple(self._row(item, SALE_ITEM_FIELDS)
+                                                for item in sale["items"])
+        if sale.get("delivery_slot"):
+            row[SALE_FIELDS.index("delivery_slot")] = self._row(sale["delivery_slot"], DELIVERY_SLOT_FIELDS)
+        self._record(("S", tuple(row)))
+
+    def save_sales(self, sales):
+        with self.transaction():
+            for sale in sales:
+                self.save_sale(sale)
+
+    def save_user(self, user):
+        self._record(("U", self._row(user, USER_FIELDS)))
+
+    @contextmanager
+    def transaction(self):
+        seq = None
+        with self._lock:
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._batch.clear()
+                raise
+            self._depth -= 1
+            if self._depth == 0 and self._batch:
+                batch, self._batch = self._batch, []
+                seq = self._commit(batch[0] if len(batch) == 1 else ("B", batch))
+
+        if seq is not None and self.sync == "group":
+            self._wait_for_sync(seq)
+
+    def snapshot(self):
+        with self._snapshot_lock:
+            with self._lock:
+                if self._journal.closed:
+                    return False
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+                self._journal.close()
+                self._mark_synced(self._written)
+
+                self.generation += 1
+                generation = self.generation
+                self._journal = open(self._path("journal", generation), "ab")
+                self._since_snapshot = 0
+                state = (list(self.appliances.values()), list(self.sales.values()),
+                         list(self.users.values()), dict(self.counters))
+
+            path = self._path("snapshot", generation)
+            with open(path + ".tmp", "wb") as f:
+                marshal.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + ".tmp", path)
+            self._fsync_directory()
+            self._remove_before(generation)
+            return True
+
+    def flush(self):
+        self._mark_synced(self._sync())
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._background.join()
+        if self._since_snapshot:
+            self.snapshot()
+        self.flush()
+        with self._lock:
+            self._journal.close()
+
+    def _record(self, record):
+        with self.transaction():
+            self._batch.append(record)
+
+    def _commit(self, record):
+        self._apply(record)
+        payload = marshal.dumps(record)
+        self._journal.write(self.FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        self._written += 1
+        self._since_snapshot += 1
+        return self._written
+
+    def _apply(self, record):
+        kind, value = record
+        if kind == "A":
+            self.appliances[value[0]] = value
+            self._advance("appliance", value[0])
+        elif kind == "M":
+            for row in value:
+                self.appliances[row[0]] = row
+                self._advance("appliance", row[0])
+        elif kind == "D":
+            self.appliances.pop(value, None)
+        elif kind == "S":
+            self.sales[value[0]] = value
+            self._advance("sale", value[0])
+        elif kind == "U":
+            self.users[value[0]] = value
+        elif kind == "B":
+            for entry in value:
+                self._apply(entry)
+
+    def _advance(self, counter, record_id):
+        if record_id >= self.counters.get(counter, 1):
+            self.counters[counter] = record_id + 1
+
+    def _wait_for_sync(self, seq):
+        with self._synced:
+            while self._synced_seq < seq:
+                if not self._syncing:
+                    self._syncing = True
+                    break
+                self._synced.wait()
+            else:
+                return
+
+        target = 0
+        try:
+            target = self._sync()
+        finally:
+            with self._synced:
+                self._syncing = False
+            self._mark_synced(target)
+
+    def _sync(self):
+        with self._lock:
+            if self._journal.closed:
+                return self._written
+            self._journal.flush()
+            target = self._written
+            fd = os.dup(self._journal.fileno())
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return target
+
+    def _mark_synced(self, seq):
+        with self._synced:
+            if seq > self._synced_seq:
+                self._synced_seq = seq
+            self._synced.notify_all()
+
+    def _maintain(self):
+        while not self._closed.wait(self.flush_interval):
+            if self.sync == "async":
+                self.flush()
+            elif self.sync == "none":
+                with self._lock:
+                    self._journal.flush()
+            if self._since_snapshot >= self.snapshot_every:
+                self.snapshot()
+
+    def _recover(self):
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            snapshots = self._generations("snapshot")
+            covered = 0
+            if snapshots:
+                covered = snapshots[-1]
+                with open(self._path("snapshot", covered), "rb") as f:
+                    state = marshal.loads(f.read())
+                appliances, sales, users = state[:3]
+                self.appliances = {row[0]: row for row in appliances}
+                self.sales = {row[0]: row for row in sales}
+                self.users = {row[0]: row for row in users}
+                if len(state) > 3:
+                    self.counters = state[3]
+                else:
+                    for row in appliances:
+                        self._advance("appliance", row[0])
+                    for row in sales:
+                        self._advance("sale", row[0])
+            self._remove_before(covered)
+
+            generation = covered
+            for journal in self._generations("journal"):
+                self._replay(self._path("journal", journal))
+                generation = journal
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                os.remove(os.path.join(self.directory, name))
+        return generation
+
+    def _replay(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        header = self.FRAME_HEADER
+        offset = 0
+        while offset + header.size <= len(data):
+            length, checksum = header.unpack_from(data, offset)
+            payload = data[offset + header.size:offset + header.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            self._apply(marshal.loads(payload))
+            self.replayed += 1
+            offset += header.size + length
+
+        if offset < len(data):
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+
+    def _remove_before(self, generation):
+        for kind in ("journal", "snapshot"):
+            for old in self._generations(kind):
+                if old < generation:
+                    os.remove(self._path(kind, old))
+
+    def _generations(self, kind):
+        generations = []
+        for name in os.listdir(self.directory):
+            prefix, _, rest = name.partition(".")
+            number, _, extension = rest.partition(".")
+            if prefix == kind and number.isdigit() and extension == "bin":
+                generations.append(int(number))
+        return sorted(generations)
+
+    def _path(self, kind, generation):
+        return os.path.join(self.directory, f"{kind}.{generation:08d}.bin")
+
+    def _fsync_directory(self):
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _row(self, record, fields):
+        return tuple(record.get(field) for field in fields)
@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+
+from api import StoreAPI
+
+
+@pytest.fixture
+def api():
+    api = StoreAPI()
+    yield api
+    api.executor.shutdown()
+    api.database.close()
+
+
+def call(api, method, target, body=None, session_id=None):
+    headers = {"x-session-id": session_id} if session_id else {}
+    payload = json.dumps(body).encode() if body is not None else b""
+    return asyncio.run(api.dispatch(method, target, headers, payload))
+
+
+def open_session(api, username=None):
+    session_id = call(api, "POST", "/sessions")[1]["session_id"]
+    if username:
+        call(api, "POST", "/register", {"username": username, "password": "secret"})
+        call(api, "POST", "/login", {"username": username, "password": "secret"}, session_id)
+    return session_id
+
+
+def test_set_cart_quantity_checks_stock(api):
+    session_id = open_session(api)
+    assert call(api, "POST", "/cart/items", {"appliance_id": 1, "quantity": 1}, session_id)[0] == 200
+    status, body = call(api, "PUT", "/cart/items/1", {"quantity": 50}, session_id)
+    assert status == 409
+    assert call(api, "PUT", "/cart/items/1", {"quantity": 10}, session_id)[0] == 200
+
+
+def test_cart_edits_are_rejected_during_checkout(api):
+    session_id = open_session(api)
+    call(api, "POST", "/cart/items", {"appliance_id": 1, "quantity": 1}, session_id)
+    session = api.sessions.get(session_id)
+    with session.lock:
+        assert call(api, "POST", "/cart/items", {"appliance_id": 2}, session_id)[0] == 409
+        assert call(api, "PUT", "/cart/items/1", {"quantity": 2}, session_id)[0] == 409
+    assert session.cart.get_quantity(1) == 1
+    assert 2 not in session.cart.items
+
+
+def test_search_limit_is_clamped(api):
+    status, body = call(api, "GET", "/search?q=smart&limit=0")
+    assert status == 200
+    assert len(body["results"]) == 1
+    assert len(call(api, "GET", "/search?q=smart&limit=-1")[1]["results"]) == 1
+
+
+def test_metrics_forbidden_for_customers(api):
+    assert call(api, "GET", "/metrics", session_id=open_session(api, "alice"))[0] == 403
+    assert call(api, "GET", "/metrics", session_id=open_session(api))[0] == 401
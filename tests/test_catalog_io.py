@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from catalog_io import export_catalog, import_catalog, parse_record
+from database import Database
+
+
+@pytest.fixture
+def database():
+    database = Database()
+    yield database
+    database.close()
+
+
+def test_parse_record_rejects_overflowing_prices():
+    assert parse_record({"name": "TV", "price": "inf"}) is None
+    assert parse_record({"name": "TV", "price": "1e400"}) is None
+
+
+def test_parse_record_defaults_status_from_stock():
+    assert parse_record({"name": "TV", "price": 5, "stock": 0})[2] == "Sold"
+    assert parse_record({"name": "TV", "price": 5})[2] == "Available"
+    assert parse_record({"name": "TV", "price": 5, "stock": 0, "status": "Available"})[2] == "Available"
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_export_round_trip(tmp_path, database, extension):
+    path = str(tmp_path / f"catalog.{extension}")
+    assert export_catalog(database, path) == len(database.appliances)
+
+    copy = Database()
+    before = len(copy.appliances)
+    assert import_catalog(copy, path) == (len(database.appliances), 0)
+    assert len(copy.appliances) == before + len(database.appliances)
+    copy.close()
+
+
+def test_export_while_catalog_changes(tmp_path, database):
+    database.add_appliances([(f"Item {i}", 1000, "Available", "Misc", 1) for i in range(20000)])
+    stop = threading.Event()
+
+    def churn():
+        while not stop.is_set():
+            appliance_id = database.add_appliance("Churn", 1000, "Available", "Misc", 1)
+            database.delete_appliance(appliance_id)
+
+    worker = threading.Thread(target=churn)
+    worker.start()
+    try:
+        for _ in range(5):
+            export_catalog(database, str(tmp_path / "catalog.jsonl"))
+    finally:
+        stop.set()
+        worker.join()
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from delivery import DeliveryScheduler
+
+
+NOW = datetime(2026, 1, 5, 8, 0)
+
+
+def test_peek_has_no_side_effects():
+    scheduler = DeliveryScheduler(capacity=2)
+    assert scheduler.peek("Chilanzar", "Gold", NOW)["start"] == "2026-01-05 12:00"
+    assert scheduler.districts == {}
+
+    scheduler.book("Chilanzar", "Gold", NOW)
+    heaps = [list(heap) for heap in scheduler.districts["chilanzar"].heaps]
+    scheduler.peek("Chilanzar", None, NOW)
+    assert [list(heap) for heap in scheduler.districts["chilanzar"].heaps] == heaps
+
+
+def test_peek_matches_the_next_booking():
+    scheduler = DeliveryScheduler(capacity=2, horizon_days=2)
+    for membership in ["Gold", "Gold", "Gold", None, "Silver", None, "Gold"] * 3:
+        quoted = scheduler.peek("Yunusabad", membership, NOW)
+        assert scheduler.book("Yunusabad", membership, NOW) == quoted
+
+
+def test_higher_tiers_get_earlier_slots():
+    scheduler = DeliveryScheduler(capacity=5)
+    regular, silver, gold = scheduler.book_many([("Sergeli", None), ("Sergeli", "Silver"),
+                                                 ("Sergeli", "Gold")], NOW)
+    assert regular["start"] > silver["start"] > gold["start"]
+
+
+def test_sweep_drops_past_slots_and_idle_districts():
+    scheduler = DeliveryScheduler(capacity=2, horizon_days=2)
+    scheduler.book("Almazar", "Gold", NOW)
+    scheduler.book("Mirabad", None, NOW)
+    assert set(scheduler.districts) == {"almazar", "mirabad"}
+
+    later = NOW + timedelta(days=1, hours=6)
+    scheduler.book("Bektemir", "Gold", later)
+    assert set(scheduler.districts) == {"mirabad", "bektemir"}
+    assert all(slot.start >= later for slot in scheduler.districts["mirabad"].slots.values())
+    assert all(entry[0] >= later for heap in scheduler.districts["mirabad"].heaps for entry in heap)
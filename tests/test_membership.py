@@ -0,0 +1,51 @@
+import pytest
+
+from cart import ShoppingCart
+from membership import Membership
+from models import Appliance
+
+
+@pytest.fixture(autouse=True)
+def packages():
+    original = Membership.PACKAGES
+    yield
+    Membership.PACKAGES = original
+    Membership.invalidate_discount_cache()
+
+
+def make_cart(price=100000):
+    cart = ShoppingCart()
+    cart.add_item(Appliance(1, "Mixer", price, "Available", "Kitchen appliances", 10), 2)
+    return cart
+
+
+def test_packages_cannot_be_edited_in_place():
+    with pytest.raises(TypeError):
+        Membership.PACKAGES["Gold"]["discount"] = 50
+    with pytest.raises(TypeError):
+        Membership.PACKAGES["Platinum"] = {"discount": 50}
+
+
+def test_set_package_reprices_carts():
+    cart = make_cart()
+    assert cart.get_total("Gold") == 170000
+    Membership.set_package("Gold", 50, True)
+    assert cart.get_total("Gold") == 100000
+    assert Membership.calculate_discount(100000, "Gold") == 50000
+    assert Membership.get_package_info("Gold")["discount"] == 50
+
+
+def test_replacing_packages_invalidates_cached_prices():
+    cart = make_cart()
+    assert cart.get_total("Silver") == 180000
+    packages = Membership.get_packages()
+    packages["Silver"]["discount"] = 20
+    Membership.PACKAGES = packages
+    assert cart.get_total("Silver") == 160000
+    assert Membership.calculate_discount(100000, "Silver") == 80000
+
+
+def test_removed_package_gives_no_discount():
+    assert Membership.remove_package("Bronze")
+    assert make_cart().get_total("Bronze") == 200000
+    assert Membership.calculate_discount(100000, "Bronze") == 100000
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from sales_log import SalesLog
+
+
+def make_sale(sale_id, username="alice", product="Mixer"):
+    return {"id": sale_id, "username": username, "total_amount": 1000 * sale_id, "delivery_fee": 0,
+            "date": f"2026-01-01 12:{sale_id % 60:02d}:00",
+            "items": [{"name": product, "quantity": 1, "unit_price": 1000 * sale_id,
+                       "total_price": 1000 * sale_id}]}
+
+
+@pytest.fixture
+def directory(tmp_path):
+    log = SalesLog(str(tmp_path))
+    log.append_many([make_sale(sale_id) for sale_id in range(1, 11)])
+    log.close()
+    return str(tmp_path)
+
+
+def append_bytes(directory, name, data):
+    with open(os.path.join(directory, name), "ab") as f:
+        f.write(data)
+
+
+def test_torn_column_tail_is_truncated(directory):
+    for name in ("sales.total.col", "sales.sale_id.col", "items.quantity.col"):
+        append_bytes(directory, name, b"\x01\x02\x03")
+
+    log = SalesLog(directory)
+    assert len(log) == 10
+    assert log.last_id() == 10
+    assert log.revenue_between() == 55000
+    log.append(make_sale(11))
+    assert len(log) == 11
+    log.close()
+
+
+def test_torn_dictionary_tail_is_truncated(directory):
+    append_bytes(directory, "products.dict", b'"partial na')
+
+    log = SalesLog(directory)
+    assert len(log) == 10
+    assert log.items(10)[0]["name"] == "Mixer"
+    log.append(make_sale(11, product="Oven"))
+    log.close()
+
+    log = SalesLog(directory)
+    assert log.items(11)[0]["name"] == "Oven"
+    log.close()
+
+
+def test_sales_referencing_lost_dictionary_entries_are_dropped(directory):
+    log = SalesLog(directory)
+    log.append_many([make_sale(11, username="bob", product="Oven"), make_sale(12)])
+    log.close()
+
+    for name in ("users.dict", "products.dict"):
+        path = os.path.join(directory, name)
+        with open(path, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        with open(path, "wb") as f:
+            f.write(b"".join(lines[:-1]) + lines[-1][:3])
+
+    log = SalesLog(directory)
+    assert len(log) == 10
+    assert log.last_id() == 10
+    assert [sale["username"] for sale in log.between()] == ["alice"] * 10
+    log.close()
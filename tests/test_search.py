@@ -0,0 +1,36 @@
+import pytest
+
+from search_index import SearchIndex
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.add_many([
+        (1, "Coffee Maker", "Kitchen appliances"),
+        (2, "Mixer", "Kitchen appliances"),
+        (3, "Microwave", "Kitchen appliances"),
+        (4, "Smart Light Bulbs", "Smart home devices"),
+        (5, "Холодильник Artel", "Kitchen appliances"),
+        (6, "Crème Brûlée Torch", "Kitchen appliances"),
+    ])
+    return index
+
+
+def test_every_query_token_must_match(index):
+    assert index.search("coffee m") == [1]
+    assert index.search("smart light") == [4]
+    assert index.search("zzz mixer") == []
+
+
+def test_category_terms_narrow_results(index):
+    assert index.search("kitchen mixer") == [2]
+
+
+def test_unicode_names_are_searchable(index):
+    assert index.search("холод") == [5]
+    assert index.search("crème") == [6]
+
+
+def test_typos_are_tolerated(index):
+    assert index.search("cofee maker") == [1]
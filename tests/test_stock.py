@@ -0,0 +1,45 @@
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def database():
+    database = Database()
+    yield database
+    database.close()
+
+
+def test_release_after_sellout_makes_units_available(database):
+    appliance_id = database.add_appliance("Last Units TV", 5000000, "Available", "Flash sale", 2)
+    first = database.reserve_stock([(appliance_id, 1)])
+    second = database.reserve_stock([(appliance_id, 1)])
+    database.commit_reservation(first)
+    assert database.get_appliance(appliance_id)["status"] == "Sold"
+
+    database.release_reservation(second)
+    assert database.get_stock(appliance_id) == 1
+    assert database.get_appliance(appliance_id)["status"] == "Available"
+    assert appliance_id in database.available_ids
+    assert database.verify_analytics() == {}
+    assert database.reserve_stock([(appliance_id, 1)]) is not None
+
+
+def test_repeated_lines_cannot_oversell(database):
+    appliance_id = database.add_appliance("Hot Deal TV", 5000000, "Available", "Flash sale", 6)
+    assert database.reserve_stock([(appliance_id, 5), (appliance_id, 5)]) is None
+    assert database.get_stock(appliance_id) == 6
+
+    reservation = database.reserve_stock([(appliance_id, 3), (appliance_id, 3)])
+    assert reservation is not None
+    assert database.get_stock(appliance_id) == 0
+    database.release_reservation(reservation)
+    assert database.get_stock(appliance_id) == 6
+    assert database.verify_analytics() == {}
+
+
+def test_non_positive_quantity_is_rejected(database):
+    appliance_id = database.add_appliance("Hot Deal TV", 5000000, "Available", "Flash sale", 6)
+    assert database.reserve_stock([(appliance_id, 8), (appliance_id, -3)]) is None
+    assert database.reserve_stock([(appliance_id, 0)]) is None
+    assert database.get_stock(appliance_id) == 6
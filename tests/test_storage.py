@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from database import Database
+from models import SaleItem
+from storage import JournalStorage, SQLiteStorage
+
+
+BACKENDS = {
+    "sqlite": lambda directory: SQLiteStorage(os.path.join(directory, "store.db")),
+    "journal": lambda directory: JournalStorage(os.path.join(directory, "journal")),
+}
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_ids_of_deleted_rows_are_not_reused(tmp_path, backend):
+    make_storage = BACKENDS[backend]
+    database = Database(make_storage(str(tmp_path)))
+    appliance_id = database.add_appliance("Temporary", 1000, "Available", "Misc", 1)
+    sale_id = database.add_sale("alice", [SaleItem("Temporary", 1, 1000, 1000, appliance_id, "Misc")],
+                                1000, "STORE PICKUP", 0, "2026-01-01 12:00:00")
+    database.delete_appliance(appliance_id)
+    database.close()
+
+    database = Database(make_storage(str(tmp_path)))
+    assert database.next_appliance_id == appliance_id + 1
+    assert database.next_sale_id == sale_id + 1
+    assert database.add_appliance("Replacement", 2000, "Available", "Misc", 1) == appliance_id + 1
+    database.close()
+
+
+def test_journal_counters_survive_snapshots(tmp_path):
+    storage = JournalStorage(str(tmp_path))
+    database = Database(storage)
+    appliance_id = database.add_appliance("Temporary", 1000, "Available", "Misc", 1)
+    database.delete_appliance(appliance_id)
+    storage.snapshot()
+    database.close()
+
+    database = Database(JournalStorage(str(tmp_path)))
+    assert database.next_appliance_id == appliance_id + 1
+    database.close()
+